@@ -0,0 +1,68 @@
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+from benchmarks.suite import DEFAULT_SCALES, FULL_SCALES, GROUPS, run_suite
+from repo_smith.initialize_repo import InitializerOptions
+
+
+def parse_scales(args: argparse.Namespace) -> Dict[str, List[int]]:
+    scales = dict(FULL_SCALES if args.full else DEFAULT_SCALES)
+    for value in args.scale:
+        group, _, sizes = value.partition("=")
+        if group not in GROUPS or sizes == "":
+            raise SystemExit(f"Invalid --scale {value}, expected GROUP=N[,N...]")
+        scales[group] = [int(size) for size in sizes.split(",")]
+    if args.only:
+        scales = {group: scales[group] for group in args.only}
+    return scales
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks building synthetic specs with repo-smith.",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="run up to 100k commits and files, and 10k branches and tags",
+    )
+    parser.add_argument(
+        "--scale",
+        action="append",
+        default=[],
+        metavar="GROUP=N[,N...]",
+        help=f"override the scales of a group, one of {', '.join(GROUPS)}",
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=GROUPS, help="only run the given groups"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--fast-import",
+        action="store_true",
+        help="build specs with the fast-import backend",
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    options: InitializerOptions = {}
+    if args.fast_import:
+        options["fast_import"] = True
+
+    # stdout is kept for the report, so anything else printed goes to stderr
+    with redirect_stdout(sys.stderr):
+        report = run_suite(parse_scales(args), args.repeat, options)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
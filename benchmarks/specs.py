@@ -0,0 +1,265 @@
+"""Synthetic specs for the benchmark suite.
+
+Every generator returns the parsed form of a spec file, scaled by n, so it can be
+dumped to YAML and built through initialize_repo() like any other spec.
+"""
+
+from typing import Any, Callable, Dict, List
+
+from repo_smith.steps.step_type import StepType
+
+SpecData = Dict[str, Any]
+Steps = List[Dict[str, Any]]
+
+
+def spec(name: str, steps: Steps) -> SpecData:
+    return {"name": name, "initialization": {"steps": steps}}
+
+
+def base_commit() -> Steps:
+    return [
+        {"type": "new-file", "filename": "base.txt", "contents": "base\n"},
+        {"type": "add", "files": ["base.txt"]},
+        {"type": "commit", "message": "Base commit"},
+    ]
+
+
+def file_name(i: int) -> str:
+    # Spread files over directories so that large trees are not a single flat one
+    return f"dir-{i // 100}/file-{i}.txt"
+
+
+def history(n: int) -> SpecData:
+    """A linear history of n commits, each adding one file."""
+    steps: Steps = []
+    for i in range(n):
+        steps += [
+            {"type": "new-file", "filename": file_name(i), "contents": f"{i}\n"},
+            {"type": "add", "files": [file_name(i)]},
+            {"type": "commit", "message": f"Commit {i}"},
+        ]
+    return spec(f"history-{n}", steps)
+
+
+def tree(n: int) -> SpecData:
+    """A single commit of n files."""
+    steps: Steps = [
+        {"type": "new-file", "filename": file_name(i), "contents": f"{i}\n"}
+        for i in range(n)
+    ]
+    steps += [
+        {"type": "add", "files": ["."]},
+        {"type": "commit", "message": f"Add {n} files"},
+    ]
+    return spec(f"tree-{n}", steps)
+
+
+def refs(n: int) -> SpecData:
+    """n branches and n tags pointing at the same commit."""
+    steps = base_commit()
+    for i in range(n):
+        steps += [
+            {"type": "tag", "tag-name": f"tag-{i}"},
+            {"type": "branch", "branch-name": f"branch-{i}"},
+        ]
+    return spec(f"refs-{n}", steps)
+
+
+def commit_steps(n: int) -> Steps:
+    return [
+        {"type": "commit", "empty": True, "message": f"Empty {i}"} for i in range(n)
+    ]
+
+
+def add_steps(n: int) -> Steps:
+    steps: Steps = []
+    for i in range(n):
+        steps += [
+            {"type": "new-file", "filename": file_name(i)},
+            {"type": "add", "files": [file_name(i)]},
+        ]
+    return steps
+
+
+def tag_steps(n: int) -> Steps:
+    return base_commit() + [{"type": "tag", "tag-name": f"tag-{i}"} for i in range(n)]
+
+
+def new_file_steps(n: int) -> Steps:
+    return [{"type": "new-file", "filename": file_name(i)} for i in range(n)]
+
+
+def edit_file_steps(n: int) -> Steps:
+    return [{"type": "new-file", "filename": "file.txt"}] + [
+        {"type": "edit-file", "filename": "file.txt", "contents": f"{i}\n"}
+        for i in range(n)
+    ]
+
+
+def delete_file_steps(n: int) -> Steps:
+    return new_file_steps(n) + [
+        {"type": "delete-file", "filename": file_name(i)} for i in range(n)
+    ]
+
+
+def append_file_steps(n: int) -> Steps:
+    return [{"type": "new-file", "filename": "file.txt"}] + [
+        {"type": "append-file", "filename": "file.txt", "contents": f"{i}\n"}
+        for i in range(n)
+    ]
+
+
+def bash_steps(n: int) -> Steps:
+    return [{"type": "bash", "runs": f"echo {i} >> log.txt"} for i in range(n)]
+
+
+def branch_steps(n: int) -> Steps:
+    return base_commit() + [
+        {"type": "branch", "branch-name": f"branch-{i}"} for i in range(n)
+    ]
+
+
+def branch_rename_steps(n: int) -> Steps:
+    steps = base_commit() + [{"type": "branch", "branch-name": "branch-0"}]
+    return steps + [
+        {
+            "type": "branch-rename",
+            "branch-name": f"branch-{i}",
+            "new-name": f"branch-{i + 1}",
+        }
+        for i in range(n)
+    ]
+
+
+def branch_delete_steps(n: int) -> Steps:
+    steps = base_commit()
+    for i in range(n):
+        steps += [
+            {"type": "branch", "branch-name": f"branch-{i}"},
+            {"type": "checkout", "branch-name": "main"},
+            {"type": "branch-delete", "branch-name": f"branch-{i}"},
+        ]
+    return steps
+
+
+def checkout_steps(n: int) -> Steps:
+    steps = base_commit() + [{"type": "branch", "branch-name": "other"}]
+    return steps + [
+        {"type": "checkout", "branch-name": "main" if i % 2 == 0 else "other"}
+        for i in range(n)
+    ]
+
+
+def remote_steps(n: int) -> Steps:
+    return [
+        {
+            "type": "remote",
+            "remote-name": f"remote-{i}",
+            "remote-url": f"https://example.com/remote-{i}.git",
+        }
+        for i in range(n)
+    ]
+
+
+def fetch_steps(n: int) -> Steps:
+    # The repository fetches from itself so that no network access is needed
+    steps = base_commit() + [
+        {"type": "remote", "remote-name": "self", "remote-url": "."}
+    ]
+    return steps + [{"type": "fetch", "remote-name": "self"} for _ in range(n)]
+
+
+def reset_steps(n: int) -> Steps:
+    steps = base_commit()
+    for i in range(n):
+        steps += [
+            {"type": "commit", "empty": True, "message": f"Undone {i}"},
+            {
+                "type": "reset",
+                "revision": "HEAD~1",
+                "mode": ("soft", "mixed", "hard")[i % 3],
+            },
+        ]
+    return steps
+
+
+def revert_steps(n: int) -> Steps:
+    steps = base_commit()
+    for i in range(n):
+        steps += [
+            {"type": "edit-file", "filename": "base.txt", "contents": f"{i}\n"},
+            {"type": "add", "files": ["base.txt"]},
+            {"type": "commit", "message": f"Edit {i}"},
+            {"type": "revert", "revision": "HEAD"},
+        ]
+    return steps
+
+
+def merge_steps(n: int) -> Steps:
+    steps = base_commit()
+    for i in range(n):
+        steps += [
+            {"type": "branch", "branch-name": f"feature-{i}"},
+            {"type": "new-file", "filename": file_name(i)},
+            {"type": "add", "files": [file_name(i)]},
+            {"type": "commit", "message": f"Feature {i}"},
+            {"type": "checkout", "branch-name": "main"},
+            {"type": "merge", "branch-name": f"feature-{i}", "no-ff": True},
+        ]
+    return steps
+
+
+def generate_history_steps(n: int) -> Steps:
+    return [
+        {
+            "type": "generate-history",
+            "commits": 10,
+            "branches": 3,
+            "merge-probability": 0.2,
+            "seed": i,
+            "branch-prefix": f"generated-{i}",
+        }
+        for i in range(n)
+    ]
+
+
+def generate_files_steps(n: int) -> Steps:
+    return [
+        {
+            "type": "generate-files",
+            "count": 10,
+            "directory": f"generated-{i}",
+            "seed": i,
+        }
+        for i in range(n)
+    ]
+
+
+STEP_TYPE_STEPS: Dict[StepType, Callable[[int], Steps]] = {
+    StepType.COMMIT: commit_steps,
+    StepType.ADD: add_steps,
+    StepType.TAG: tag_steps,
+    StepType.NEW_FILE: new_file_steps,
+    StepType.EDIT_FILE: edit_file_steps,
+    StepType.DELETE_FILE: delete_file_steps,
+    StepType.APPEND_FILE: append_file_steps,
+    StepType.BASH: bash_steps,
+    StepType.BRANCH: branch_steps,
+    StepType.BRANCH_RENAME: branch_rename_steps,
+    StepType.BRANCH_DELETE: branch_delete_steps,
+    StepType.CHECKOUT: checkout_steps,
+    StepType.REMOTE: remote_steps,
+    StepType.RESET: reset_steps,
+    StepType.REVERT: revert_steps,
+    StepType.MERGE: merge_steps,
+    StepType.FETCH: fetch_steps,
+    StepType.GENERATE_HISTORY: generate_history_steps,
+    StepType.GENERATE_FILES: generate_files_steps,
+}
+
+
+def step_type(step_type: StepType, n: int) -> SpecData:
+    """A spec that runs n steps of the given type, along with the steps needed to
+    set them up.
+    """
+    return spec(f"{step_type.value}-{n}", STEP_TYPE_STEPS[step_type](n))
@@ -0,0 +1,184 @@
+"""Builds synthetic specs through initialize() and create_repo_smith(), reporting
+p50/p95 timings and the number of processes launched for each of them.
+"""
+
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from benchmarks import specs
+from repo_smith.initialize_repo import InitializerOptions, initialize_repo
+from repo_smith.repo_smith import RepoSmith, create_repo_smith
+from repo_smith.snapshot_cache import git_version
+from repo_smith.steps.step_type import StepType
+from repo_smith.tracing import counting_process_launches, process_launches
+from repo_smith.version import __version__
+
+GROUPS = ("history", "tree", "refs", "steps")
+
+DEFAULT_SCALES: Dict[str, List[int]] = {
+    "history": [10, 100, 1000],
+    "tree": [10, 100, 1000],
+    "refs": [1, 10, 100],
+    "steps": [10],
+}
+
+FULL_SCALES: Dict[str, List[int]] = {
+    "history": [10, 100, 1000, 10000, 100000],
+    "tree": [10, 100, 1000, 10000, 100000],
+    "refs": [1, 10, 100, 1000, 10000],
+    "steps": [10, 100, 1000],
+}
+
+
+def percentile(values: List[float], p: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+def measure(
+    name: str, path: str, scale: int, build: Callable[[], None], repeat: int
+) -> Dict[str, Any]:
+    times: List[float] = []
+    launches: List[int] = []
+    for _ in range(repeat):
+        start_launches = process_launches()
+        with counting_process_launches():
+            start = time.perf_counter()
+            build()
+            times.append(time.perf_counter() - start)
+        launches.append(process_launches() - start_launches)
+
+    return {
+        "name": name,
+        "path": path,
+        "scale": scale,
+        "runs": repeat,
+        "p50": percentile(times, 50),
+        "p95": percentile(times, 95),
+        "min": min(times),
+        "max": max(times),
+        "process_launches": int(statistics.median(launches)),
+    }
+
+
+def write_spec(spec_data: specs.SpecData, dir: str) -> str:
+    spec_path = os.path.join(dir, f"{spec_data['name']}.yml")
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    with open(spec_path, "w") as spec_file:
+        yaml.dump(spec_data, spec_file, Dumper=dumper)
+    return spec_path
+
+
+def initialize_build(spec_path: str, options: InitializerOptions) -> Callable[[], None]:
+    def build() -> None:
+        # Parsing is part of what users wait for, so it is measured as well
+        with initialize_repo(spec_path, **options).initialize():
+            pass
+
+    return build
+
+
+def helpers_history(rs: RepoSmith, n: int) -> None:
+    for i in range(n):
+        rs.files.create_or_update(specs.file_name(i), f"{i}\n")
+        rs.git.add(specs.file_name(i))
+        rs.git.commit(message=f"Commit {i}")
+
+
+def helpers_tree(rs: RepoSmith, n: int) -> None:
+    for i in range(n):
+        rs.files.create_or_update(specs.file_name(i), f"{i}\n")
+    rs.git.add(".")
+    rs.git.commit(message=f"Add {n} files")
+
+
+def helpers_refs(rs: RepoSmith, n: int) -> None:
+    rs.files.create_or_update("base.txt", "base\n")
+    rs.git.add("base.txt")
+    rs.git.commit(message="Base commit")
+    for i in range(n):
+        rs.git.tag(f"tag-{i}")
+        rs.git.branch(f"branch-{i}")
+
+
+HELPER_BUILDS: Dict[str, Callable[[RepoSmith, int], None]] = {
+    "history": helpers_history,
+    "tree": helpers_tree,
+    "refs": helpers_refs,
+}
+
+
+def create_repo_smith_build(
+    helpers: Callable[[RepoSmith, int], None], n: int
+) -> Callable[[], None]:
+    def build() -> None:
+        # The helpers run git in the current directory
+        cwd = os.getcwd()
+        with create_repo_smith(False) as rs:
+            rs.files.cd(rs.repo.working_dir)
+            try:
+                helpers(rs, n)
+            finally:
+                os.chdir(cwd)
+
+    return build
+
+
+def run_suite(
+    scales: Optional[Dict[str, List[int]]] = None,
+    repeat: int = 5,
+    options: Optional[InitializerOptions] = None,
+    log: Callable[[str], None] = lambda message: print(message, file=sys.stderr),
+) -> Dict[str, Any]:
+    """Runs the benchmarks of every group in scales, returning the report."""
+    scales = DEFAULT_SCALES if scales is None else scales
+    options = {} if options is None else options
+    results: List[Dict[str, Any]] = []
+
+    def record(result: Dict[str, Any]) -> None:
+        log(
+            f"{result['name']} ({result['path']}, scale {result['scale']}): "
+            f"p50 {result['p50']:.3f}s, p95 {result['p95']:.3f}s, "
+            f"{result['process_launches']} processes"
+        )
+        results.append(result)
+
+    with tempfile.TemporaryDirectory() as spec_dir:
+        for group in GROUPS:
+            for scale in scales.get(group, []):
+                if group == "steps":
+                    for step_type in StepType:
+                        spec_path = write_spec(
+                            specs.step_type(step_type, scale), spec_dir
+                        )
+                        build = initialize_build(spec_path, options)
+                        record(
+                            measure(step_type.value, "initialize", scale, build, repeat)
+                        )
+                    continue
+
+                spec_path = write_spec(getattr(specs, group)(scale), spec_dir)
+                build = initialize_build(spec_path, options)
+                record(measure(group, "initialize", scale, build, repeat))
+                build = create_repo_smith_build(HELPER_BUILDS[group], scale)
+                record(measure(group, "create_repo_smith", scale, build, repeat))
+
+    return {
+        "environment": {
+            "repo-smith": __version__,
+            "git": git_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "repeat": repeat,
+        "options": dict(options),
+        "results": results,
+    }
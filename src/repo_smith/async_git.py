@@ -0,0 +1,39 @@
+import os
+from typing import IO, Dict, List, Optional
+
+from git import GitCommandError, Repo
+
+
+async def run_command_async(
+    command: List[str],
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    stdin: Optional[IO[bytes]] = None,
+) -> str:
+    """Runs the command on the running event loop, raising GitCommandError with
+    its output if it fails, like GitPython does.
+    """
+    # asyncio is only needed by async builds, so it is not imported up front
+    import asyncio
+
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        cwd=cwd,
+        env=dict(os.environ, **(env or {})),
+        stdin=stdin,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise GitCommandError(command, process.returncode, stderr, stdout)
+    return stdout.decode("utf-8").strip()
+
+
+async def run_git_async(
+    repo: Repo, *args: str, stdin: Optional[IO[bytes]] = None
+) -> str:
+    """Runs git in the repository with the same environment as repo.git."""
+    return await run_command_async(
+        ["git", *args], cwd=repo.working_dir, env=repo.git.environment(), stdin=stdin
+    )
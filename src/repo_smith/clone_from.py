@@ -1,10 +1,83 @@
 from dataclasses import dataclass
+from typing import Any, List, Optional, Self, Type
 
 
 @dataclass
 class CloneFrom:
     """Indicates that the first step of the initialization should be to clone the
     indicated repository and then apply commits to it.
+
+    The clone can be shallow, partial, limited to a single branch or left
+    without a checkout, so that large repositories can be used as a base without
+    fetching their whole history and every blob.
     """
 
     repo_url: str
+    depth: Optional[int] = None
+    filter: Optional[str] = None
+    # None leaves it to git, which only clones a single branch for shallow clones
+    single_branch: Optional[bool] = None
+    no_checkout: bool = False
+
+    def clone_args(self) -> List[str]:
+        """Returns the options of git-clone for the settings."""
+        args: List[str] = []
+        if self.depth is not None:
+            args.append(f"--depth={self.depth}")
+        if self.filter is not None:
+            args.append(f"--filter={self.filter}")
+        if self.single_branch is not None:
+            args.append(
+                "--single-branch" if self.single_branch else "--no-single-branch"
+            )
+        if self.no_checkout:
+            args.append("--no-checkout")
+        return args
+
+    @classmethod
+    def parse(cls: Type[Self], value: Any) -> Optional[Self]:
+        """Parses the clone-from field of a spec, which is either a URL or a
+        mapping with the URL and the clone settings.
+        """
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return cls(repo_url=value)
+        if not isinstance(value, dict):
+            raise ValueError('Invalid "clone-from" field, expected a URL or map.')
+
+        url = value.get("url")
+        if not isinstance(url, str) or url.strip() == "":
+            raise ValueError('Missing "url" field in clone-from.')
+
+        depth = value.get("depth")
+        if depth is not None and (
+            isinstance(depth, bool) or not isinstance(depth, int) or depth < 1
+        ):
+            raise ValueError(
+                'Invalid "depth" field in clone-from, expected a positive integer.'
+            )
+
+        filter = value.get("filter")
+        if filter is not None and (not isinstance(filter, str) or filter.strip() == ""):
+            raise ValueError('Empty "filter" field in clone-from.')
+
+        single_branch = value.get("single-branch")
+        if single_branch is not None and not isinstance(single_branch, bool):
+            raise ValueError(
+                'Invalid "single-branch" field in clone-from, expected a bool.'
+            )
+
+        no_checkout = value.get("no-checkout", False)
+        if not isinstance(no_checkout, bool):
+            raise ValueError(
+                'Invalid "no-checkout" field in clone-from, expected a bool.'
+            )
+
+        return cls(
+            repo_url=url,
+            depth=depth,
+            filter=filter,
+            single_branch=single_branch,
+            no_checkout=no_checkout,
+        )
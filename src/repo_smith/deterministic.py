@@ -0,0 +1,131 @@
+import datetime
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Self, Tuple, Type
+
+if TYPE_CHECKING:
+    from git import Repo
+
+DEFAULT_NAME = "repo-smith"
+DEFAULT_EMAIL = "repo-smith@example.com"
+# 2024-01-01T00:00:00Z
+DEFAULT_START_TIME = 1704067200
+DEFAULT_INCREMENT = 60
+
+IDENTITY_VARIABLES = {
+    "author": ("GIT_AUTHOR_NAME", "GIT_AUTHOR_EMAIL", "GIT_AUTHOR_DATE"),
+    "committer": ("GIT_COMMITTER_NAME", "GIT_COMMITTER_EMAIL", "GIT_COMMITTER_DATE"),
+}
+
+# (name, email, date in the raw format)
+Ident = Tuple[str, str, str]
+
+
+@dataclass
+class Deterministic:
+    """A fixed identity and a virtual clock for every commit, tag and reflog entry
+    of a build, so that the same spec always produces the same object IDs.
+
+    The clock reads start_time + index * increment during the step at index, so
+    it only moves forward and a build resumed from a cached step prefix sees the
+    same times as a build from scratch. Steps that write many commits, such as
+    generate-history steps, move it forward by one more second for every commit
+    they write, passed to it as elapsed.
+    """
+
+    name: str = DEFAULT_NAME
+    email: str = DEFAULT_EMAIL
+    start_time: int = DEFAULT_START_TIME
+    increment: int = DEFAULT_INCREMENT
+
+    def time(self, index: int, elapsed: int = 0) -> int:
+        return self.start_time + index * self.increment + elapsed
+
+    def environment(self, index: int, elapsed: int = 0) -> Dict[str, str]:
+        """Returns the git environment variables for the step at index."""
+        date = f"{self.time(index, elapsed)} +0000"
+        environment: Dict[str, str] = {}
+        for name, email, date_variable in IDENTITY_VARIABLES.values():
+            environment[name] = self.name
+            environment[email] = self.email
+            environment[date_variable] = date
+        return environment
+
+    @classmethod
+    def parse(cls: Type[Self], value: Any) -> Optional[Self]:
+        """Parses the deterministic field of a spec, which is either a bool or a
+        mapping that overrides the default identity and clock.
+        """
+        if value is None or value is False:
+            return None
+        if value is True:
+            return cls()
+        if not isinstance(value, dict):
+            raise ValueError('Invalid "deterministic" field, expected a bool or map.')
+
+        name = value.get("name", DEFAULT_NAME)
+        email = value.get("email", DEFAULT_EMAIL)
+        if not isinstance(name, str) or name.strip() == "":
+            raise ValueError('Empty "name" field in deterministic.')
+        if not isinstance(email, str) or email.strip() == "":
+            raise ValueError('Empty "email" field in deterministic.')
+
+        start_time = value.get("start-time", DEFAULT_START_TIME)
+        if isinstance(start_time, datetime.datetime):
+            if start_time.tzinfo is None:
+                start_time = start_time.replace(tzinfo=datetime.timezone.utc)
+            start_time = int(start_time.timestamp())
+        if not isinstance(start_time, int) or start_time < 0:
+            raise ValueError(
+                'Invalid "start-time" field in deterministic, expected a Unix timestamp or date time.'
+            )
+
+        increment = value.get("increment", DEFAULT_INCREMENT)
+        if not isinstance(increment, int) or increment < 0:
+            raise ValueError(
+                'Invalid "increment" field in deterministic, expected a non-negative number of seconds.'
+            )
+
+        return cls(name=name, email=email, start_time=start_time, increment=increment)
+
+
+def index_commit_identity(repo: "Repo") -> Dict[str, Any]:
+    """Returns the identity arguments of IndexFile.commit() that match the git
+    environment of the repository.
+
+    GitPython only reads the identity of commits it writes itself from os.environ,
+    so without these, repo.index.commit() ignores repo.git.update_environment().
+    """
+    from git import Actor
+
+    environment = repo.git.environment()
+    arguments: Dict[str, Any] = {}
+    for role, (name, email, date) in IDENTITY_VARIABLES.items():
+        if name in environment and email in environment:
+            arguments[role] = Actor(environment[name], environment[email])
+        if date in environment:
+            arguments["author_date" if role == "author" else "commit_date"] = (
+                environment[date]
+            )
+    return arguments
+
+
+def environment_committer(repo: "Repo") -> Optional[Ident]:
+    """Returns the committer that the git environment of the repository sets,
+    such as for deterministic builds, or None if it does not set one.
+    """
+    environment = repo.git.environment()
+    variables = IDENTITY_VARIABLES["committer"]
+    if not all(variable in environment for variable in variables):
+        return None
+    name, email, date = (environment[variable] for variable in variables)
+    return name, email, date
+
+
+def committer(repo: "Repo") -> Ident:
+    """Returns the committer of commits made in the repository."""
+    ident = environment_committer(repo)
+    if ident is not None:
+        return ident
+    name_email, _, date = repo.git.var("GIT_COMMITTER_IDENT").rpartition("> ")
+    name, _, email = name_email.partition(" <")
+    return name, email, date
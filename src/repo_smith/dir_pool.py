@@ -0,0 +1,131 @@
+import atexit
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import List, Optional, Set
+
+from repo_smith.teardown import background_remover
+from repo_smith.types import FilePath
+
+DEFAULT_MAX_SIZE = 8
+
+
+class DirPool:
+    """A bounded pool of temporary directories that each hold a freshly
+    initialized repository, recycled instead of created and removed for every
+    repository.
+
+    A directory is returned to the pool by swapping its contents for a copy of a
+    pristine .git directory, made once with git init, while the old contents are
+    removed on the background thread. Directories that are released while the
+    pool is full are removed instead, and the ones left in the pool are removed
+    when the interpreter exits.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.__idle: List[str] = []
+        # Directories handed out by acquire() that are still pristine
+        self.__pristine: Set[str] = set()
+        self.__template: Optional[str] = None
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> str:
+        """Returns a directory holding a repository as left by git init with
+        main as its initial branch.
+        """
+        with self.__lock:
+            dir = self.__idle.pop() if self.__idle else None
+        if dir is None:
+            dir = tempfile.mkdtemp(prefix="repo-smith-")
+            self.__initialize(dir)
+        with self.__lock:
+            self.__pristine.add(dir)
+        return dir
+
+    def is_pristine(self, dir: FilePath) -> bool:
+        """Returns whether the directory was just acquired, so the repository in
+        it does not have to be initialized again.
+        """
+        with self.__lock:
+            return os.path.abspath(os.fspath(dir)) in self.__pristine
+
+    def claim(self, dir: FilePath) -> None:
+        """Marks the acquired directory as no longer pristine, once a repository
+        is built in it.
+        """
+        with self.__lock:
+            self.__pristine.discard(os.path.abspath(os.fspath(dir)))
+
+    def release(self, dir: FilePath) -> None:
+        """Returns the directory to the pool, or removes it if the pool is full.
+
+        The repository in it must not be in use anymore, including by the git
+        processes of its Repo.
+        """
+        dir = os.path.abspath(os.fspath(dir))
+        self.claim(dir)
+        # The old contents move out of the way at once and are removed later
+        background_remover().remove(dir)
+        with self.__lock:
+            if len(self.__idle) >= self.max_size:
+                return
+        os.mkdir(dir, 0o700)
+        self.__initialize(dir)
+        with self.__lock:
+            self.__idle.append(dir)
+
+    def close(self) -> None:
+        """Removes the idle directories and the pristine .git directory."""
+        with self.__lock:
+            dirs, self.__idle = self.__idle, []
+            template, self.__template = self.__template, None
+        for dir in dirs:
+            shutil.rmtree(dir, ignore_errors=True)
+        if template is not None:
+            shutil.rmtree(template, ignore_errors=True)
+
+    def __initialize(self, dir: str) -> None:
+        # Copying the .git directory of a repository that git init created once is
+        # cheaper than launching git init for every directory
+        shutil.copytree(
+            os.path.join(self.__get_template(), ".git"),
+            os.path.join(dir, ".git"),
+            symlinks=True,
+        )
+
+    def __get_template(self) -> str:
+        with self.__lock:
+            if self.__template is None:
+                template = tempfile.mkdtemp(prefix="repo-smith-template-")
+                subprocess.run(
+                    ["git", "init", "--quiet", "--initial-branch=main", template],
+                    check=True,
+                )
+                self.__template = template
+            return self.__template
+
+
+_pool: Optional[DirPool] = None
+_pool_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # The directories of the parent are not the child's to recycle
+    global _pool
+    _pool = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def dir_pool() -> DirPool:
+    """Returns the pool shared by every repository of the process."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DirPool()
+            atexit.register(_pool.close)
+        return _pool
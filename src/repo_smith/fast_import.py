@@ -0,0 +1,275 @@
+import hashlib
+import os
+import stat
+import subprocess
+import tempfile
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple
+
+from git import GitCommandError, Head, Repo
+from repo_smith.deterministic import Ident, committer, environment_committer
+from repo_smith.git_session import session_for
+from repo_smith.steps.add_step import AddStep, expand_add_paths
+from repo_smith.steps.branch_step import BranchStep
+from repo_smith.steps.commit_step import CommitStep
+from repo_smith.steps.file_step import FileStep
+from repo_smith.steps.step import Step
+from repo_smith.steps.tag_step import TagStep
+
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+# (mode, blob mark, blob SHA-1)
+IndexEntry = Tuple[str, str, str]
+
+
+def cleanup_message(message: str, strip_comments: bool = False) -> str:
+    """Cleans up a message the same way git-commit and git-tag do for -m."""
+    lines: List[str] = []
+    for line in message.splitlines():
+        line = line.rstrip()
+        if strip_comments and line.startswith("#"):
+            continue
+        if line == "" and (not lines or lines[-1] == ""):
+            continue
+        lines.append(line)
+    while lines and lines[-1] == "":
+        lines.pop()
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def quote_path(path: str) -> bytes:
+    encoded = path.encode("utf-8")
+    if not any(c in path for c in ('"', "\\", "\n")):
+        return encoded
+    escaped = (
+        encoded.replace(b"\\", b"\\\\").replace(b'"', b'\\"').replace(b"\n", b"\\n")
+    )
+    return b'"' + escaped + b'"'
+
+
+class FastImportBackend:
+    """Compiles consecutive add, commit, tag and branch steps into a single
+    git-fast-import stream.
+
+    File steps are applied directly to the working directory since they do not
+    touch the object database. Any other step, or a step whose outcome depends on
+    state the backend does not model, is declined so that the caller can flush
+    the pending stream and fall back to executing the step directly.
+    """
+
+    name = "fast-import"
+
+    def __init__(self, repo: Repo) -> None:
+        self.repo = repo
+        self.__stream: Optional[BinaryIO] = None
+
+    @property
+    def pending(self) -> bool:
+        return self.__stream is not None
+
+    def apply(self, step: Step) -> bool:
+        """Applies the step to the pending stream, returning False if it has to be
+        executed directly instead.
+        """
+        if isinstance(step, FileStep):
+            step.execute(repo=self.repo)
+            return True
+
+        if not isinstance(step, (AddStep, CommitStep, TagStep, BranchStep)):
+            return False
+
+        if self.__stream is None:
+            self.__begin()
+
+        if isinstance(step, AddStep):
+            return self.__add(step)
+        elif isinstance(step, CommitStep):
+            return self.__commit(step)
+        elif isinstance(step, TagStep):
+            return self.__tag(step)
+        return self.__branch(step)
+
+    def flush(self) -> None:
+        """Imports the pending stream and synchronizes HEAD and the index with it."""
+        if self.__stream is None:
+            return
+
+        stream = self.__stream
+        self.__stream = None
+        try:
+            if stream.tell() == 0:
+                return
+            stream.write(b"done\n")
+            stream.seek(0)
+            self.__git(
+                "fast-import", "--quiet", "--done", "--date-format=raw", stdin=stream
+            )
+        finally:
+            stream.close()
+
+        if self.__branch_name != self.__base_branch_name:
+            self.repo.head.reference = Head(
+                self.repo, f"refs/heads/{self.__branch_name}"
+            )
+
+        if self.__commits > 0:
+            # The first commit captured the index, so it only has to be reset to
+            # HEAD with any changes staged since the last commit re-applied
+            self.repo.git.reset("-q")
+        session_for(self.repo).update_index(
+            [(mode, sha, path) for path, (mode, _, sha) in self.__pending.items()]
+        )
+
+    def __git(self, *args: str, **kwargs: Any) -> None:
+        """Runs git in the repository, raising GitCommandError with its output if
+        it fails, like GitPython does.
+        """
+        command = ["git", *args]
+        process = subprocess.run(
+            command, cwd=self.repo.working_dir, capture_output=True, **kwargs
+        )
+        if process.returncode != 0:
+            raise GitCommandError(
+                command,
+                process.returncode,
+                process.stderr.decode("utf-8", "replace"),
+                process.stdout.decode("utf-8", "replace"),
+            )
+
+    def __begin(self) -> None:
+        self.__stream = tempfile.TemporaryFile()
+        self.__marks = 0
+        self.__commits = 0
+        self.__pending: Dict[str, IndexEntry] = {}
+        self.__refs: Set[str] = {ref.path for ref in self.repo.refs}
+        self.__committer: Optional[Ident] = None
+        self.__base_tree: Optional[str] = None
+
+        head = self.repo.head
+        self.__branch_name: Optional[str] = (
+            None if head.is_detached else head.reference.name
+        )
+        self.__base_branch_name = self.__branch_name
+        self.__tip: Optional[str] = None
+        self.__tip_tree = EMPTY_TREE
+        if head.is_valid():
+            self.__tip = head.commit.hexsha
+            self.__tip_tree = head.commit.tree.hexsha
+
+    def __write(self, *chunks: bytes) -> None:
+        assert self.__stream is not None
+        for chunk in chunks:
+            self.__stream.write(chunk)
+
+    def __write_data(self, data: bytes) -> None:
+        self.__write(b"data %d\n" % len(data), data, b"\n")
+
+    def __next_mark(self) -> str:
+        self.__marks += 1
+        return f":{self.__marks}"
+
+    def __ident(self) -> bytes:
+        ident = environment_committer(self.repo)
+        if ident is None:
+            # Resolved once per stream to avoid one git-var call per commit
+            if self.__committer is None:
+                self.__committer = committer(self.repo)
+            ident = self.__committer
+        name, email, date = ident
+        return f"{name} <{email}> {date}".encode("utf-8")
+
+    def __add(self, step: AddStep) -> bool:
+        paths = expand_add_paths(self.repo.working_dir, step.files)
+        if paths is None:
+            return False
+
+        for path in paths:
+            self.__pending[path.replace(os.sep, "/")] = self.__blob(path)
+        return True
+
+    def __blob(self, path: str) -> IndexEntry:
+        full_path = os.path.join(self.repo.working_dir, path)
+        info = os.lstat(full_path)
+        if stat.S_ISLNK(info.st_mode):
+            mode = "120000"
+            data = os.readlink(full_path).encode("utf-8")
+        else:
+            mode = "100755" if info.st_mode & stat.S_IXUSR else "100644"
+            with open(full_path, "rb") as file:
+                data = file.read()
+
+        mark = self.__next_mark()
+        self.__write(b"blob\nmark %s\n" % mark.encode("utf-8"))
+        self.__write_data(data)
+        sha = hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+        return mode, mark, sha
+
+    def __commit(self, step: CommitStep) -> bool:
+        if self.__branch_name is None:
+            return False
+
+        if self.__commits == 0 and self.__base_tree is None:
+            # Anything staged before the stream started belongs in the first commit
+            self.__base_tree = self.repo.git.write_tree()
+
+        # git-commit cleans up the message while GitPython stores it verbatim
+        message = cleanup_message(step.message) if step.empty else step.message
+        mark = self.__next_mark()
+        ident = self.__ident()
+        self.__write(
+            b"commit refs/heads/%s\n" % self.__branch_name.encode("utf-8"),
+            b"mark %s\n" % mark.encode("utf-8"),
+            b"author %s\n" % ident,
+            b"committer %s\n" % ident,
+        )
+        self.__write_data(message.encode("utf-8"))
+        if self.__tip is not None:
+            self.__write(b"from %s\n" % self.__tip.encode("utf-8"))
+        if self.__commits == 0 and self.__base_tree != self.__tip_tree:
+            self.__write(b'M 040000 %s ""\n' % str(self.__base_tree).encode("utf-8"))
+        for path, (mode, blob_mark, _) in self.__pending.items():
+            self.__write(
+                b"M %s %s " % (mode.encode("utf-8"), blob_mark.encode("utf-8")),
+                quote_path(path),
+                b"\n",
+            )
+        self.__write(b"\n")
+
+        self.__pending = {}
+        self.__commits += 1
+        self.__tip = mark
+        return True
+
+    def __tag(self, step: TagStep) -> bool:
+        ref = f"refs/tags/{step.tag_name}"
+        if self.__tip is None or ref in self.__refs:
+            return False
+
+        if step.tag_message:
+            self.__write(
+                b"tag %s\n" % step.tag_name.encode("utf-8"),
+                b"from %s\n" % self.__tip.encode("utf-8"),
+                b"tagger %s\n" % self.__ident(),
+            )
+            self.__write_data(
+                cleanup_message(step.tag_message, strip_comments=True).encode("utf-8")
+            )
+        else:
+            self.__reset(ref, self.__tip)
+        self.__refs.add(ref)
+        return True
+
+    def __branch(self, step: BranchStep) -> bool:
+        ref = f"refs/heads/{step.branch_name}"
+        if self.__tip is None or ref in self.__refs:
+            return False
+
+        self.__reset(ref, self.__tip)
+        self.__refs.add(ref)
+        self.__branch_name = step.branch_name
+        return True
+
+    def __reset(self, ref: str, target: str) -> None:
+        self.__write(
+            b"reset %s\n" % ref.encode("utf-8"),
+            b"from %s\n\n" % target.encode("utf-8"),
+        )
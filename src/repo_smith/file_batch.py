@@ -0,0 +1,189 @@
+import locale
+import os
+import stat
+from typing import Dict, List, Optional, Set
+
+from git import Repo
+from repo_smith.git_session import session_for
+from repo_smith.steps.add_step import GLOB_CHARACTERS, AddStep, expand_add_paths
+from repo_smith.steps.file_step import (
+    AppendFileStep,
+    DeleteFileStep,
+    EditFileStep,
+    FileStep,
+    NewFileStep,
+)
+from repo_smith.steps.step import Step
+
+
+class FileBatch:
+    """Coalesces consecutive file steps, and optionally the add steps between
+    them, into a single pass over the working directory and a single index
+    update, for which the files are hashed by one long-lived git process.
+
+    The pending contents of every touched file are kept in memory, so a file
+    created, appended to and edited within a batch is only written once. Steps
+    whose outcome the batch cannot reproduce, such as editing a missing file or
+    adding a glob, are declined so that the caller can flush the batch and
+    execute the step directly, which also raises the step's usual error.
+    """
+
+    def __init__(self, repo: Repo, stage: bool = True) -> None:
+        self.repo = repo
+        self.__stage = stage
+        # Relative path to its pending contents, or None if it is deleted
+        self.__files: Dict[str, Optional[str]] = {}
+        # Contents to append to files that exist but are not otherwise pending
+        self.__appends: Dict[str, str] = {}
+        self.__staged: List[str] = []
+        self.__staged_paths: Set[str] = set()
+        self.__staged_dirs: Set[str] = set()
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.__files or self.__appends or self.__staged)
+
+    def apply(self, step: Step) -> bool:
+        """Adds the step to the batch, returning False if it has to be executed
+        directly instead.
+        """
+        if isinstance(step, FileStep):
+            return self.__apply_file(step)
+        if isinstance(step, AddStep) and self.__stage:
+            return self.__add(step)
+        return False
+
+    def flush(self) -> None:
+        """Writes the pending files and stages the pending adds."""
+        files = self.__files
+        appends = self.__appends
+        staged = self.__staged
+        self.__files = {}
+        self.__appends = {}
+        self.__staged = []
+        self.__staged_paths = set()
+        self.__staged_dirs = set()
+
+        dirs: Set[str] = set()
+        encoding = locale.getpreferredencoding(False)
+        for path, contents in appends.items():
+            with open(os.path.join(self.repo.working_dir, path), "a") as file:
+                file.write(contents)
+        for path, contents in files.items():
+            full_path = os.path.join(self.repo.working_dir, path)
+            if contents is None:
+                if os.path.lexists(full_path):
+                    os.remove(full_path)
+                continue
+
+            dir = os.path.dirname(full_path)
+            if dir not in dirs:
+                os.makedirs(dir, exist_ok=True)
+                dirs.add(dir)
+            # Encoded up front so the file is written with a single call, the same
+            # way open() in text mode would encode it
+            data = contents.replace("\n", os.linesep).encode(encoding)
+            with open(full_path, "wb", buffering=0) as file:
+                file.write(data)
+
+        if staged:
+            self.__stage_files(staged)
+
+    def __stage_files(self, files: List[str]) -> None:
+        """Stages the files with the session's git-hash-object process and a single
+        git-update-index run, rather than hashing every file separately.
+        """
+        paths = expand_add_paths(self.repo.working_dir, files)
+        modes: List[str] = []
+        for path in paths or []:
+            mode = os.lstat(os.path.join(self.repo.working_dir, path)).st_mode
+            if stat.S_ISLNK(mode):
+                break
+            modes.append("100755" if mode & stat.S_IXUSR else "100644")
+        if paths is None or len(modes) < len(paths):
+            # Symlinks are hashed by their target, which hash-object cannot do
+            self.repo.index.add(files)
+            return
+
+        session = session_for(self.repo)
+        shas = session.hash_files(paths)
+        session.update_index(
+            [
+                (mode, sha, path.replace(os.sep, "/"))
+                for mode, sha, path in zip(modes, shas, paths)
+            ]
+        )
+
+    def __apply_file(self, step: FileStep) -> bool:
+        path = os.path.normpath(step.filename)
+        if self.__is_staged(path):
+            # The pending add has to capture the contents before this step
+            return False
+
+        if isinstance(step, NewFileStep):
+            self.__set(path, step.contents)
+            return True
+
+        if not self.__exists(path):
+            return False
+        if isinstance(step, EditFileStep):
+            self.__set(path, step.contents)
+        elif isinstance(step, DeleteFileStep):
+            self.__set(path, None)
+        elif isinstance(step, AppendFileStep):
+            contents = self.__files.get(path)
+            if contents is not None:
+                self.__files[path] = contents + step.contents
+            else:
+                self.__appends[path] = self.__appends.get(path, "") + step.contents
+        else:
+            return False
+        return True
+
+    def __set(self, path: str, contents: Optional[str]) -> None:
+        self.__appends.pop(path, None)
+        self.__files[path] = contents
+
+    def __exists(self, path: str) -> bool:
+        if path in self.__files:
+            return self.__files[path] is not None
+        return os.path.isfile(os.path.join(self.repo.working_dir, path))
+
+    def __add(self, step: AddStep) -> bool:
+        entries: List[str] = []
+        for file in step.files:
+            if any(c in file for c in GLOB_CHARACTERS):
+                return False
+            path = os.path.normpath(file)
+            full_path = os.path.join(self.repo.working_dir, path)
+            if path in self.__files:
+                if self.__files[path] is None:
+                    return False
+            elif not os.path.lexists(full_path) and not any(
+                contents is not None and self.__is_under(pending, path)
+                for pending, contents in self.__files.items()
+            ):
+                return False
+            entries.append(path)
+
+        # Pending files are written before they are staged, so a directory also
+        # picks up the ones under it, the same as when the steps run one by one
+        for entry in entries:
+            full_path = os.path.join(self.repo.working_dir, entry)
+            if entry in self.__files or (
+                os.path.lexists(full_path) and not os.path.isdir(full_path)
+            ):
+                self.__staged_paths.add(entry)
+            else:
+                self.__staged_dirs.add(entry)
+        self.__staged.extend(step.files)
+        return True
+
+    def __is_staged(self, path: str) -> bool:
+        if path in self.__staged_paths:
+            return True
+        return any(self.__is_under(path, dir) for dir in self.__staged_dirs)
+
+    @staticmethod
+    def __is_under(path: str, dir: str) -> bool:
+        return dir == os.curdir or path.startswith(dir + os.sep)
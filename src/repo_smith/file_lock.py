@@ -0,0 +1,38 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from repo_smith.types import FilePath
+
+
+@contextmanager
+def file_lock(path: FilePath) -> Iterator[None]:
+    """Holds an exclusive lock on the file at path, creating it if needed, so that
+    only one process at a time runs the body.
+    """
+    with open(path, "a+b") as lock_file:
+        if os.name == "nt":
+            import msvcrt
+
+            while True:
+                try:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about 10 seconds
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
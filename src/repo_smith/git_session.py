@@ -0,0 +1,208 @@
+import subprocess
+import weakref
+from typing import IO, TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from git import GitCommandError, Repo
+
+CAT_FILE_COMMAND = ["git", "cat-file", "--batch-command"]
+UPDATE_REF_COMMAND = ["git", "update-ref", "--stdin"]
+# Blobs are stored as is, the same as GitPython's IndexFile.add()
+HASH_OBJECT_COMMAND = ["git", "hash-object", "-w", "--no-filters", "--stdin-paths"]
+HASH_OBJECT_CHUNK_SIZE = 512
+UPDATE_INDEX_COMMAND = ["git", "update-index", "--index-info"]
+
+
+class GitProcess:
+    """A long-lived git process that is spoken to over stdin and stdout."""
+
+    def __init__(self, command: List[str], cwd: str) -> None:
+        self.command = command
+        self.cwd = cwd
+        self.__process: Optional[subprocess.Popen[bytes]] = None
+
+    def send(self, *lines: str) -> None:
+        stdin = self.__ensure_started().stdin
+        assert stdin is not None
+        for line in lines:
+            if "\n" in line:
+                raise ValueError(f"Invalid line sent to {self.command[1]}: {line!r}")
+            stdin.write(line.encode("utf-8") + b"\n")
+        stdin.flush()
+
+    def read_line(self) -> bytes:
+        return self.__stdout().readline()
+
+    def read(self, size: int) -> bytes:
+        return self.__stdout().read(size)
+
+    def fail(self) -> "GitCommandError":
+        """Stops the process after it errored, returning the error it reported."""
+        from git import GitCommandError
+
+        process = self.__process
+        assert process is not None
+        self.__process = None
+        if process.stdin is not None:
+            process.stdin.close()
+        stderr = process.stderr.read() if process.stderr is not None else b""
+        status = process.wait()
+        return GitCommandError(self.command, status, stderr)
+
+    def close(self) -> None:
+        process = self.__process
+        self.__process = None
+        if process is None:
+            return
+        for stream in (process.stdin, process.stdout, process.stderr):
+            if stream is not None:
+                stream.close()
+        process.wait()
+
+    def __stdout(self) -> IO[bytes]:
+        # Responses are read from the process the request was sent to, even if it
+        # has exited since, rather than from a restarted one that was sent nothing
+        assert self.__process is not None
+        stdout = self.__process.stdout
+        assert stdout is not None
+        return stdout
+
+    def __ensure_started(self) -> subprocess.Popen[bytes]:
+        if self.__process is None or self.__process.poll() is not None:
+            self.__process = subprocess.Popen(
+                self.command,
+                cwd=self.cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        return self.__process
+
+
+class GitSession:
+    """Keeps git-cat-file, git-update-ref and git-hash-object processes alive for a
+    repository, so object lookups, ref updates and blob writes do not launch a new
+    process every time.
+
+    Porcelain commands, such as checkout or merge, are still run on their own.
+    """
+
+    def __init__(self, repo_dir: str) -> None:
+        self.repo_dir = repo_dir
+        self.__cat_file = GitProcess(CAT_FILE_COMMAND, repo_dir)
+        self.__update_ref = GitProcess(UPDATE_REF_COMMAND, repo_dir)
+        self.__hash_object = GitProcess(HASH_OBJECT_COMMAND, repo_dir)
+        self.__finalizer = weakref.finalize(
+            self,
+            GitSession.__close_all,
+            self.__cat_file,
+            self.__update_ref,
+            self.__hash_object,
+        )
+
+    def object_info(self, rev: str) -> Optional[Tuple[str, str, int]]:
+        """Returns the SHA, type and size of the object rev resolves to, or None if
+        it does not resolve to any object.
+        """
+        self.__cat_file.send(f"info {rev}")
+        return self.__parse_header(self.__cat_file.read_line())
+
+    def resolve(self, rev: str) -> Optional[str]:
+        info = self.object_info(rev)
+        return info[0] if info is not None else None
+
+    def read_object(self, rev: str) -> Optional[Tuple[str, str, bytes]]:
+        """Returns the SHA, type and contents of the object rev resolves to."""
+        self.__cat_file.send(f"contents {rev}")
+        header = self.__parse_header(self.__cat_file.read_line())
+        if header is None:
+            return None
+        sha, object_type, size = header
+        contents = self.__cat_file.read(size)
+        self.__cat_file.read(1)
+        return sha, object_type, contents
+
+    def update_refs(self, instructions: List[str]) -> None:
+        """Applies the git-update-ref --stdin instructions as a single atomic
+        transaction, such as "create refs/heads/main <sha>".
+        """
+        if not instructions:
+            return
+        self.__update_ref.send("start", *instructions, "prepare", "commit")
+        for stage in ("start", "prepare", "commit"):
+            if self.__update_ref.read_line().strip() != f"{stage}: ok".encode("utf-8"):
+                raise self.__update_ref.fail()
+
+    def hash_files(self, paths: List[str]) -> List[str]:
+        """Writes the files at paths, relative to the working directory, as blobs
+        and returns their SHAs.
+        """
+        shas: List[str] = []
+        # Sent in chunks small enough that the SHAs written back never fill the
+        # pipe while paths are still being sent
+        for start in range(0, len(paths), HASH_OBJECT_CHUNK_SIZE):
+            chunk = paths[start : start + HASH_OBJECT_CHUNK_SIZE]
+            self.__hash_object.send(*chunk)
+            for _ in chunk:
+                sha = self.__hash_object.read_line().strip()
+                if not sha:
+                    raise self.__hash_object.fail()
+                shas.append(sha.decode("utf-8"))
+        return shas
+
+    def update_index(self, entries: List[Tuple[str, str, str]]) -> None:
+        """Stages the (mode, SHA, path) entries with a single git-update-index run,
+        which only writes the index once.
+        """
+        from git import GitCommandError
+
+        if not entries:
+            return
+        index_info = "".join(f"{mode} {sha}\t{path}\n" for mode, sha, path in entries)
+        process = subprocess.run(
+            UPDATE_INDEX_COMMAND,
+            cwd=self.repo_dir,
+            input=index_info.encode("utf-8"),
+            capture_output=True,
+        )
+        if process.returncode != 0:
+            raise GitCommandError(
+                UPDATE_INDEX_COMMAND,
+                process.returncode,
+                process.stderr.decode("utf-8", "replace"),
+            )
+
+    def close(self) -> None:
+        self.__finalizer()
+
+    def __parse_header(self, line: bytes) -> Optional[Tuple[str, str, int]]:
+        parts = line.decode("utf-8").split()
+        if len(parts) != 3 or parts[-1] in ("missing", "ambiguous"):
+            if not line:
+                raise self.__cat_file.fail()
+            return None
+        sha, object_type, size = parts
+        return sha, object_type, int(size)
+
+    @staticmethod
+    def __close_all(*processes: GitProcess) -> None:
+        for process in processes:
+            process.close()
+
+
+_sessions: "weakref.WeakKeyDictionary[Repo, GitSession]" = weakref.WeakKeyDictionary()
+
+
+def session_for(repo: "Repo") -> GitSession:
+    """Returns the session of the repository, starting one if needed."""
+    session = _sessions.get(repo)
+    if session is None:
+        session = GitSession(repo.working_dir)
+        _sessions[repo] = session
+    return session
+
+
+def close_session(repo: "Repo") -> None:
+    session = _sessions.pop(repo, None)
+    if session is not None:
+        session.close()
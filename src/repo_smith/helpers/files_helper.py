@@ -3,15 +3,17 @@ import shutil
 import stat
 import textwrap
 from io import TextIOWrapper
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from git import Repo
 from repo_smith.helpers.helper import Helper
 from repo_smith.types import FilePath
 
+if TYPE_CHECKING:
+    from git import Repo
+
 
 class FilesHelper(Helper):
-    def __init__(self, repo: Optional[Repo], verbose: bool) -> None:
+    def __init__(self, repo: Optional["Repo"], verbose: bool) -> None:
         super().__init__(repo, verbose)
 
     def create_or_update(
@@ -1,6 +1,6 @@
-from typing import List, Optional, Union, Unpack
+from typing import TYPE_CHECKING, List, Optional, Union, Unpack
 
-from git import Repo
+from repo_smith.git_session import GitSession, session_for
 from repo_smith.helpers.git_helper.add_options import ADD_SPEC, AddOptions
 from repo_smith.helpers.git_helper.branch_options import BRANCH_SPEC, BranchOptions
 from repo_smith.helpers.git_helper.checkout_options import (
@@ -22,11 +22,45 @@ from repo_smith.helpers.git_helper.tag_options import TAG_SPEC, TagOptions
 from repo_smith.helpers.git_helper.push_options import PUSH_SPEC, PushOptions
 from repo_smith.helpers.helper import Helper
 
+if TYPE_CHECKING:
+    from git import Repo
+
 
 class GitHelper(Helper):
-    def __init__(self, repo: Optional[Repo], verbose: bool) -> None:
+    def __init__(self, repo: Optional["Repo"], verbose: bool) -> None:
         super().__init__(repo, verbose)
 
+    @property
+    def session(self) -> GitSession:
+        """Long-lived git processes for object lookups and ref updates."""
+        if self.repo is None:
+            raise ValueError("Repo is None, cannot access")
+        return session_for(self.repo)
+
+    def rev_parse(self, rev: str) -> Optional[str]:
+        """Resolves the revision to an object name, or None if it does not exist.
+
+        Unlike the other commands, this reuses a long-lived git-cat-file process.
+        """
+        return self.session.resolve(rev)
+
+    def update_ref(
+        self,
+        ref: str,
+        new_value: Optional[str],
+        old_value: Optional[str] = None,
+    ) -> None:
+        """Updates or, if new_value is None, deletes the given ref.
+
+        Unlike the other commands, this reuses a long-lived git-update-ref process.
+        """
+        old = [] if old_value is None else [old_value]
+        if new_value is None:
+            instruction = " ".join(["delete", ref, *old])
+        else:
+            instruction = " ".join(["update", ref, new_value, *old])
+        self.session.update_refs([instruction])
+
     def tag(
         self,
         tag_name: str,
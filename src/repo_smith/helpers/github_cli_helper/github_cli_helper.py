@@ -1,6 +1,5 @@
-from typing import Optional, Unpack
+from typing import TYPE_CHECKING, Optional, Unpack
 
-from git import Repo
 from repo_smith.command_result import CommandResult
 from repo_smith.helpers.github_cli_helper.api_options import API_SPEC, ApiOptions
 from repo_smith.helpers.github_cli_helper.repo_clone_options import (
@@ -22,9 +21,12 @@ from repo_smith.helpers.github_cli_helper.repo_view_options import (
 from repo_smith.helpers.helper import Helper
 from repo_smith.types import FilePath
 
+if TYPE_CHECKING:
+    from git import Repo
+
 
 class GithubCliHelper(Helper):
-    def __init__(self, repo: Optional[Repo], verbose: bool) -> None:
+    def __init__(self, repo: Optional["Repo"], verbose: bool) -> None:
         super().__init__(repo, verbose)
 
     def repo_view(
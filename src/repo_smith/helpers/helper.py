@@ -1,11 +1,13 @@
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from git import Repo
 from repo_smith.command_result import CommandResult, run
 
+if TYPE_CHECKING:
+    from git import Repo
+
 
 class Helper:
-    def __init__(self, repo: Optional[Repo], verbose: bool) -> None:
+    def __init__(self, repo: Optional["Repo"], verbose: bool) -> None:
         self.repo = repo
         self.verbose = verbose
 
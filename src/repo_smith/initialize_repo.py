@@ -1,53 +1,197 @@
+import bisect
+import dataclasses
+import inspect
+import itertools
 import os
 import shutil
 import tempfile
-from contextlib import contextmanager
-from typing import Any, Callable, Dict, Iterator, Optional, Set, TypeAlias
+from contextlib import AbstractContextManager, asynccontextmanager, contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeAlias,
+    TypedDict,
+    Union,
+    Unpack,
+)
 
-import yaml
-from git import Repo
-
-import repo_smith.steps.tag_step
 from repo_smith.clone_from import CloneFrom
+from repo_smith.deterministic import Deterministic
+from repo_smith.dir_pool import dir_pool
+from repo_smith.git_session import close_session
+from repo_smith.mirror_cache import DEFAULT_MAX_AGE, MirrorCache
+from repo_smith.object_store import ObjectStore
+from repo_smith.ref_index import track_refs, untrack_refs
+from repo_smith.snapshot_cache import SnapshotCache
 from repo_smith.spec import Spec
-from repo_smith.steps.dispatcher import Dispatcher
+from repo_smith.spec_cache import SpecCache
+from repo_smith.step_sequence import StepSequence, iterate_steps
+from repo_smith.steps.step import Step
+from repo_smith.teardown import remove_dir
+from repo_smith.tracing import Trace, traced, traced_step
+
+# GitPython, PyYAML, asyncio and the process pool are only imported once they are
+# needed, so importing repo-smith, such as during test collection, stays cheap
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from git import Repo
+
+    from repo_smith.fast_import import FastImportBackend
+    from repo_smith.file_batch import FileBatch
+    from repo_smith.ref_batch import RefBatch
+    from repo_smith.tree_writer import TreeWriter
 
-Hook: TypeAlias = Callable[[Repo], None]
+Hook: TypeAlias = Callable[["Repo"], None | Awaitable[None]]
+Backend: TypeAlias = Union["FastImportBackend", "TreeWriter"]
+
+
+class InitializerOptions(TypedDict, total=False):
+    background_teardown: bool
+    cache_dir: str
+    checkpoints: bool
+    deterministic: bool
+    fast_import: bool
+    mirror_dir: str
+    mirror_max_age: Optional[float]
+    object_store: str
+    recycle_dirs: bool
+    spec_cache_dir: str
+    tree_writer: bool
 
 
 class RepoInitializer:
-    def __init__(self, spec_data: Any) -> None:
+    def __init__(self, spec_data: Any, **options: Unpack[InitializerOptions]) -> None:
         self.__spec_data = spec_data
         self.__pre_hooks: Dict[str, Hook] = {}
         self.__post_hooks: Dict[str, Hook] = {}
 
-        self.__spec = self.__parse_spec(self.__spec_data)
-        self.__validate_spec(self.__spec)
-        self.__step_ids = self.__get_all_ids(self.__spec)
+        cache_dir = options.get("cache_dir")
+        self.__cache = SnapshotCache(cache_dir) if cache_dir is not None else None
+        self.__checkpoints = options.get("checkpoints", False)
+        if self.__checkpoints and self.__cache is None:
+            raise ValueError("Checkpoints require a cache_dir to be provided.")
+        self.__background_teardown = options.get("background_teardown", False)
+        self.__recycle_dirs = options.get("recycle_dirs", False)
+        self.__fast_import = options.get("fast_import", False)
+        self.__tree_writer = options.get("tree_writer", False)
+        if self.__fast_import and self.__tree_writer:
+            raise ValueError(
+                "The fast-import backend and the tree writer cannot be used together."
+            )
+        mirror_dir = options.get("mirror_dir")
+        self.__mirror_cache = (
+            MirrorCache(mirror_dir, options.get("mirror_max_age", DEFAULT_MAX_AGE))
+            if mirror_dir is not None
+            else None
+        )
+        object_store = options.get("object_store")
+        self.__object_store = (
+            ObjectStore(object_store) if object_store is not None else None
+        )
+
+        self.__spec = (
+            spec_data
+            if isinstance(spec_data, Spec)
+            else self.__parse_spec(self.__spec_data)
+        )
+        self.__step_ids, self.__elapsed = self.__validate_spec(self.__spec)
+
+        deterministic = options.get("deterministic")
+        if deterministic is None:
+            self.__deterministic = self.__spec.deterministic
+        elif deterministic:
+            self.__deterministic = self.__spec.deterministic or Deterministic()
+        else:
+            self.__deterministic = None
+
+    @property
+    def spec(self) -> Spec:
+        return self.__spec
 
     @contextmanager
-    def initialize(self, existing_path: Optional[str] = None) -> Iterator[Repo]:
-        tmp_dir = tempfile.mkdtemp() if existing_path is None else existing_path
-        repo: Optional[Repo] = None
-        try:
-            if self.__spec.clone_from is not None:
-                repo = Repo.clone_from(self.__spec.clone_from.repo_url, tmp_dir)
-            else:
-                repo = Repo.init(tmp_dir, initial_branch="main")
+    def initialize(
+        self, existing_path: Optional[str] = None, trace: Optional[Trace] = None
+    ) -> Iterator["Repo"]:
+        """Builds the repository in a temporary directory, or existing_path if
+        given, and removes it on exit.
 
-            for step in self.__spec.steps:
-                if step.id in self.__pre_hooks:
-                    self.__pre_hooks[step.id](repo)
+        When a trace is given, spans are recorded on it for every step and hook,
+        as well as for creating and removing the directory.
+        """
+        with traced(trace, "create directory", "setup"):
+            tmp_dir = self.__create_dir(existing_path)
+        repo: Optional["Repo"] = None
+        try:
+            repo = self.build(tmp_dir, trace)
+            yield repo
+        finally:
+            self.__remove_dir(tmp_dir, repo, existing_path, trace)
 
-                step.execute(repo=repo)
+    @asynccontextmanager
+    async def initialize_async(
+        self, existing_path: Optional[str] = None, trace: Optional[Trace] = None
+    ) -> AsyncIterator["Repo"]:
+        """Same as initialize(), but launches child processes without blocking the
+        event loop and awaits hooks that are coroutines.
 
-                if step.id in self.__post_hooks:
-                    self.__post_hooks[step.id](repo)
+        CPU time and child processes are counted for the whole process, so spans
+        of builds running concurrently on the same event loop include each other.
+        """
+        with traced(trace, "create directory", "setup"):
+            tmp_dir = self.__create_dir(existing_path)
+        repo: Optional["Repo"] = None
+        try:
+            repo = await self.build_async(tmp_dir, trace)
             yield repo
         finally:
+            self.__remove_dir(tmp_dir, repo, existing_path, trace)
+
+    def __create_dir(self, existing_path: Optional[str]) -> str:
+        if existing_path is not None:
+            return existing_path
+        if self.__uses_dir_pool(existing_path):
+            return dir_pool().acquire()
+        return tempfile.mkdtemp()
+
+    def __remove_dir(
+        self,
+        dir: str,
+        repo: Optional["Repo"],
+        existing_path: Optional[str],
+        trace: Optional[Trace],
+    ) -> None:
+        # Directories created for the build are removed even if it failed, and
+        # recycled ones go back to the pool
+        if repo is None and existing_path is not None:
+            return
+        with traced(trace, "remove directory", "teardown"):
             if repo is not None:
                 repo.git.clear_cache()
-                shutil.rmtree(tmp_dir)
+                close_session(repo)
+            if self.__uses_dir_pool(existing_path):
+                dir_pool().release(dir)
+            else:
+                remove_dir(dir, self.__background_teardown)
+
+    def __uses_dir_pool(self, existing_path: Optional[str]) -> bool:
+        # Clones need an empty directory rather than an initialized repository
+        return (
+            self.__recycle_dirs
+            and existing_path is None
+            and self.__spec.clone_from is None
+        )
 
     def add_pre_hook(self, id: str, hook: Hook) -> None:
         if id not in self.__step_ids:
@@ -77,60 +221,482 @@ class RepoInitializer:
 
         self.__post_hooks[id] = hook
 
-    def __validate_spec(self, spec: Spec) -> None:
-        ids: Set[str] = set()
+    def build(self, dir: str, trace: Optional[Trace] = None) -> "Repo":
+        """Builds the repository in the given directory.
+
+        Unlike initialize(), the directory is left in place afterwards.
+        """
+        from git import Repo
+
+        from repo_smith.fast_import import FastImportBackend
+        from repo_smith.tree_writer import TreeWriter
+
+        with traced(trace, "create repository", "setup"):
+            keys, start = self.__restore(dir)
+            if start > 0:
+                repo = Repo(dir)
+            elif self.__spec.clone_from is not None:
+                clone_from = self.__spec.clone_from
+                if self.__mirror_cache is not None:
+                    self.__mirror_cache.clone(
+                        clone_from.repo_url, dir, clone_from.clone_args()
+                    )
+                    repo = Repo(dir)
+                else:
+                    repo = Repo.clone_from(
+                        clone_from.repo_url,
+                        dir,
+                        multi_options=clone_from.clone_args(),
+                    )
+            elif self.__is_pristine(dir):
+                repo = Repo(dir)
+            else:
+                repo = Repo.init(dir, initial_branch="main")
+
+        backend: Optional[Backend] = None
+        if self.__fast_import:
+            backend = FastImportBackend(repo)
+        elif self.__tree_writer:
+            backend = TreeWriter(repo)
+
+        async def run_hook(hook: Hook, repo: "Repo") -> None:
+            self.__run_hook(hook, repo)
+
+        async def execute(step: Step, repo: "Repo") -> None:
+            step.execute(repo=repo)
+
+        _run_sync(
+            self.__run_steps(
+                repo,
+                dir,
+                keys,
+                start,
+                backend,
+                trace,
+                run_hook,
+                execute,
+            )
+        )
+        return repo
+
+    async def build_async(self, dir: str, trace: Optional[Trace] = None) -> "Repo":
+        """Same as build(), but launches child processes without blocking the event
+        loop and awaits hooks that are coroutines.
+
+        The fast-import backend is not used since it writes the whole stream to
+        git-fast-import at once, while the tree writer only talks to a long-lived
+        git process and is used the same way as in build().
+        """
+        from git import Repo
+
+        from repo_smith.async_git import run_command_async
+        from repo_smith.tree_writer import TreeWriter
+
+        with traced(trace, "create repository", "setup"):
+            keys, start = self.__restore(dir)
+            if start > 0 or self.__is_pristine(dir):
+                repo = Repo(dir)
+            else:
+                commands = [["git", "init", "--initial-branch=main", dir]]
+                if self.__spec.clone_from is not None:
+                    url = self.__spec.clone_from.repo_url
+                    args = self.__spec.clone_from.clone_args()
+                    commands = [["git", "clone", *args, url, dir]]
+                    if self.__mirror_cache is not None:
+                        import asyncio
+
+                        await asyncio.to_thread(self.__mirror_cache.mirror, url)
+                        commands = self.__mirror_cache.clone_commands(url, dir, args)
+                for command in commands:
+                    await run_command_async(command)
+                repo = Repo(dir)
+
+        backend = TreeWriter(repo) if self.__tree_writer else None
+
+        async def execute(step: Step, repo: "Repo") -> None:
+            await step.execute_async(repo=repo)
+
+        await self.__run_steps(
+            repo,
+            dir,
+            keys,
+            start,
+            backend,
+            trace,
+            self.__run_hook_async,
+            execute,
+        )
+        return repo
+
+    async def __run_steps(
+        self,
+        repo: "Repo",
+        dir: str,
+        keys: Dict[int, str],
+        start: int,
+        backend: Optional[Backend],
+        trace: Optional[Trace],
+        run_hook: Callable[[Hook, "Repo"], Awaitable[None]],
+        execute: Callable[[Step, "Repo"], Awaitable[None]],
+    ) -> None:
+        """Runs the steps from start onwards, batching them where possible, and
+        awaits run_hook and execute for the hooks and the steps that have to be
+        executed directly.
+
+        build() passes callables that never suspend, so that it can run the steps
+        without an event loop.
+        """
+        from repo_smith.file_batch import FileBatch
+        from repo_smith.ref_batch import RefBatch
+
+        steps = self.__spec.steps
+        try:
+            # The backends stage files themselves, so adds are left to them
+            batch = FileBatch(repo, stage=backend is None)
+            refs = RefBatch(repo)
+            ref_index = track_refs(repo)
+            for index, step in iterate_steps(steps, start):
+                self.__set_clock(repo, index)
+                has_hooks = step.id in self.__pre_hooks or step.id in self.__post_hooks
+                if has_hooks:
+                    self.__flush(batch, backend, refs, trace)
+
+                if step.id in self.__pre_hooks:
+                    with traced(trace, f"pre-hook {step.id}", "hook"):
+                        await run_hook(self.__pre_hooks[step.id], repo)
+                    ref_index.invalidate()
+
+                with traced_step(trace, index, step):
+                    if has_hooks or not self.__apply(step, batch, backend, refs, trace):
+                        self.__flush(batch, backend, refs, trace)
+                        await execute(step, repo)
+                ref_index.apply(step)
+
+                if self.__cache is not None and index + 1 in keys:
+                    self.__flush(batch, backend, refs, trace)
+                    with traced(trace, "store snapshot", "cache"):
+                        self.__cache.store(keys[index + 1], dir)
+
+                if step.id in self.__post_hooks:
+                    with traced(trace, f"post-hook {step.id}", "hook"):
+                        await run_hook(self.__post_hooks[step.id], repo)
+                    ref_index.invalidate()
+
+            self.__flush(batch, backend, refs, trace)
+            untrack_refs(repo)
+            self.__set_clock(repo, len(steps))
+            self.__share_objects(repo, trace)
+        except BaseException:
+            # The repository is never handed back, so its git processes are
+            # stopped here before its directory is removed
+            untrack_refs(repo)
+            repo.git.clear_cache()
+            close_session(repo)
+            raise
+
+    def __is_pristine(self, dir: str) -> bool:
+        """Returns whether dir is a recycled directory that already holds a freshly
+        initialized repository, claiming it for this build if so.
+        """
+        if not self.__recycle_dirs or not dir_pool().is_pristine(dir):
+            return False
+        dir_pool().claim(dir)
+        return True
+
+    def __restore(self, dir: str) -> Tuple[Dict[int, str], int]:
+        """Restores the longest cached step prefix into dir.
+
+        Returns the keys of the prefix lengths that can be cached, by length, and
+        the number of steps that were restored.
+        """
+        if self.__cache is None or self.__spec.clone_from is not None:
+            return {}, 0
+
+        cached_lengths = self.__get_cached_prefix_lengths()
+        if len(cached_lengths) == 0:
+            return {}, 0
+        prefix_keys = self.__cache.prefix_keys(
+            dataclasses.replace(self.__spec, deterministic=self.__deterministic)
+        )
+        keys = {
+            length: key
+            for length, key in enumerate(
+                itertools.islice(prefix_keys, cached_lengths[-1] + 1)
+            )
+            if length in cached_lengths
+        }
+        for length in reversed(cached_lengths):
+            if self.__cache.restore(keys[length], dir):
+                return keys, length
+        return keys, 0
+
+    def __set_clock(self, repo: "Repo", index: int) -> None:
+        """Sets the identity and time of the step at index for every git command
+        run through the repository, leaving them set after the last step.
+        """
+        if self.__deterministic is None:
+            return
+        position = bisect.bisect_right(
+            self.__elapsed, index, key=lambda elapsed: elapsed[0]
+        )
+        elapsed = self.__elapsed[position - 1][1] if position > 0 else 0
+        repo.git.update_environment(**self.__deterministic.environment(index, elapsed))
+
+    def __share_objects(self, repo: "Repo", trace: Optional[Trace]) -> None:
+        """Moves the objects of the built repository into the shared object store.
+
+        Snapshots are stored before this, so they keep every object they need.
+        """
+        if self.__object_store is None:
+            return
+        with traced(trace, "share objects", "setup"):
+            # Running git processes would not see the store, so they are stopped
+            repo.git.clear_cache()
+            close_session(repo)
+            self.__object_store.absorb(repo.git_dir)
+
+    def __apply(
+        self,
+        step: Step,
+        batch: "FileBatch",
+        backend: Optional[Backend],
+        refs: "RefBatch",
+        trace: Optional[Trace],
+    ) -> bool:
+        """Adds the step to the file batch, the ref batch or the backend, flushing
+        the ones whose pending steps have to be applied before it, and returns
+        False if it has to be executed directly instead.
+
+        The ref batch and the backend are never pending at the same time, since
+        the ref steps need HEAD to be up to date and the backend needs the refs.
+        """
+        if batch.apply(step):
+            return True
+        self.__flush(batch, None, None, trace)
+        if refs.pending and refs.apply(step):
+            return True
+        self.__flush(batch, None, refs, trace)
+        if backend is not None and backend.apply(step):
+            return True
+        self.__flush(batch, backend, None, trace)
+        return refs.apply(step)
+
+    def __flush(
+        self,
+        batch: "FileBatch",
+        backend: Optional[Backend],
+        refs: Optional["RefBatch"],
+        trace: Optional[Trace],
+    ) -> None:
+        """Applies the pending file steps, and then the pending steps of the backend
+        and the ref batch if they are given.
+        """
+        if batch.pending:
+            with traced(trace, "file batch", "backend"):
+                batch.flush()
+        if backend is not None and backend.pending:
+            with traced(trace, backend.name, "backend"):
+                backend.flush()
+        if refs is not None and refs.pending:
+            with traced(trace, refs.name, "backend"):
+                refs.flush()
+
+    def __run_hook(self, hook: Hook, repo: "Repo") -> None:
+        result = hook(repo)
+        if inspect.isawaitable(result):
+            if inspect.iscoroutine(result):
+                result.close()
+            raise ValueError(
+                "Hooks that are coroutines are only supported by initialize_async()."
+            )
+
+    async def __run_hook_async(self, hook: Hook, repo: "Repo") -> None:
+        result = hook(repo)
+        if inspect.isawaitable(result):
+            await result
+
+    def __get_cached_prefix_lengths(self) -> Sequence[int]:
+        """Returns the step prefix lengths whose resulting repository can be
+        restored from and stored in the snapshot cache.
+
+        Hooks observe the repository between steps, so only the prefixes before
+        the step of the first hook are replayable. A prefix that ends with a
+        post-hook's step is not, since its snapshot would be restored without
+        running the hook.
+        """
+        steps = self.__spec.steps
+        hooked_ids = self.__pre_hooks.keys() | self.__post_hooks.keys()
+        limit = min((self.__step_ids[id] for id in hooked_ids), default=len(steps))
+
+        if self.__checkpoints:
+            return range(1, limit + 1)
+        return [limit] if limit == len(steps) and limit > 0 else []
+
+    def __validate_spec(
+        self, spec: Spec
+    ) -> Tuple[Dict[str, int], List[Tuple[int, int]]]:
+        """Validates the steps in a single pass over them, returning the index of
+        the step with every ID, and the seconds the deterministic clock has
+        advanced by for generated commits from every step after one that
+        generates them onwards.
+        """
+        from repo_smith.steps.generate_history_step import GenerateHistoryStep
+        from repo_smith.steps.tag_step import TagStep
+
+        ids: Dict[str, int] = {}
         tags: Set[str] = set()
-        for step in spec.steps:
+        # Every generated commit is a second later than the one before it, so
+        # the steps after them have to start later to keep time moving forward
+        elapsed: List[Tuple[int, int]] = []
+        for index, step in enumerate(spec.steps):
+            if isinstance(step, GenerateHistoryStep):
+                total = elapsed[-1][1] if elapsed else 0
+                elapsed.append((index + 1, total + step.commits))
+
             if step.id is not None:
                 if step.id in ids:
                     raise ValueError(
                         f"ID {step.id} is duplicated from a previous step. All IDs should be unique."
                     )
-                ids.add(step.id)
+                ids[step.id] = index
 
-            if isinstance(step, repo_smith.steps.tag_step.TagStep):
+            if isinstance(step, TagStep):
                 if step.tag_name in tags:
                     raise ValueError(
                         f"Tag {step.tag_name} is already in use by a previous step. All tag names should be unique."
                     )
                 tags.add(step.tag_name)
-
-    def __get_all_ids(self, spec: Spec) -> Set[str]:
-        ids = set()
-        for step in spec.steps:
-            if step.id is not None:
-                ids.add(step.id)
-        return ids
+        return ids, elapsed
 
     def __parse_spec(self, spec: Any) -> Spec:
-        steps = []
-
-        for step in spec.get("initialization", {}).get("steps", []) or []:
-            steps.append(Dispatcher.dispatch(step))
+        steps = StepSequence.parse(
+            spec.get("initialization", {}).get("steps", []) or []
+        )
 
-        clone_from = None
-        if spec.get("initialization", {}).get("clone-from", None) is not None:
-            clone_from = CloneFrom(
-                repo_url=spec.get("initialization", {}).get("clone-from", "")
-            )
+        clone_from = CloneFrom.parse(
+            spec.get("initialization", {}).get("clone-from", None)
+        )
 
         return Spec(
             name=spec.get("name", "") or "",
             description=spec.get("description", "") or "",
             steps=steps,
             clone_from=clone_from,
+            deterministic=Deterministic.parse(
+                spec.get("initialization", {}).get("deterministic")
+            ),
         )
 
 
-def initialize_repo(spec_path: str) -> RepoInitializer:
+def initialize_repo(
+    spec_path: str, **options: Unpack[InitializerOptions]
+) -> RepoInitializer:
     if not os.path.isfile(spec_path):
         raise ValueError("Invalid spec_path provided, not found.")
 
-    with open(spec_path, "rb") as spec_file:
+    spec_cache_dir = options.get("spec_cache_dir")
+    if spec_cache_dir is None:
+        with open(spec_path, "rb") as spec_file:
+            return RepoInitializer(load_spec_data(spec_file.read()), **options)
+
+    spec_cache = SpecCache(spec_cache_dir)
+    spec, contents = spec_cache.load(spec_path)
+    if spec is not None:
+        return RepoInitializer(spec, **options)
+
+    repo_initializer = RepoInitializer(load_spec_data(contents), **options)
+    spec_cache.store(spec_path, contents, repo_initializer.spec)
+    return repo_initializer
+
+
+def load_spec_data(contents: bytes) -> Any:
+    """Loads the YAML spec with the LibYAML-based loader when it is available."""
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    spec_data = yaml.load(contents, Loader=loader)
+    if spec_data is None:
+        raise ValueError("Incomplete spec file.")
+    return spec_data
+
+
+def initialize_many(
+    spec_paths: Union[str, List[str]],
+    count: int = 1,
+    max_workers: Optional[int] = None,
+    **options: Unpack[InitializerOptions],
+) -> Iterator[AbstractContextManager["Repo"]]:
+    """Builds count repositories for each of the specs concurrently on a process
+    pool, yielding them as they finish.
+
+    Each yielded context manager removes its repository on exit, so every one of
+    them has to be entered. Repositories that are built but never yielded, such
+    as when iteration stops early, are removed when the iterator is closed. Hooks
+    are not supported since they cannot be sent to other processes.
+    """
+    if isinstance(spec_paths, str):
+        spec_paths = [spec_paths]
+    for spec_path in spec_paths:
+        if not os.path.isfile(spec_path):
+            raise ValueError("Invalid spec_path provided, not found.")
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures: Dict["Future[str]", str] = {}
         try:
-            spec_data = yaml.safe_load(spec_file)
-            if spec_data is None:
-                raise ValueError("Incomplete spec file.")
-            return RepoInitializer(spec_data)
-        except Exception as e:
-            raise e
+            for spec_path in spec_paths:
+                for _ in range(count):
+                    dir = tempfile.mkdtemp()
+                    future = executor.submit(build_repo, spec_path, dir, options)
+                    futures[future] = dir
+
+            for future in as_completed(futures):
+                dir = futures.pop(future)
+                try:
+                    future.result()
+                except BaseException:
+                    shutil.rmtree(dir, ignore_errors=True)
+                    raise
+                yield managed_repo(dir, options.get("background_teardown", False))
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for dir in futures.values():
+                shutil.rmtree(dir, ignore_errors=True)
+
+
+def build_repo(spec_path: str, dir: str, options: InitializerOptions) -> str:
+    """Builds a repository from the spec in the given directory, for use by
+    initialize_many() in worker processes.
+    """
+    repo = initialize_repo(spec_path, **options).build(dir)
+    repo.git.clear_cache()
+    close_session(repo)
+    return dir
+
+
+@contextmanager
+def managed_repo(dir: str, background_teardown: bool = False) -> Iterator["Repo"]:
+    from git import Repo
+
+    repo = Repo(dir)
+    try:
+        yield repo
+    finally:
+        repo.git.clear_cache()
+        close_session(repo)
+        remove_dir(dir, background_teardown)
+
+
+def _run_sync(coroutine: Coroutine[Any, Any, None]) -> None:
+    """Runs a coroutine that never suspends, such as the step loop of build(),
+    without an event loop.
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        return
+    coroutine.close()
+    raise RuntimeError("The coroutine suspended outside of an event loop.")
@@ -0,0 +1,164 @@
+import errno
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Sequence
+
+from repo_smith.types import FilePath
+
+# From linux/fs.h, clones the extents of one file into another on file systems
+# that support copy-on-write, such as btrfs and xfs
+FICLONE = 0x40049409
+
+# Errors meaning a strategy is not supported between the two directories, as
+# opposed to failing for a single file
+UNSUPPORTED_ERRORS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+}
+
+
+class CopyStrategy(Enum):
+    """The ways a file can be materialized, from fastest to slowest."""
+
+    REFLINK = "reflink"
+    HARDLINK = "hardlink"
+    COPY = "copy"
+
+
+@dataclass
+class CopyReport:
+    """The number of files materialized with each strategy."""
+
+    files: Dict[CopyStrategy, int] = field(default_factory=dict)
+
+    @property
+    def strategy(self) -> CopyStrategy:
+        """Returns the fastest strategy used for any file.
+
+        Hardlinks are only used for object files, so copies that hardlinked their
+        objects report HARDLINK even though the rest of the files were copied.
+        """
+        for strategy in CopyStrategy:
+            if self.files.get(strategy, 0) > 0:
+                return strategy
+        return CopyStrategy.COPY
+
+    def record(self, strategy: CopyStrategy) -> None:
+        self.files[strategy] = self.files.get(strategy, 0) + 1
+
+
+class Materializer:
+    """Copies files with the fastest strategy that works, remembering the ones
+    that are not supported so they are not retried for every file.
+    """
+
+    def __init__(self, strategies: Sequence[CopyStrategy]) -> None:
+        self.report = CopyReport()
+        self.__reflink = CopyStrategy.REFLINK in strategies and sys.platform == "linux"
+        self.__hardlink = CopyStrategy.HARDLINK in strategies
+        self.__copy_file_range = hasattr(os, "copy_file_range")
+
+    def copy(self, src_file: str, dest_file: str, immutable: bool) -> str:
+        # An existing file may be a hardlink shared with another copy, so it is
+        # replaced rather than written to
+        try:
+            os.unlink(dest_file)
+        except FileNotFoundError:
+            pass
+
+        if self.__reflink:
+            try:
+                self.__clone(src_file, dest_file)
+                shutil.copystat(src_file, dest_file)
+                self.report.record(CopyStrategy.REFLINK)
+                return dest_file
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRORS:
+                    raise
+                self.__reflink = False
+
+        # Files that are only ever replaced, never written in place, can be shared
+        if immutable and self.__hardlink:
+            try:
+                os.link(src_file, dest_file)
+                self.report.record(CopyStrategy.HARDLINK)
+                return dest_file
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRORS:
+                    raise
+                self.__hardlink = False
+
+        self.__copy(src_file, dest_file)
+        shutil.copystat(src_file, dest_file)
+        self.report.record(CopyStrategy.COPY)
+        return dest_file
+
+    def __clone(self, src_file: str, dest_file: str) -> None:
+        import fcntl
+
+        with open(src_file, "rb") as src, open(dest_file, "wb") as dest:
+            try:
+                fcntl.ioctl(dest.fileno(), FICLONE, src.fileno())
+            except OSError:
+                dest.close()
+                os.unlink(dest_file)
+                raise
+
+    def __copy(self, src_file: str, dest_file: str) -> None:
+        if self.__copy_file_range:
+            try:
+                with open(src_file, "rb") as src, open(dest_file, "wb") as dest:
+                    size = os.fstat(src.fileno()).st_size
+                    copied = 0
+                    while copied < size:
+                        count = os.copy_file_range(
+                            src.fileno(), dest.fileno(), size - copied
+                        )
+                        if count == 0:
+                            break
+                        copied += count
+                if copied == size:
+                    return
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRORS:
+                    raise
+                self.__copy_file_range = False
+        shutil.copyfile(src_file, dest_file)
+
+
+def copy_repo(
+    src: FilePath,
+    dest: FilePath,
+    strategies: Sequence[CopyStrategy] = tuple(CopyStrategy),
+) -> CopyReport:
+    """Copies the repository at src to dest with the fastest of the given
+    strategies that the file system supports, returning how each file was copied.
+
+    Every file is reflinked where possible, since copy-on-write makes the copies
+    independent. Otherwise, the files under .git/objects are hardlinked, as git
+    never modifies object files in place, only writes new ones and renames them
+    into place. Everything else, including the working directory, is copied
+    since it is written to in place.
+    """
+    objects_dir = os.path.join(os.path.abspath(src), ".git", "objects")
+    # Holds files such as alternates, which may be rewritten in place
+    info_dir = os.path.join(objects_dir, "info")
+    materializer = Materializer(strategies)
+
+    def copy(src_file: str, dest_file: str) -> str:
+        src_file = os.path.abspath(src_file)
+        immutable = (
+            os.path.commonpath([objects_dir, src_file]) == objects_dir
+            and os.path.commonpath([info_dir, src_file]) != info_dir
+        )
+        return materializer.copy(src_file, dest_file, immutable)
+
+    shutil.copytree(src, dest, symlinks=True, copy_function=copy, dirs_exist_ok=True)
+    return materializer.report
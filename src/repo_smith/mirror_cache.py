@@ -0,0 +1,110 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Set
+
+from repo_smith.file_lock import file_lock
+from repo_smith.types import FilePath
+
+DEFAULT_MAX_AGE = 300.0
+
+
+class MirrorCache:
+    """Keeps a bare mirror of every cloned URL, so that repositories are cloned
+    from a local mirror instead of over the network.
+
+    A mirror is fetched again before a clone once it is older than max_age
+    seconds, where 0 fetches before every clone and None never fetches again.
+    Clones are local, which hardlinks the mirror's objects, and then point their
+    origin back at the URL, so they end up the same as clones of the URL itself.
+    """
+
+    def __init__(
+        self, cache_dir: FilePath, max_age: Optional[float] = DEFAULT_MAX_AGE
+    ) -> None:
+        self.cache_dir = os.path.abspath(os.fspath(cache_dir))
+        self.max_age = max_age
+        self.__filterable: Set[str] = set()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.git")
+
+    def mirror(self, url: str) -> str:
+        """Creates or refreshes the mirror of the URL as needed, returning its
+        path.
+        """
+        path = self.path(url)
+        # Marks the last successful fetch through its modification time
+        fetched_path = path + ".fetched"
+        with file_lock(path + ".lock"):
+            if not os.path.isdir(path):
+                # Cloned next to the mirror and renamed into place, so that an
+                # interrupted clone never leaves a partial mirror behind
+                staging = tempfile.mkdtemp(dir=self.cache_dir, prefix="staging-")
+                try:
+                    self.__git("clone", "--mirror", "--quiet", url, staging)
+                    os.rename(staging, path)
+                except BaseException:
+                    shutil.rmtree(staging, ignore_errors=True)
+                    raise
+                self.__touch(fetched_path)
+            elif self.__is_stale(fetched_path):
+                self.__git("-C", path, "fetch", "--prune", "--quiet")
+                self.__touch(fetched_path)
+            if path not in self.__filterable:
+                # Lets shallow and partial clones filter what they fetch
+                self.__git("-C", path, "config", "uploadpack.allowFilter", "true")
+                self.__filterable.add(path)
+        return path
+
+    def clone_commands(
+        self, url: str, dest: str, args: Sequence[str] = ()
+    ) -> List[List[str]]:
+        """Returns the git commands that clone the URL into dest from its mirror,
+        which has to be created with mirror() first, passing args to git-clone.
+        """
+        source = self.path(url)
+        if args:
+            # Local clones ignore --depth and --filter, which only apply when the
+            # mirror is fetched from as a remote
+            source = Path(source).as_uri()
+        return [
+            ["git", "clone", "--quiet", *args, source, dest],
+            ["git", "-C", dest, "remote", "set-url", "origin", url],
+        ]
+
+    def clone(self, url: str, dest: str, args: Sequence[str] = ()) -> None:
+        self.mirror(url)
+        for command in self.clone_commands(url, dest, args):
+            self.__git(*command[1:])
+
+    def __is_stale(self, fetched_path: str) -> bool:
+        if self.max_age is None:
+            return False
+        try:
+            fetched_at = os.stat(fetched_path).st_mtime
+        except FileNotFoundError:
+            return True
+        return time.time() - fetched_at >= self.max_age
+
+    def __git(self, *args: str) -> None:
+        from git import GitCommandError
+
+        command = ["git", *args]
+        process = subprocess.run(command, capture_output=True)
+        if process.returncode != 0:
+            raise GitCommandError(
+                command, process.returncode, process.stderr, process.stdout
+            )
+
+    @staticmethod
+    def __touch(path: str) -> None:
+        with open(path, "a"):
+            pass
+        os.utime(path)
@@ -0,0 +1,103 @@
+import os
+import shutil
+import string
+import tempfile
+from typing import List
+
+from repo_smith.types import FilePath
+
+# Pack files are moved before their index, so that a reader of the store never
+# finds an index whose pack is missing
+PACK_SUFFIXES = (".pack", ".rev", ".bitmap", ".idx")
+
+
+class ObjectStore:
+    """A directory of git objects shared by many repositories, which reference it
+    through objects/info/alternates.
+
+    Repositories only read from the store, and git does not write objects that
+    are already in an alternate, so only objects that are new to the store end up
+    in the repositories themselves.
+    """
+
+    def __init__(self, dir: FilePath) -> None:
+        self.dir = os.path.abspath(os.fspath(dir))
+        os.makedirs(os.path.join(self.dir, "pack"), exist_ok=True)
+        os.makedirs(os.path.join(self.dir, "info"), exist_ok=True)
+
+    def attach(self, git_dir: FilePath) -> None:
+        """Adds the store to the alternates of the repository, keeping any it
+        already has.
+        """
+        info_dir = os.path.join(git_dir, "objects", "info")
+        os.makedirs(info_dir, exist_ok=True)
+        alternates_path = os.path.join(info_dir, "alternates")
+        alternates: List[str] = []
+        if os.path.isfile(alternates_path):
+            with open(alternates_path, "r") as alternates_file:
+                alternates = alternates_file.read().splitlines()
+        if self.dir in alternates:
+            return
+        with open(alternates_path, "w") as alternates_file:
+            alternates_file.write("\n".join([*alternates, self.dir]) + "\n")
+
+    def absorb(self, git_dir: FilePath) -> None:
+        """Moves the loose objects and packs of the repository into the store and
+        attaches the store to it.
+
+        Objects the store already has are removed from the repository instead, so
+        repositories built from the same spec end up with no objects of their own.
+        Other processes using the repository have to be restarted afterwards,
+        since git only reads the alternates when it starts.
+        """
+        # The store is attached first, so every object stays reachable while it
+        # is moved
+        self.attach(git_dir)
+        objects_dir = os.path.join(git_dir, "objects")
+        for name in sorted(os.listdir(objects_dir)):
+            fan_out_dir = os.path.join(objects_dir, name)
+            if len(name) != 2 or not all(c in string.hexdigits for c in name):
+                continue
+            for object_name in os.listdir(fan_out_dir):
+                self.__move(
+                    os.path.join(fan_out_dir, object_name),
+                    os.path.join(self.dir, name, object_name),
+                )
+            try:
+                os.rmdir(fan_out_dir)
+            except OSError:
+                pass
+
+        pack_dir = os.path.join(objects_dir, "pack")
+        if not os.path.isdir(pack_dir):
+            return
+        pack_names = [name for name in os.listdir(pack_dir) if name.startswith("pack-")]
+        for suffix in PACK_SUFFIXES:
+            for name in sorted(pack_names):
+                if name.endswith(suffix):
+                    self.__move(
+                        os.path.join(pack_dir, name),
+                        os.path.join(self.dir, "pack", name),
+                    )
+
+    def __move(self, src: str, dest: str) -> None:
+        # Files are linked rather than renamed over, so an object that another
+        # repository is reading is never replaced
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        try:
+            os.link(src, dest)
+        except FileExistsError:
+            pass
+        except OSError:
+            if os.path.exists(dest):
+                os.unlink(src)
+                return
+            fd, staging = tempfile.mkstemp(dir=os.path.dirname(dest))
+            os.close(fd)
+            try:
+                shutil.copy2(src, staging)
+                os.replace(staging, dest)
+            except BaseException:
+                os.unlink(staging)
+                raise
+        os.unlink(src)
@@ -0,0 +1,122 @@
+"""pytest plugin that builds every spec once per test session and gives each test
+its own copy of the built repository.
+
+It is registered through the pytest11 entry point once repo-smith is installed.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Protocol, Unpack
+
+import pytest
+
+from repo_smith.file_lock import file_lock
+from repo_smith.git_session import close_session
+from repo_smith.materialize import copy_repo
+
+# pytest imports the plugin at startup wherever repo-smith is installed, so
+# GitPython and the initializer are only imported once a fixture is used
+if TYPE_CHECKING:
+    from git import Repo
+
+    from repo_smith.initialize_repo import InitializerOptions
+
+
+class SpecBuilds:
+    """Builds specs into a directory shared by the whole test session.
+
+    Under pytest-xdist, every worker shares the same directory and a file lock
+    per spec ensures that only one of them builds it while the others wait.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def get(self, spec_path: str, options: "InitializerOptions") -> Path:
+        """Returns the directory of the built spec, building it if needed.
+
+        Builds are keyed by the spec's path, contents and options, so editing a
+        spec file during a session results in a new build.
+        """
+        with open(spec_path, "rb") as spec_file:
+            contents = spec_file.read()
+        digest = hashlib.sha256(os.path.abspath(spec_path).encode("utf-8"))
+        digest.update(contents)
+        digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        key = digest.hexdigest()
+
+        # Builds are renamed into place once complete, so an existing directory
+        # can be used without taking the lock
+        built = self.root / key
+        if built.is_dir():
+            return built
+
+        with file_lock(self.root / f"{key}.lock"):
+            if not built.is_dir():
+                self.__build(spec_path, options, built)
+        return built
+
+    def __build(
+        self, spec_path: str, options: "InitializerOptions", dest: Path
+    ) -> None:
+        from repo_smith.initialize_repo import initialize_repo
+
+        staging = tempfile.mkdtemp(dir=self.root, prefix=".staging-")
+        try:
+            repo = initialize_repo(spec_path, **options).build(staging)
+            repo.git.clear_cache()
+            close_session(repo)
+            os.rename(staging, dest)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+
+class RepoSmithSpec(Protocol):
+    def __call__(
+        self, spec_path: str, **options: Unpack["InitializerOptions"]
+    ) -> "Repo": ...
+
+
+@pytest.fixture(scope="session")
+def repo_smith_spec_builds(tmp_path_factory: pytest.TempPathFactory) -> SpecBuilds:
+    root = tmp_path_factory.getbasetemp()
+    if os.environ.get("PYTEST_XDIST_WORKER") is not None:
+        # The base temporary directories of xdist workers share a parent
+        root = root.parent
+    return SpecBuilds(root / "repo-smith-specs")
+
+
+@pytest.fixture
+def repo_smith_spec(
+    repo_smith_spec_builds: SpecBuilds, tmp_path: Path
+) -> Iterator[RepoSmithSpec]:
+    """Returns a function that gives the test a private copy of the repository
+    built from a spec, such as repo_smith_spec("tests/specs/basic_spec.yml").
+
+    The copy shares its object files with the session's build through hardlinks,
+    so it is much cheaper than building the spec again. Hooks are not supported
+    since the build is shared.
+    """
+    from git import Repo
+
+    repos: List[Repo] = []
+
+    def materialize(spec_path: str, **options: Unpack["InitializerOptions"]) -> "Repo":
+        built = repo_smith_spec_builds.get(spec_path, options)
+        dest = tmp_path / f"repo-smith-{len(repos)}"
+        copy_repo(built, dest)
+        repo = Repo(dest)
+        repos.append(repo)
+        return repo
+
+    yield materialize
+
+    for repo in repos:
+        repo.git.clear_cache()
+        close_session(repo)
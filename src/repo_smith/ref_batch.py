@@ -0,0 +1,166 @@
+from typing import List, Optional, Set
+
+from git import GitCommandError, Head, Repo
+from repo_smith.git_session import session_for
+from repo_smith.ref_index import ref_index_for
+from repo_smith.steps.branch_delete_step import BranchDeleteStep
+from repo_smith.steps.branch_rename_step import BranchRenameStep
+from repo_smith.steps.branch_step import BranchStep
+from repo_smith.steps.step import Step
+from repo_smith.steps.tag_step import TagStep
+
+
+class RefBatch:
+    """Coalesces consecutive lightweight tag, branch, branch-delete and
+    branch-rename steps into a single git-update-ref transaction.
+
+    None of these steps move HEAD to another commit, so HEAD is resolved once for
+    the batch, while the branch it points to is tracked and only written when the
+    batch is flushed. Steps that touch a ref already in the batch, or whose
+    outcome the batch cannot reproduce, such as annotated tags or deleting the
+    branch that is checked out, are declined so that the caller can flush the
+    batch and execute the step directly, which also raises the step's usual
+    error. If the transaction is rejected as a whole, the steps are executed one
+    by one instead, so that the step at fault raises its usual error.
+    """
+
+    name = "ref batch"
+
+    def __init__(self, repo: Repo) -> None:
+        self.repo = repo
+        self.__steps: List[Step] = []
+        self.__instructions: List[str] = []
+        self.__refs: Set[str] = set()
+        self.__head: Optional[str] = None
+        # Ref HEAD points to, or None if it is detached
+        self.__head_ref: Optional[str] = None
+        self.__base_head_ref: Optional[str] = None
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.__steps)
+
+    def apply(self, step: Step) -> bool:
+        """Adds the step to the pending transaction, returning False if it has to
+        be executed directly instead.
+        """
+        if not isinstance(
+            step, (TagStep, BranchStep, BranchDeleteStep, BranchRenameStep)
+        ):
+            return False
+
+        if not self.__steps:
+            self.__begin()
+        if self.__head is None:
+            return False
+
+        if isinstance(step, TagStep):
+            return self.__tag(step)
+        elif isinstance(step, BranchStep):
+            return self.__branch(step)
+        elif isinstance(step, BranchDeleteStep):
+            return self.__delete_branch(step)
+        return self.__rename_branch(step)
+
+    def flush(self) -> None:
+        """Commits the pending transaction and points HEAD at the branch the steps
+        left checked out.
+        """
+        steps = self.__steps
+        instructions = self.__instructions
+        self.__steps = []
+        self.__instructions = []
+        self.__refs = set()
+        if not steps:
+            return
+
+        try:
+            session_for(self.repo).update_refs(instructions)
+        except GitCommandError:
+            # Nothing was applied, so the steps can run as if never batched
+            for step in steps:
+                step.execute(repo=self.repo)
+            return
+
+        if self.__head_ref != self.__base_head_ref:
+            assert self.__head_ref is not None
+            self.repo.head.reference = Head(self.repo, self.__head_ref)
+
+    def __begin(self) -> None:
+        index = ref_index_for(self.repo)
+        if index is not None:
+            # Listed while nothing is pending, so it never misses the refs the
+            # batch has yet to create
+            index.load()
+        self.__head = session_for(self.repo).resolve("HEAD")
+        head = self.repo.head
+        self.__head_ref = None if head.is_detached else head.reference.path
+        self.__base_head_ref = self.__head_ref
+
+    def __tag(self, step: TagStep) -> bool:
+        if step.tag_message:
+            return False
+        ref = f"refs/tags/{step.tag_name}"
+        if not self.__is_missing(ref):
+            return False
+        self.__add(step, [ref], [f"create {ref} {self.__head}"])
+        return True
+
+    def __branch(self, step: BranchStep) -> bool:
+        ref = f"refs/heads/{step.branch_name}"
+        if not self.__is_missing(ref):
+            return False
+        self.__add(step, [ref], [f"create {ref} {self.__head}"])
+        # The new branch points at HEAD, so checking it out only moves HEAD
+        self.__head_ref = ref
+        return True
+
+    def __delete_branch(self, step: BranchDeleteStep) -> bool:
+        ref = f"refs/heads/{step.branch_name}"
+        if ref == self.__head_ref or not self.__exists(ref):
+            return False
+        self.__add(step, [ref], [f"delete {ref}"])
+        return True
+
+    def __rename_branch(self, step: BranchRenameStep) -> bool:
+        original_ref = f"refs/heads/{step.original_branch_name}"
+        target_ref = f"refs/heads/{step.target_branch_name}"
+        if not self.__exists(original_ref) or not self.__is_missing(target_ref):
+            return False
+        sha = self.__resolve(original_ref)
+        if sha is None:
+            return False
+        self.__add(
+            step,
+            [original_ref, target_ref],
+            [f"create {target_ref} {sha}", f"delete {original_ref} {sha}"],
+        )
+        if self.__head_ref == original_ref:
+            self.__head_ref = target_ref
+        return True
+
+    def __add(self, step: Step, refs: List[str], instructions: List[str]) -> None:
+        self.__steps.append(step)
+        self.__refs.update(refs)
+        self.__instructions.extend(instructions)
+
+    def __resolve(self, ref: str) -> Optional[str]:
+        """Returns the SHA of the ref if it exists and is not in the batch, since a
+        transaction can only update each ref once.
+        """
+        if ref in self.__refs:
+            return None
+        return session_for(self.repo).resolve(ref)
+
+    def __exists(self, ref: str) -> bool:
+        """Returns whether the ref exists and is not in the batch."""
+        if ref in self.__refs:
+            return False
+        index = ref_index_for(self.repo)
+        if index is not None:
+            return ref in index
+        return self.__resolve(ref) is not None
+
+    def __is_missing(self, ref: str) -> bool:
+        """Returns whether the ref neither exists nor is in the batch."""
+        return ref not in self.__refs and not self.__exists(ref)
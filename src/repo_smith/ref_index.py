@@ -0,0 +1,167 @@
+import os
+import subprocess
+import weakref
+from collections import Counter
+from typing import TYPE_CHECKING, Optional, Set
+
+if TYPE_CHECKING:
+    from git import Repo
+
+    from repo_smith.steps.step import Step
+
+FOR_EACH_REF_COMMAND = ["git", "for-each-ref", "--format=%(refname)"]
+
+
+class RefIndex:
+    """The refs of a repository, listed once and then kept up to date as steps
+    run, so that checking whether a branch exists does not list every ref again.
+
+    The index is updated from what every step is known to leave behind, such as
+    the tag a tag step creates, whether the step ran directly or was batched.
+    Steps that can change refs in ways the index does not model, such as bash
+    steps, drop it instead, and it is listed again when it is next needed.
+    """
+
+    def __init__(self, repo_dir: str, git_dir: str) -> None:
+        self.repo_dir = repo_dir
+        self.git_dir = git_dir
+        self.__refs: Optional[Set[str]] = None
+        # Names as shown by Reference.name, such as "main" or "origin/main"
+        self.__names: "Counter[str]" = Counter()
+        # Branch HEAD points to before its first commit creates it
+        self.__unborn: Optional[str] = None
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self.load()
+
+    def has_name(self, name: str) -> bool:
+        """Returns whether any ref, such as a branch, tag or remote-tracking
+        branch, has the name.
+        """
+        self.load()
+        return self.__names[name] > 0
+
+    def load(self) -> Set[str]:
+        """Lists the refs if the index was dropped, returning them."""
+        if self.__refs is None:
+            output = subprocess.run(
+                FOR_EACH_REF_COMMAND,
+                cwd=self.repo_dir,
+                capture_output=True,
+                check=True,
+            ).stdout
+            self.__refs = set(output.decode("utf-8").splitlines())
+            self.__names = Counter(self.__name(ref) for ref in self.__refs)
+            head = self.__read_head()
+            self.__unborn = head if head not in self.__refs else None
+        return self.__refs
+
+    def add(self, ref: str) -> None:
+        if self.__refs is not None and ref not in self.__refs:
+            self.__refs.add(ref)
+            self.__names[self.__name(ref)] += 1
+
+    def discard(self, ref: str) -> None:
+        if self.__refs is not None and ref in self.__refs:
+            self.__refs.remove(ref)
+            self.__names[self.__name(ref)] -= 1
+
+    def invalidate(self) -> None:
+        self.__refs = None
+        self.__names = Counter()
+        self.__unborn = None
+
+    def apply(self, step: "Step") -> None:
+        """Updates the index with the refs the step created or deleted, or drops
+        it if the step may have changed refs in ways the index does not model.
+        """
+        from repo_smith.steps.add_step import AddStep
+        from repo_smith.steps.branch_delete_step import BranchDeleteStep
+        from repo_smith.steps.branch_rename_step import BranchRenameStep
+        from repo_smith.steps.branch_step import BranchStep
+        from repo_smith.steps.checkout_step import CheckoutStep
+        from repo_smith.steps.commit_step import CommitStep
+        from repo_smith.steps.file_step import FileStep
+        from repo_smith.steps.generate_files_step import GenerateFilesStep
+        from repo_smith.steps.merge_step import MergeStep
+        from repo_smith.steps.reset_step import ResetStep
+        from repo_smith.steps.revert_step import RevertStep
+        from repo_smith.steps.tag_step import TagStep
+
+        if self.__refs is None:
+            return
+        if isinstance(step, TagStep):
+            self.add(f"refs/tags/{step.tag_name}")
+        elif isinstance(step, BranchStep):
+            self.add(f"refs/heads/{step.branch_name}")
+            self.__unborn = None
+        elif isinstance(step, BranchDeleteStep):
+            self.discard(f"refs/heads/{step.branch_name}")
+        elif isinstance(step, BranchRenameStep):
+            self.discard(f"refs/heads/{step.original_branch_name}")
+            self.add(f"refs/heads/{step.target_branch_name}")
+        elif isinstance(step, CheckoutStep):
+            if step.branch_name is not None and step.start_point is not None:
+                self.add(f"refs/heads/{step.branch_name}")
+            # HEAD now points at a branch or commit that exists
+            self.__unborn = None
+        elif isinstance(step, CommitStep):
+            if self.__unborn is not None:
+                self.add(self.__unborn)
+                self.__unborn = None
+        elif not isinstance(
+            step,
+            (AddStep, FileStep, GenerateFilesStep, MergeStep, ResetStep, RevertStep),
+        ):
+            self.invalidate()
+
+    def __read_head(self) -> Optional[str]:
+        with open(os.path.join(self.git_dir, "HEAD")) as file:
+            head = file.read().strip()
+        return head[len("ref: ") :] if head.startswith("ref: ") else None
+
+    @staticmethod
+    def __name(ref: str) -> str:
+        # Reference.name drops the "refs/<kind>/" prefix
+        parts = ref.split("/", 2)
+        return parts[2] if len(parts) == 3 else ref
+
+
+_indexes: "weakref.WeakKeyDictionary[Repo, RefIndex]" = weakref.WeakKeyDictionary()
+
+
+def track_refs(repo: "Repo") -> RefIndex:
+    """Starts keeping an index of the refs of the repository, which the steps
+    then check refs against until untrack_refs() is called.
+
+    Refs changed outside of steps while the index is tracked, such as by hooks,
+    have to be followed by RefIndex.invalidate().
+    """
+    index = RefIndex(repo.working_dir, repo.git_dir)
+    _indexes[repo] = index
+    return index
+
+
+def untrack_refs(repo: "Repo") -> None:
+    _indexes.pop(repo, None)
+
+
+def ref_index_for(repo: "Repo") -> Optional[RefIndex]:
+    return _indexes.get(repo)
+
+
+def has_branch(repo: "Repo", name: str) -> bool:
+    index = _indexes.get(repo)
+    if index is None:
+        return name in repo.heads
+    return f"refs/heads/{name}" in index
+
+
+def has_ref_named(repo: "Repo", name: str) -> bool:
+    """Returns whether any ref has the name, the same as looking for it among
+    the names of repo.refs.
+    """
+    index = _indexes.get(repo)
+    if index is None:
+        return name in [ref.name for ref in repo.refs]
+    return index.has_name(name)
@@ -1,30 +1,61 @@
-import shutil
 import tempfile
 from contextlib import contextmanager
 from logging import shutdown
-from typing import Dict, Iterator, Optional, Self, Type, TypedDict, TypeVar, Unpack
-
-from git.repo import Repo
-
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    Optional,
+    Self,
+    Type,
+    TypedDict,
+    TypeVar,
+    Unpack,
+)
+
+from repo_smith.clone_from import CloneFrom
+from repo_smith.dir_pool import dir_pool
+from repo_smith.git_session import close_session
 from repo_smith.helpers.files_helper import FilesHelper
 from repo_smith.helpers.git_helper.git_helper import GitHelper
-from repo_smith.helpers.github_cli_helper.github_cli_helper import GithubCliHelper
 from repo_smith.helpers.helper import Helper
+from repo_smith.mirror_cache import DEFAULT_MAX_AGE, MirrorCache
+from repo_smith.object_store import ObjectStore
+from repo_smith.teardown import remove_dir
+
+if TYPE_CHECKING:
+    from git.repo import Repo
+
+    from repo_smith.helpers.github_cli_helper.github_cli_helper import (
+        GithubCliHelper,
+    )
 
 T = TypeVar("T", bound="Helper")
 
 
 class RepoSmith:
-    def __init__(self, repo: Optional[Repo], verbose: bool) -> None:
+    def __init__(self, repo: Optional["Repo"], verbose: bool) -> None:
         self.verbose = verbose
         self.__repo = repo
         self.files = FilesHelper(repo, verbose)
         self.git = GitHelper(repo, verbose)
-        self.gh = GithubCliHelper(repo, verbose)
+        self.__gh: Optional["GithubCliHelper"] = None
         self.__additional_helpers: Dict[Type[Helper], Helper] = {}
 
     @property
-    def repo(self) -> Repo:
+    def gh(self) -> "GithubCliHelper":
+        # Most tests never use the GitHub CLI, so its helper is only imported and
+        # created on first access
+        if self.__gh is None:
+            from repo_smith.helpers.github_cli_helper.github_cli_helper import (
+                GithubCliHelper,
+            )
+
+            self.__gh = GithubCliHelper(self.__repo, self.verbose)
+        return self.__gh
+
+    @property
+    def repo(self) -> "Repo":
         if self.__repo is None:
             raise ValueError("Repo is None, cannot access")
         return self.__repo
@@ -40,9 +71,18 @@ class RepoSmith:
 
 
 class CreateRepoOptions(TypedDict, total=False):
+    background_teardown: bool
+    clone_depth: int
+    clone_filter: str
     clone_from: str
+    clone_no_checkout: bool
+    clone_single_branch: bool
     existing_path: str
+    mirror_dir: str
+    mirror_max_age: Optional[float]
     null_repo: bool
+    object_store: str
+    recycle_dirs: bool
 
 
 @contextmanager
@@ -53,20 +93,64 @@ def create_repo_smith(
     clone_from = options.get("clone_from")
     existing_path = options.get("existing_path")
     null_repo = options.get("null_repo", False)
+    object_store = options.get("object_store")
+    mirror_dir = options.get("mirror_dir")
+    background_teardown = options.get("background_teardown", False)
+    # Clones need an empty directory rather than an initialized repository
+    recycle_dir = (
+        options.get("recycle_dirs", False)
+        and existing_path is None
+        and not null_repo
+        and not clone_from
+    )
+
+    from git.repo import Repo
+
+    if existing_path is not None:
+        dir = existing_path
+    elif recycle_dir:
+        dir = dir_pool().acquire()
+    else:
+        dir = tempfile.mkdtemp()
 
-    dir = tempfile.mkdtemp() if existing_path is None else existing_path
+    clone_args = CloneFrom(
+        repo_url=clone_from or "",
+        depth=options.get("clone_depth"),
+        filter=options.get("clone_filter"),
+        single_branch=options.get("clone_single_branch"),
+        no_checkout=options.get("clone_no_checkout", False),
+    ).clone_args()
 
     if null_repo:
         repo = None
+    elif clone_from and mirror_dir is not None:
+        MirrorCache(mirror_dir, options.get("mirror_max_age", DEFAULT_MAX_AGE)).clone(
+            clone_from, dir, clone_args
+        )
+        repo = Repo(dir)
     elif clone_from:
-        repo = Repo.clone_from(clone_from, dir)
+        repo = Repo.clone_from(clone_from, dir, multi_options=clone_args)
+    elif recycle_dir:
+        dir_pool().claim(dir)
+        repo = Repo(dir)
     else:
         repo = Repo.init(dir, initial_branch="main")
 
+    if repo is not None and object_store is not None:
+        # Objects of the clone are moved into the store, while the objects created
+        # through the helpers are written to the repository unless already shared
+        ObjectStore(object_store).absorb(repo.git_dir)
+
     yield RepoSmith(repo, verbose)
 
+    if repo is not None:
+        close_session(repo)
+
     if existing_path is None:
         # Temporary directory created, so delete it
         if repo is not None:
             repo.git.clear_cache()
-        shutil.rmtree(dir)
+        if recycle_dir:
+            dir_pool().release(dir)
+        else:
+            remove_dir(dir, background_teardown)
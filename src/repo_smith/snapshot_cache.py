@@ -0,0 +1,116 @@
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from enum import Enum
+from functools import cache
+from typing import Any, Dict, Iterator
+
+from repo_smith.command_result import run
+from repo_smith.materialize import copy_repo
+from repo_smith.spec import Spec
+from repo_smith.steps.step import Step
+from repo_smith.types import FilePath
+from repo_smith.version import __version__
+
+# Fields that only describe a step and never change the repository it produces
+NON_SEMANTIC_FIELDS = ("name", "description", "id")
+
+
+@cache
+def git_version() -> str:
+    return run(["git", "--version"], False).stdout
+
+
+def canonical_step(step: Step) -> Any:
+    """Returns a JSON-serializable form of the step that only contains the fields
+    that affect the resulting repository.
+    """
+    fields = {
+        f.name: getattr(step, f.name)
+        for f in dataclasses.fields(step)
+        if f.name not in NON_SEMANTIC_FIELDS
+    }
+    return {"kind": type(step).__name__, **fields}
+
+
+def canonical_json(value: Any) -> str:
+    def default(o: Any) -> Any:
+        if isinstance(o, Enum):
+            return o.value
+        raise TypeError(f"Cannot canonicalize {type(o).__name__}")
+
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=default)
+
+
+class SnapshotCache:
+    """Stores pristine copies of built repositories, keyed by a canonical hash of
+    the spec, the repo-smith version and the git version.
+    """
+
+    def __init__(self, cache_dir: FilePath) -> None:
+        self.cache_dir = os.fspath(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, spec: Spec) -> str:
+        for key in self.prefix_keys(spec):
+            pass
+        return key
+
+    def prefix_keys(self, spec: Spec) -> Iterator[str]:
+        """Yields the keys of every step prefix of the spec, where the i-th key
+        identifies the repository after the first i steps have run.
+
+        Each key chains the previous one with the next step, so specs that share
+        their first steps also share the keys for those prefixes. The steps are
+        only read as the keys are, so the keys of the first steps of a long spec
+        are cheap.
+        """
+        root: Dict[str, Any] = {"repo-smith": __version__, "git": git_version()}
+        if spec.deterministic is not None:
+            root["deterministic"] = dataclasses.asdict(spec.deterministic)
+        key = hashlib.sha256(canonical_json(root).encode("utf-8")).hexdigest()
+        yield key
+        for step in spec.steps:
+            digest = hashlib.sha256(key.encode("utf-8"))
+            digest.update(canonical_json(canonical_step(step)).encode("utf-8"))
+            key = digest.hexdigest()
+            yield key
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def contains(self, key: str) -> bool:
+        return os.path.isdir(self.path(key))
+
+    def restore(self, key: str, dest: FilePath) -> bool:
+        """Copies the snapshot for key into dest, returning False on a cache miss.
+
+        Snapshots are materialized with reflinks or hardlinked objects where the
+        file system allows it, so restoring a large snapshot is nearly free.
+        """
+        if not self.contains(key):
+            return False
+        copy_repo(self.path(key), dest)
+        return True
+
+    def store(self, key: str, src: FilePath) -> None:
+        """Stores a copy of src as the snapshot for key.
+
+        The copy is staged next to the final location and renamed into place, so
+        concurrent builders never observe a partially written snapshot.
+        """
+        if self.contains(key):
+            return
+        staging = tempfile.mkdtemp(dir=self.cache_dir, prefix=".staging-")
+        try:
+            copy_repo(src, staging)
+            os.rename(staging, self.path(key))
+        except OSError:
+            # Another builder stored the same snapshot first
+            if not self.contains(key):
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
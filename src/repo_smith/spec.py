@@ -1,7 +1,8 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Optional, Sequence
 
 from repo_smith.clone_from import CloneFrom
+from repo_smith.deterministic import Deterministic
 from repo_smith.steps.step import Step
 
 
@@ -9,5 +10,6 @@ from repo_smith.steps.step import Step
 class Spec:
     name: str
     description: Optional[str]
-    steps: List[Step]
+    steps: Sequence[Step]
     clone_from: Optional[CloneFrom]
+    deterministic: Optional[Deterministic] = None
@@ -0,0 +1,123 @@
+import dataclasses
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from functools import cache
+from importlib import import_module
+from typing import List, Optional, Tuple
+
+from repo_smith.clone_from import CloneFrom
+from repo_smith.deterministic import Deterministic
+from repo_smith.spec import Spec
+from repo_smith.step_sequence import Macro, StepSequence
+from repo_smith.steps.dispatcher import STEP_CLASSES
+from repo_smith.types import FilePath
+from repo_smith.version import __version__
+
+
+@cache
+def schema_fingerprint() -> str:
+    """Returns a hash of the layout of every class a cached spec is made of, so
+    that entries pickled by code with a different layout are not loaded.
+    """
+    classes: List[type] = [Spec, CloneFrom, Deterministic, Macro, StepSequence]
+    for module_name, class_name in STEP_CLASSES.values():
+        classes.append(getattr(import_module(module_name), class_name))
+
+    layouts: List[str] = []
+    for cls in classes:
+        if dataclasses.is_dataclass(cls):
+            fields = [f"{f.name}:{f.type!r}" for f in dataclasses.fields(cls)]
+        else:
+            # The attributes of other classes are the names their __init__ uses
+            fields = sorted(cls.__init__.__code__.co_names)
+        layouts.append(f"{cls.__module__}.{cls.__qualname__}({','.join(fields)})")
+    return hashlib.sha256("\n".join(layouts).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SpecCacheEntry:
+    version: str
+    schema: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    spec: Spec
+
+
+class SpecCache:
+    """Stores parsed specs in a binary form, keyed by the path, modification time
+    and contents of their spec file, so unchanged spec files skip YAML parsing.
+
+    Entries are only loaded by the same version of repo-smith with the same
+    layout of the spec and step classes.
+    """
+
+    def __init__(self, cache_dir: FilePath) -> None:
+        self.cache_dir = os.fspath(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def load(self, spec_path: FilePath) -> Tuple[Optional[Spec], bytes]:
+        """Returns the cached spec for the file, or None with the contents of the
+        file if it has to be parsed again.
+
+        Files whose modification time changed are still served from the cache if
+        their contents did not change.
+        """
+        info = os.stat(spec_path)
+        entry = self.__read_entry(spec_path)
+        if entry is not None and (entry.mtime_ns, entry.size) == (
+            info.st_mtime_ns,
+            info.st_size,
+        ):
+            return entry.spec, b""
+
+        with open(spec_path, "rb") as spec_file:
+            contents = spec_file.read()
+        if entry is not None and entry.content_hash == self.__hash(contents):
+            self.store(spec_path, contents, entry.spec)
+            return entry.spec, contents
+        return None, contents
+
+    def store(self, spec_path: FilePath, contents: bytes, spec: Spec) -> None:
+        info = os.stat(spec_path)
+        entry = SpecCacheEntry(
+            version=__version__,
+            schema=schema_fingerprint(),
+            mtime_ns=info.st_mtime_ns,
+            size=info.st_size,
+            content_hash=self.__hash(contents),
+            spec=spec,
+        )
+        fd, staging = tempfile.mkstemp(dir=self.cache_dir, prefix=".staging-")
+        try:
+            with os.fdopen(fd, "wb") as staging_file:
+                pickle.dump(entry, staging_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(staging, self.__entry_path(spec_path))
+        except BaseException:
+            os.remove(staging)
+            raise
+
+    def __read_entry(self, spec_path: FilePath) -> Optional[SpecCacheEntry]:
+        try:
+            with open(self.__entry_path(spec_path), "rb") as entry_file:
+                entry = pickle.load(entry_file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if (
+            not isinstance(entry, SpecCacheEntry)
+            or entry.version != __version__
+            or entry.schema != schema_fingerprint()
+        ):
+            return None
+        return entry
+
+    def __entry_path(self, spec_path: FilePath) -> str:
+        path = os.path.abspath(os.fspath(spec_path)).encode("utf-8")
+        return os.path.join(self.cache_dir, hashlib.sha256(path).hexdigest())
+
+    @staticmethod
+    def __hash(contents: bytes) -> str:
+        return hashlib.sha256(contents).hexdigest()
@@ -0,0 +1,255 @@
+import bisect
+import re
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Self,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    overload,
+)
+
+from repo_smith.steps.dispatcher import Dispatcher
+from repo_smith.steps.step import Step
+
+VARIABLE_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+DEFAULT_VARIABLE = "i"
+
+Scope = Dict[str, Any]
+
+
+def render(value: Any, scope: Scope) -> Any:
+    """Replaces the {{name}} placeholders in every string of the step template
+    with the text of the variables in scope.
+    """
+    if isinstance(value, str):
+        return PLACEHOLDER.sub(lambda match: str(scope[match.group(1)]), value)
+    if isinstance(value, list):
+        return [render(item, scope) for item in value]
+    if isinstance(value, dict):
+        return {key: render(item, scope) for key, item in value.items()}
+    return value
+
+
+def placeholders(value: Any) -> Set[str]:
+    if isinstance(value, str):
+        return set(PLACEHOLDER.findall(value))
+    if isinstance(value, list):
+        return set().union(*(placeholders(item) for item in value))
+    if isinstance(value, dict):
+        return set().union(*(placeholders(item) for item in value.values()))
+    return set()
+
+
+def is_macro(step: Any) -> bool:
+    return isinstance(step, dict) and ("repeat" in step or "matrix" in step)
+
+
+@dataclass
+class Macro:
+    """Steps repeated once for every combination of the values of its variables,
+    the last variable changing fastest.
+
+    The body keeps the raw step templates, which are only rendered and parsed
+    when the step at an index is needed. Each template is parsed once with the
+    first value of every variable when the macro is parsed, so that invalid
+    steps are reported before any step runs.
+    """
+
+    dimensions: List[Tuple[str, Sequence[Any]]]
+    body: List[Union[Dict[str, Any], "Macro"]]
+    # The index within an iteration of the body that every body item starts at
+    offsets: List[int]
+    body_length: int
+    count: int
+
+    def __len__(self) -> int:
+        return self.count * self.body_length
+
+    def step(self, index: int, scope: Scope) -> Step:
+        iteration, offset = divmod(index, self.body_length)
+        scope = self.__scope(iteration, scope)
+        position = bisect.bisect_right(self.offsets, offset) - 1
+        item = self.body[position]
+        if isinstance(item, Macro):
+            return item.step(offset - self.offsets[position], scope)
+        return Dispatcher.dispatch(render(item, scope))
+
+    def iterate(self, start: int, scope: Scope) -> Iterator[Step]:
+        if start >= len(self):
+            return
+        iteration, offset = divmod(start, self.body_length)
+        for iteration in range(iteration, self.count):
+            iteration_scope = self.__scope(iteration, scope)
+            position = bisect.bisect_right(self.offsets, offset) - 1
+            # Only the first item is resumed part of the way through
+            item_offset = offset - self.offsets[position]
+            for item in self.body[position:]:
+                if isinstance(item, Macro):
+                    yield from item.iterate(item_offset, iteration_scope)
+                else:
+                    yield Dispatcher.dispatch(render(item, iteration_scope))
+                item_offset = 0
+            offset = 0
+
+    def __scope(self, iteration: int, scope: Scope) -> Scope:
+        scope = dict(scope)
+        for name, values in reversed(self.dimensions):
+            iteration, position = divmod(iteration, len(values))
+            scope[name] = values[position]
+        return scope
+
+    @classmethod
+    def parse(cls: Type[Self], step: Dict[str, Any], sample: Scope) -> Self:
+        """Parses the macro, where sample holds the first value of every variable
+        of the enclosing macros.
+        """
+        if "repeat" in step and "matrix" in step:
+            raise ValueError('Fields "repeat" and "matrix" cannot be used together.')
+
+        dimensions: List[Tuple[str, Sequence[Any]]] = []
+        if "repeat" in step:
+            count = step["repeat"]
+            if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+                raise ValueError('Field "repeat" must be a non-negative integer.')
+            variable = step.get("variable", DEFAULT_VARIABLE)
+            if not isinstance(variable, str) or not VARIABLE_NAME.fullmatch(variable):
+                raise ValueError(
+                    'Field "variable" can only contain alphanumeric characters and _.'
+                )
+            dimensions.append((variable, range(count)))
+        else:
+            matrix = step["matrix"]
+            if not isinstance(matrix, dict) or not matrix:
+                raise ValueError('Field "matrix" must map variable names to lists.')
+            for name, values in matrix.items():
+                if not isinstance(name, str) or not VARIABLE_NAME.fullmatch(name):
+                    raise ValueError(
+                        f"Matrix variable {name} can only contain alphanumeric characters and _."
+                    )
+                if not isinstance(values, list) or not values:
+                    raise ValueError(
+                        f"Matrix variable {name} must have a non-empty list of values."
+                    )
+                dimensions.append((name, values))
+
+        body_steps = step.get("steps")
+        if not isinstance(body_steps, list) or not body_steps:
+            raise ValueError('Missing "steps" field in repeat or matrix.')
+
+        # A repeat of 0 never renders its steps, but they are still validated
+        sample = dict(sample)
+        for name, values in dimensions:
+            sample[name] = values[0] if len(values) > 0 else 0
+        body: List[Union[Dict[str, Any], Macro]] = []
+        offsets: List[int] = []
+        body_length = 0
+        for body_step in body_steps:
+            offsets.append(body_length)
+            if is_macro(body_step):
+                macro = Macro.parse(body_step, sample)
+                body.append(macro)
+                body_length += len(macro)
+                continue
+            undefined = sorted(placeholders(body_step) - sample.keys())
+            if undefined:
+                raise ValueError(
+                    f"Variable {undefined[0]} is not defined by an enclosing repeat or matrix."
+                )
+            Dispatcher.dispatch(render(body_step, sample))
+            body.append(body_step)
+            body_length += 1
+
+        count = 1
+        for _, values in dimensions:
+            count *= len(values)
+        return cls(dimensions, body, offsets, body_length, count)
+
+
+class StepSequence(Sequence[Step]):
+    """The steps of a spec, where repeat and matrix macros are only expanded into
+    steps as they are read, so that a spec with millions of steps never holds
+    them all in memory.
+    """
+
+    def __init__(self, entries: List[Union[Step, Macro]]) -> None:
+        self.__entries = entries
+        self.__offsets: List[int] = []
+        self.__length = 0
+        for entry in entries:
+            self.__offsets.append(self.__length)
+            self.__length += len(entry) if isinstance(entry, Macro) else 1
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StepSequence):
+            return NotImplemented
+        return self.__entries == other.__entries
+
+    def __repr__(self) -> str:
+        return f"StepSequence({self.__entries!r})"
+
+    @overload
+    def __getitem__(self, index: int) -> Step: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Step]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Step, List[Step]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__length))]
+        if index < 0:
+            index += self.__length
+        if not 0 <= index < self.__length:
+            raise IndexError("Step index out of range.")
+        position = bisect.bisect_right(self.__offsets, index) - 1
+        entry = self.__entries[position]
+        if isinstance(entry, Macro):
+            return entry.step(index - self.__offsets[position], {})
+        return entry
+
+    def __iter__(self) -> Iterator[Step]:
+        return self.iterate(0)
+
+    def iterate(self, start: int) -> Iterator[Step]:
+        """Yields the steps from the step at start onwards, expanding macros one
+        step at a time.
+        """
+        if start >= self.__length:
+            return
+        position = bisect.bisect_right(self.__offsets, start) - 1
+        offset = start - self.__offsets[position]
+        for entry in self.__entries[position:]:
+            if isinstance(entry, Macro):
+                yield from entry.iterate(offset, {})
+            else:
+                yield entry
+            offset = 0
+
+    @staticmethod
+    def parse(steps: List[Any]) -> "StepSequence":
+        entries: List[Union[Step, Macro]] = []
+        for step in steps:
+            if is_macro(step):
+                entries.append(Macro.parse(step, {}))
+            else:
+                entries.append(Dispatcher.dispatch(step))
+        return StepSequence(entries)
+
+
+def iterate_steps(steps: Sequence[Step], start: int) -> Iterator[Tuple[int, Step]]:
+    """Yields the index and step of every step from start onwards, without
+    expanding the macros of the steps before it.
+    """
+    if isinstance(steps, StepSequence):
+        return enumerate(steps.iterate(start), start)
+    return enumerate(steps[start:], start)
@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass, field
 from typing import Any, List, Optional, Self, Type
 
@@ -5,6 +6,35 @@ from git import Repo
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
+GLOB_CHARACTERS = ("*", "?", "[")
+
+
+def expand_add_paths(working_dir: str, files: List[str]) -> Optional[List[str]]:
+    """Returns the files and the files under the directories of an add step,
+    relative to working_dir, or None if only IndexFile.add() can add them, such as
+    globs or missing files.
+    """
+    paths: List[str] = []
+    for file in files:
+        if any(c in file for c in GLOB_CHARACTERS):
+            return None
+        path = os.path.normpath(file)
+        full_path = os.path.join(working_dir, path)
+        if os.path.isdir(full_path) and not os.path.islink(full_path):
+            for root, dirs, names in os.walk(full_path):
+                dirs[:] = sorted(d for d in dirs if d != ".git")
+                for name in sorted(names):
+                    paths.append(os.path.relpath(os.path.join(root, name), working_dir))
+        elif os.path.lexists(full_path):
+            paths.append(path)
+        else:
+            return None
+
+    for path in paths:
+        if path == os.pardir or path.startswith(os.pardir + os.sep):
+            return None
+    return paths
+
 
 @dataclass
 class AddStep(Step):
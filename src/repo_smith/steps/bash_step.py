@@ -1,3 +1,4 @@
+import os
 import subprocess
 from dataclasses import dataclass, field
 from typing import Any, Optional, Self, Type
@@ -15,9 +16,27 @@ class BashStep(Step):
 
     def execute(self, repo: Repo) -> None:
         subprocess.check_call(
-            self.body.strip(), shell=True, executable="/bin/bash", cwd=repo.working_dir
+            self.body.strip(),
+            shell=True,
+            executable="/bin/bash",
+            cwd=repo.working_dir,
+            env=dict(os.environ, **repo.git.environment()),
         )
 
+    async def execute_async(self, repo: Repo) -> None:
+        import asyncio
+
+        process = await asyncio.create_subprocess_exec(
+            "/bin/bash",
+            "-c",
+            self.body.strip(),
+            cwd=repo.working_dir,
+            env=dict(os.environ, **repo.git.environment()),
+        )
+        returncode = await process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, self.body.strip())
+
     @classmethod
     def parse(
         cls: Type[Self],
@@ -2,6 +2,9 @@ from dataclasses import dataclass, field
 from typing import Any, Optional, Self, Type
 
 from git import Repo
+from repo_smith.async_git import run_git_async
+from repo_smith.git_session import session_for
+from repo_smith.ref_index import has_branch, has_ref_named
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -13,12 +16,33 @@ class BranchDeleteStep(Step):
     step_type: StepType = field(init=False, default=StepType.BRANCH_DELETE)
 
     def execute(self, repo: Repo) -> None:
-        current_local_refs = [ref.name for ref in repo.refs]
-        if self.branch_name not in current_local_refs:
+        self.__validate(repo)
+        if self.__is_checked_out(repo) or not has_branch(repo, self.branch_name):
+            # Let git-branch refuse to delete the branch that is checked out, or a
+            # tag or remote-tracking branch that is not a branch
+            repo.delete_head(self.branch_name, force=True)
+            return
+
+        session_for(repo).update_refs([f"delete refs/heads/{self.branch_name}"])
+
+    async def execute_async(self, repo: Repo) -> None:
+        self.__validate(repo)
+        if self.__is_checked_out(repo) or not has_branch(repo, self.branch_name):
+            await run_git_async(repo, "branch", "-D", self.branch_name)
+            return
+
+        session_for(repo).update_refs([f"delete refs/heads/{self.branch_name}"])
+
+    def __validate(self, repo: Repo) -> None:
+        if not has_ref_named(repo, self.branch_name):
             raise ValueError(
                 '"branch-name" field provided does not correspond to any existing branches in branch-delete step.'
             )
-        repo.delete_head(self.branch_name, force=True)
+
+    def __is_checked_out(self, repo: Repo) -> bool:
+        return (
+            not repo.head.is_detached and repo.head.reference.name == self.branch_name
+        )
 
     @classmethod
     def parse(
@@ -1,7 +1,9 @@
 from dataclasses import dataclass, field
 from typing import Any, Optional, Self, Type
 
-from git import Repo
+from git import Head, Repo
+from repo_smith.git_session import session_for
+from repo_smith.ref_index import has_branch
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -14,16 +16,26 @@ class BranchRenameStep(Step):
     step_type: StepType = field(init=False, default=StepType.BRANCH)
 
     def execute(self, repo: Repo) -> None:
-        if self.original_branch_name not in repo.heads:
+        if not has_branch(repo, self.original_branch_name):
             raise ValueError(
                 '"branch-name" field provided does not correspond to any existing branches in branch-rename step.'
             )
-        if self.target_branch_name in repo.heads:
+        if has_branch(repo, self.target_branch_name):
             raise ValueError(
                 '"new-name" field provided corresponds to an existing branch already in branch-rename step.'
             )
-        branch = repo.heads[self.original_branch_name]
-        branch.rename(self.target_branch_name)
+        original_ref = f"refs/heads/{self.original_branch_name}"
+        target_ref = f"refs/heads/{self.target_branch_name}"
+        session = session_for(repo)
+        sha = session.resolve(original_ref)
+        is_checked_out = (
+            not repo.head.is_detached and repo.head.reference.path == original_ref
+        )
+        session.update_refs(
+            [f"create {target_ref} {sha}", f"delete {original_ref} {sha}"]
+        )
+        if is_checked_out:
+            repo.head.reference = Head(repo, target_ref)
 
     @classmethod
     def parse(
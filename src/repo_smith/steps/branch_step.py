@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Any, Optional, Self, Type
 
-from git import Repo
+from git import Head, Repo
+from repo_smith.git_session import session_for
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -13,9 +14,23 @@ class BranchStep(Step):
     step_type: StepType = field(init=False, default=StepType.BRANCH)
 
     def execute(self, repo: Repo) -> None:
-        # TODO: Handle when attempting to create a branch when no commits exist
-        branch = repo.create_head(self.branch_name)
-        branch.checkout()
+        session = session_for(repo)
+        head = session.resolve("HEAD")
+        if head is None:
+            # TODO: Handle when attempting to create a branch when no commits exist
+            branch = repo.create_head(self.branch_name)
+            branch.checkout()
+            return
+
+        ref = f"refs/heads/{self.branch_name}"
+        existing = session.resolve(ref)
+        if existing is None:
+            session.update_refs([f"create {ref} {head}"])
+        elif existing != head:
+            # Let create_head() refuse to move a branch that points elsewhere
+            repo.create_head(self.branch_name)
+        # The branch points at HEAD, so checking it out only moves HEAD
+        repo.head.reference = Head(repo, ref)
 
     @classmethod
     def parse(
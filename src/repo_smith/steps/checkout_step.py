@@ -1,7 +1,10 @@
 from dataclasses import dataclass, field
-from typing import Any, Optional, Self, Type
+from typing import Any, List, Optional, Self, Type
 
-from git import BadName, Repo
+from git import Repo
+from repo_smith.async_git import run_git_async
+from repo_smith.git_session import session_for
+from repo_smith.ref_index import has_branch
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -15,24 +18,27 @@ class CheckoutStep(Step):
     step_type: StepType = field(init=False, default=StepType.CHECKOUT)
 
     def execute(self, repo: Repo) -> None:
+        repo.git.checkout(*self.__checkout_args(repo))
+
+    async def execute_async(self, repo: Repo) -> None:
+        await run_git_async(repo, "checkout", *self.__checkout_args(repo))
+
+    def __checkout_args(self, repo: Repo) -> List[str]:
         if self.branch_name is not None:
             if self.start_point is not None:
-                if self.branch_name in repo.heads:
+                if has_branch(repo, self.branch_name):
                     raise ValueError(
                         f'Branch "{self.branch_name}" already exists. Cannot use "start-point" with an existing branch in checkout step.'
                     )
-                repo.git.checkout("-b", self.branch_name, self.start_point)
-            elif self.branch_name not in repo.heads:
+                return ["-b", self.branch_name, self.start_point]
+            elif not has_branch(repo, self.branch_name):
                 raise ValueError("Invalid branch name")
-            else:
-                repo.heads[self.branch_name].checkout()
+            return [self.branch_name]
 
-        if self.commit_hash:
-            try:
-                commit = repo.commit(self.commit_hash)
-                repo.git.checkout(commit)
-            except (ValueError, BadName):
-                raise ValueError("Commit not found")
+        commit = session_for(repo).resolve(f"{self.commit_hash}^{{commit}}")
+        if commit is None:
+            raise ValueError("Commit not found")
+        return [commit]
 
     @classmethod
     def parse(
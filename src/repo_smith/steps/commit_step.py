@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 from typing import Any, Optional, Self, Type
 
 from git import Repo
+from repo_smith.async_git import run_git_async
+from repo_smith.deterministic import index_commit_identity
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -17,7 +19,13 @@ class CommitStep(Step):
         if self.empty:
             repo.git.commit("-m", self.message, "--allow-empty")
         else:
-            repo.index.commit(message=self.message)
+            repo.index.commit(message=self.message, **index_commit_identity(repo))
+
+    async def execute_async(self, repo: Repo) -> None:
+        if self.empty:
+            await run_git_async(repo, "commit", "-m", self.message, "--allow-empty")
+        else:
+            self.execute(repo)
 
     @classmethod
     def parse(
@@ -1,26 +1,38 @@
-from typing import Any, Type
+from importlib import import_module
+from typing import Any, Dict, Tuple, Type
 
-from repo_smith.steps.add_step import AddStep
-from repo_smith.steps.bash_step import BashStep
-from repo_smith.steps.branch_delete_step import BranchDeleteStep
-from repo_smith.steps.branch_rename_step import BranchRenameStep
-from repo_smith.steps.branch_step import BranchStep
-from repo_smith.steps.checkout_step import CheckoutStep
-from repo_smith.steps.commit_step import CommitStep
-from repo_smith.steps.fetch_step import FetchStep
-from repo_smith.steps.file_step import (
-    AppendFileStep,
-    DeleteFileStep,
-    EditFileStep,
-    NewFileStep,
-)
-from repo_smith.steps.merge_step import MergeStep
-from repo_smith.steps.remote_step import RemoteStep
-from repo_smith.steps.reset_step import ResetStep
-from repo_smith.steps.revert_step import RevertStep
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
-from repo_smith.steps.tag_step import TagStep
+
+# Step classes are imported on first use so that importing the dispatcher does not
+# pull in every step module along with GitPython
+STEP_CLASSES: Dict[StepType, Tuple[str, str]] = {
+    StepType.COMMIT: ("repo_smith.steps.commit_step", "CommitStep"),
+    StepType.ADD: ("repo_smith.steps.add_step", "AddStep"),
+    StepType.TAG: ("repo_smith.steps.tag_step", "TagStep"),
+    StepType.BASH: ("repo_smith.steps.bash_step", "BashStep"),
+    StepType.BRANCH: ("repo_smith.steps.branch_step", "BranchStep"),
+    StepType.BRANCH_RENAME: ("repo_smith.steps.branch_rename_step", "BranchRenameStep"),
+    StepType.BRANCH_DELETE: ("repo_smith.steps.branch_delete_step", "BranchDeleteStep"),
+    StepType.CHECKOUT: ("repo_smith.steps.checkout_step", "CheckoutStep"),
+    StepType.MERGE: ("repo_smith.steps.merge_step", "MergeStep"),
+    StepType.REMOTE: ("repo_smith.steps.remote_step", "RemoteStep"),
+    StepType.RESET: ("repo_smith.steps.reset_step", "ResetStep"),
+    StepType.REVERT: ("repo_smith.steps.revert_step", "RevertStep"),
+    StepType.FETCH: ("repo_smith.steps.fetch_step", "FetchStep"),
+    StepType.NEW_FILE: ("repo_smith.steps.file_step", "NewFileStep"),
+    StepType.EDIT_FILE: ("repo_smith.steps.file_step", "EditFileStep"),
+    StepType.DELETE_FILE: ("repo_smith.steps.file_step", "DeleteFileStep"),
+    StepType.APPEND_FILE: ("repo_smith.steps.file_step", "AppendFileStep"),
+    StepType.GENERATE_HISTORY: (
+        "repo_smith.steps.generate_history_step",
+        "GenerateHistoryStep",
+    ),
+    StepType.GENERATE_FILES: (
+        "repo_smith.steps.generate_files_step",
+        "GenerateFilesStep",
+    ),
+}
 
 
 class Dispatcher:
@@ -38,38 +50,5 @@ class Dispatcher:
 
     @staticmethod
     def __get_type(step_type: StepType) -> Type[Step]:
-        match step_type:
-            case StepType.COMMIT:
-                return CommitStep
-            case StepType.ADD:
-                return AddStep
-            case StepType.TAG:
-                return TagStep
-            case StepType.BASH:
-                return BashStep
-            case StepType.BRANCH:
-                return BranchStep
-            case StepType.BRANCH_RENAME:
-                return BranchRenameStep
-            case StepType.BRANCH_DELETE:
-                return BranchDeleteStep
-            case StepType.CHECKOUT:
-                return CheckoutStep
-            case StepType.MERGE:
-                return MergeStep
-            case StepType.REMOTE:
-                return RemoteStep
-            case StepType.RESET:
-                return ResetStep
-            case StepType.REVERT:
-                return RevertStep
-            case StepType.FETCH:
-                return FetchStep
-            case StepType.NEW_FILE:
-                return NewFileStep
-            case StepType.EDIT_FILE:
-                return EditFileStep
-            case StepType.DELETE_FILE:
-                return DeleteFileStep
-            case StepType.APPEND_FILE:
-                return AppendFileStep
+        module_name, class_name = STEP_CLASSES[step_type]
+        return getattr(import_module(module_name), class_name)
@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Any, Optional, Self, Type
 
-from git import Repo
+from git import Remote, Repo
+from repo_smith.async_git import run_git_async
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -13,13 +14,18 @@ class FetchStep(Step):
     step_type: StepType = field(init=False, default=StepType.FETCH)
 
     def execute(self, repo: Repo) -> None:
+        self.__get_remote(repo).fetch()
+
+    async def execute_async(self, repo: Repo) -> None:
+        remote = self.__get_remote(repo)
+        await run_git_async(repo, "fetch", remote.name)
+
+    def __get_remote(self, repo: Repo) -> Remote:
         try:
-            remote = repo.remote(self.remote_name)
+            return repo.remote(self.remote_name)
         except Exception:
             raise ValueError(f"Missing remote '{self.remote_name}' in fetch step.")
 
-        remote.fetch()
-
     @classmethod
     def parse(
         cls: Type[Self],
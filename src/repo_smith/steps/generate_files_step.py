@@ -0,0 +1,169 @@
+import math
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Self, Set, Tuple, Type
+
+from git import Repo
+from repo_smith.steps.step import Step
+from repo_smith.steps.step_type import StepType
+
+# Files are written in chunks copied from a pool of random bytes at random
+# offsets, so no file is ever held in memory and the threads do not contend for
+# the GIL generating random bytes
+CHUNK_SIZE = 1024 * 1024
+POOL_SIZE = 4 * CHUNK_SIZE
+SIZE_DISTRIBUTIONS = ("uniform", "log-uniform")
+# Maps random bytes to text: about one newline every 64 characters and one space
+# every 6, with lowercase letters in between
+TEXT_TABLE = bytes(
+    b"\n"[0] if i < 4 else b" "[0] if i < 48 else b"a"[0] + (i - 48) % 26
+    for i in range(256)
+)
+
+
+@dataclass
+class GenerateFilesStep(Step):
+    count: int
+    directory: str
+    depth: int
+    files_per_directory: int
+    min_size: int
+    max_size: int
+    size_distribution: str
+    binary: bool
+    seed: int
+    threads: Optional[int]
+
+    step_type: StepType = field(init=False, default=StepType.GENERATE_FILES)
+
+    def execute(self, repo: Repo) -> None:
+        pool = random.Random(self.seed).randbytes(POOL_SIZE)
+        if not self.binary:
+            pool = pool.translate(TEXT_TABLE)
+        files = [self.__path(i) for i in range(self.count)]
+        dirs: Set[str] = {os.path.dirname(path) for path in files}
+        for dir in sorted(dirs):
+            if dir:
+                os.makedirs(os.path.join(repo.working_dir, dir), exist_ok=True)
+
+        def write(i: int) -> None:
+            self.__write(os.path.join(repo.working_dir, files[i]), i, pool)
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            for _ in executor.map(write, range(self.count)):
+                pass
+
+    async def execute_async(self, repo: Repo) -> None:
+        import asyncio
+
+        await asyncio.to_thread(self.execute, repo)
+
+    def __path(self, i: int) -> str:
+        # Every directory holds files_per_directory files, and every directory but
+        # the outermost holds files_per_directory subdirectories
+        dir_index = i // self.files_per_directory
+        parts: List[str] = []
+        for level in range(self.depth):
+            if level == self.depth - 1:
+                parts.append(f"dir-{dir_index}")
+            else:
+                parts.append(f"dir-{dir_index % self.files_per_directory}")
+                dir_index //= self.files_per_directory
+        extension = "bin" if self.binary else "txt"
+        return os.path.join(self.directory, *reversed(parts), f"file-{i}.{extension}")
+
+    def __write(self, path: str, i: int, pool: bytes) -> None:
+        # Every file has its own generator, so its contents do not depend on the
+        # order the threads write the files in
+        rng = random.Random(f"{self.seed}:{i}")
+        remaining = self.__size(rng)
+        view = memoryview(pool)
+        with open(path, "wb", buffering=0) as file:
+            while remaining > 0:
+                size = min(remaining, CHUNK_SIZE)
+                offset = rng.randrange(POOL_SIZE - size + 1)
+                file.write(view[offset : offset + size])
+                remaining -= size
+
+    def __size(self, rng: random.Random) -> int:
+        if self.size_distribution == "log-uniform":
+            low, high = math.log1p(self.min_size), math.log1p(self.max_size)
+            return round(math.expm1(rng.uniform(low, high)))
+        return rng.randint(self.min_size, self.max_size)
+
+    @classmethod
+    def parse(
+        cls: Type[Self],
+        name: Optional[str],
+        description: Optional[str],
+        id: Optional[str],
+        step: Any,
+    ) -> Self:
+        if "count" not in step:
+            raise ValueError('Missing "count" field in generate-files step.')
+
+        def integer(field: str, value: Any, minimum: int) -> int:
+            if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+                raise ValueError(
+                    f'Field "{field}" in generate-files step must be an integer of at least {minimum}.'
+                )
+            return value
+
+        min_size = integer("min-size", step.get("min-size", 1024), 0)
+        max_size = integer("max-size", step.get("max-size", min_size), 0)
+        if max_size < min_size:
+            raise ValueError(
+                'Field "max-size" in generate-files step cannot be less than "min-size".'
+            )
+
+        size_distribution = step.get("size-distribution", "uniform")
+        if size_distribution not in SIZE_DISTRIBUTIONS:
+            raise ValueError(
+                f'Field "size-distribution" in generate-files step must be one of: {", ".join(SIZE_DISTRIBUTIONS)}.'
+            )
+
+        seed = step.get("seed", 0)
+        if isinstance(seed, bool) or not isinstance(seed, int):
+            raise ValueError('Field "seed" in generate-files step must be an integer.')
+
+        directory, binary = cls.__get_details(step)
+        threads = step.get("threads")
+        return cls(
+            name=name,
+            description=description,
+            id=id,
+            count=integer("count", step["count"], 0),
+            directory=directory,
+            depth=integer("depth", step.get("depth", 1), 0),
+            files_per_directory=integer(
+                "files-per-directory", step.get("files-per-directory", 100), 1
+            ),
+            min_size=min_size,
+            max_size=max_size,
+            size_distribution=size_distribution,
+            binary=binary,
+            seed=seed,
+            threads=None if threads is None else integer("threads", threads, 1),
+        )
+
+    @staticmethod
+    def __get_details(step: Any) -> Tuple[str, bool]:
+        directory = step.get("directory", "") or ""
+        if not isinstance(directory, str):
+            raise ValueError('Field "directory" in generate-files step must be a path.')
+        path = os.path.normpath(directory) if directory else ""
+        if (
+            os.path.isabs(path)
+            or path == os.pardir
+            or path.startswith(os.pardir + os.sep)
+        ):
+            raise ValueError(
+                'Field "directory" in generate-files step must be inside the repository.'
+            )
+
+        binary = step.get("binary", False)
+        if not isinstance(binary, bool):
+            raise ValueError('Field "binary" in generate-files step must be a boolean.')
+        return ("" if path == os.curdir else path), binary
@@ -0,0 +1,215 @@
+import random
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, List, Optional, Self, Tuple, Type
+
+from git import Repo
+from repo_smith.async_git import run_git_async
+from repo_smith.deterministic import committer
+from repo_smith.git_session import session_for
+from repo_smith.steps.step import Step
+from repo_smith.steps.step_type import StepType
+
+FAST_IMPORT_ARGS = ["fast-import", "--quiet", "--done", "--date-format=raw"]
+
+
+def generated_file_name(i: int) -> str:
+    return f"dir-{i // 100}/file-{i}.txt"
+
+
+@dataclass
+class GenerateHistoryStep(Step):
+    commits: int
+    branches: int
+    merge_probability: float
+    files_per_commit: int
+    file_count: int
+    seed: int
+    branch_prefix: str
+
+    step_type: StepType = field(init=False, default=StepType.GENERATE_HISTORY)
+
+    def execute(self, repo: Repo) -> None:
+        base, branch_names = self.__prepare(repo)
+        with tempfile.TemporaryFile() as stream:
+            self.__write_stream(repo, stream, base, branch_names)
+            stream.seek(0)
+            repo.git.execute(["git", *FAST_IMPORT_ARGS], istream=stream)
+        read_tree_args = self.__read_tree_args(repo, base, branch_names[0])
+        if read_tree_args is not None:
+            repo.git.read_tree(*read_tree_args)
+
+    async def execute_async(self, repo: Repo) -> None:
+        base, branch_names = self.__prepare(repo)
+        with tempfile.TemporaryFile() as stream:
+            self.__write_stream(repo, stream, base, branch_names)
+            stream.seek(0)
+            await run_git_async(repo, *FAST_IMPORT_ARGS, stdin=stream)
+        read_tree_args = self.__read_tree_args(repo, base, branch_names[0])
+        if read_tree_args is not None:
+            await run_git_async(repo, "read-tree", *read_tree_args)
+
+    def __prepare(self, repo: Repo) -> Tuple[Optional[str], List[str]]:
+        """Returns the commit the history starts from, if any, and the branches it
+        is generated on, starting with the current branch.
+        """
+        if repo.head.is_detached:
+            raise ValueError("Cannot generate history on a detached HEAD.")
+
+        branch_names = [repo.head.reference.name]
+        branch_names += [f"{self.branch_prefix}-{i}" for i in range(1, self.branches)]
+        existing = {head.name for head in repo.heads}
+        for branch_name in branch_names[1:]:
+            if branch_name in existing:
+                raise ValueError(f"Branch {branch_name} already exists.")
+        return session_for(repo).resolve("HEAD"), branch_names
+
+    def __read_tree_args(
+        self, repo: Repo, base: Optional[str], branch_name: str
+    ) -> Optional[List[str]]:
+        """Returns the arguments of git-read-tree that move the index and working
+        directory from the base to the new tip of the current branch, failing
+        rather than overwriting local changes, or None if the tip did not move.
+        """
+        tip = session_for(repo).resolve(f"refs/heads/{branch_name}")
+        if tip is None or tip == base:
+            return None
+        return ["-m", "-u", tip] if base is None else ["-m", "-u", base, tip]
+
+    def __write_stream(
+        self,
+        repo: Repo,
+        stream: BinaryIO,
+        base: Optional[str],
+        branch_names: List[str],
+    ) -> None:
+        """Writes the git-fast-import stream of the generated history.
+
+        Every commit is made on a randomly picked branch and touches randomly
+        picked files, so the same seed always generates the same DAG. Branches
+        fork from the current branch the first time they are picked.
+        """
+        rng = random.Random(self.seed)
+        name, email, start_time, offset = self.__ident(repo)
+        tips: List[Optional[str]] = [base] + [None] * (len(branch_names) - 1)
+        forked = [True] + [False] * (len(branch_names) - 1)
+        written = [False] * len(branch_names)
+
+        for i in range(self.commits):
+            line = rng.randrange(len(branch_names))
+            if not forked[line]:
+                tips[line] = tips[0]
+                forked[line] = True
+            parent = tips[line]
+
+            merge_from = None
+            if len(branch_names) > 1 and rng.random() < self.merge_probability:
+                candidates = [
+                    tip
+                    for other, tip in enumerate(tips)
+                    if other != line and tip is not None and tip != parent
+                ]
+                if candidates:
+                    merge_from = rng.choice(candidates)
+
+            mark = f":{i + 1}"
+            ident = f"{name} <{email}> {start_time + i} {offset}".encode("utf-8")
+            message = (
+                f"Generated merge {i + 1}"
+                if merge_from
+                else f"Generated commit {i + 1}"
+            ).encode("utf-8")
+            stream.write(
+                b"commit refs/heads/%s\nmark %s\nauthor %s\ncommitter %s\n"
+                % (
+                    branch_names[line].encode("utf-8"),
+                    mark.encode("utf-8"),
+                    ident,
+                    ident,
+                )
+            )
+            stream.write(b"data %d\n%s\n" % (len(message), message))
+            if parent is not None and not written[line]:
+                # Later commits continue from the branch's tip, without fast-import
+                # reloading its tree
+                stream.write(b"from %s\n" % parent.encode("utf-8"))
+            if merge_from is not None:
+                stream.write(b"merge %s\n" % merge_from.encode("utf-8"))
+            for _ in range(self.files_per_commit):
+                path = generated_file_name(rng.randrange(self.file_count))
+                data = f"{path}: commit {i + 1}\n".encode("utf-8")
+                stream.write(b"M 100644 inline %s\n" % path.encode("utf-8"))
+                stream.write(b"data %d\n%s\n" % (len(data), data))
+            stream.write(b"\n")
+            tips[line] = mark
+            written[line] = True
+
+        # Branches that were never picked still point at the current branch
+        for line, branch_name in enumerate(branch_names):
+            if not forked[line] and tips[0] is not None:
+                stream.write(
+                    b"reset refs/heads/%s\nfrom %s\n\n"
+                    % (branch_name.encode("utf-8"), tips[0].encode("utf-8"))
+                )
+        stream.write(b"done\n")
+
+    def __ident(self, repo: Repo) -> Tuple[str, str, int, str]:
+        """Returns the name, email, Unix time and offset of the committer, which
+        the dates of the generated commits count up from.
+        """
+        name, email, date = committer(repo)
+        timestamp, _, offset = date.partition(" ")
+        return name, email, int(timestamp), offset
+
+    @classmethod
+    def parse(
+        cls: Type[Self],
+        name: Optional[str],
+        description: Optional[str],
+        id: Optional[str],
+        step: Any,
+    ) -> Self:
+        if "commits" not in step:
+            raise ValueError('Missing "commits" field in generate-history step.')
+
+        def integer_at_least(field: str, value: Any, minimum: int) -> int:
+            if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+                raise ValueError(
+                    f'Field "{field}" in generate-history step must be an integer of at least {minimum}.'
+                )
+            return value
+
+        merge_probability = step.get("merge-probability", 0)
+        if (
+            isinstance(merge_probability, bool)
+            or not isinstance(merge_probability, (int, float))
+            or not 0 <= merge_probability <= 1
+        ):
+            raise ValueError(
+                'Field "merge-probability" in generate-history step must be a number between 0 and 1.'
+            )
+
+        branch_prefix = step.get("branch-prefix", "generated")
+        if not isinstance(branch_prefix, str) or branch_prefix.strip() == "":
+            raise ValueError('Empty "branch-prefix" field in generate-history step.')
+
+        seed = step.get("seed", 0)
+        if isinstance(seed, bool) or not isinstance(seed, int):
+            raise ValueError(
+                'Field "seed" in generate-history step must be an integer.'
+            )
+
+        return cls(
+            name=name,
+            description=description,
+            id=id,
+            commits=integer_at_least("commits", step["commits"], 1),
+            branches=integer_at_least("branches", step.get("branches", 1), 1),
+            merge_probability=float(merge_probability),
+            files_per_commit=integer_at_least(
+                "files-per-commit", step.get("files-per-commit", 1), 0
+            ),
+            file_count=integer_at_least("file-count", step.get("file-count", 100), 1),
+            seed=seed,
+            branch_prefix=branch_prefix,
+        )
@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
-from typing import Any, Optional, Self, Type
+from typing import Any, List, Optional, Self, Type
 
 from git import Repo
+from repo_smith.async_git import run_git_async
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -16,17 +17,28 @@ class MergeStep(Step):
 
     def execute(self, repo: Repo) -> None:
         # TODO: Maybe handle merge conflicts as they happen
+        repo.git.merge(*self.__merge_args())
+
+        if self.squash:
+            repo.git.commit("-m", self.__squash_message())
+
+    async def execute_async(self, repo: Repo) -> None:
+        await run_git_async(repo, "merge", *self.__merge_args())
+
+        if self.squash:
+            await run_git_async(repo, "commit", "-m", self.__squash_message())
+
+    def __merge_args(self) -> List[str]:
         merge_args = [self.branch_name, "--no-edit"]
 
         if self.squash:
             merge_args.append("--squash")
         elif self.no_fast_forward:
             merge_args.append("--no-ff")
+        return merge_args
 
-        repo.git.merge(*merge_args)
-
-        if self.squash:
-            repo.git.commit("-m", f"Squash merge branch '{self.branch_name}'")
+    def __squash_message(self) -> str:
+        return f"Squash merge branch '{self.branch_name}'"
 
     @classmethod
     def parse(
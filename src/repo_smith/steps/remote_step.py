@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from typing import Any, Optional, Self, Type
 
 from git import Repo
+from repo_smith.async_git import run_git_async
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -16,6 +17,9 @@ class RemoteStep(Step):
     def execute(self, repo: Repo) -> None:
         repo.create_remote(self.remote_name, self.remote_url)
 
+    async def execute_async(self, repo: Repo) -> None:
+        await run_git_async(repo, "remote", "add", self.remote_name, self.remote_url)
+
     @classmethod
     def parse(
         cls: Type[Self],
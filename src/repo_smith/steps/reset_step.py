@@ -1,7 +1,10 @@
+import os
 from dataclasses import dataclass, field
 from typing import Any, List, Optional, Self, Type
 
 from git import Repo
+from repo_smith.async_git import run_git_async
+from repo_smith.git_session import session_for
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -17,10 +20,39 @@ class ResetStep(Step):
     step_type: StepType = field(init=False, default=StepType.RESET)
 
     def execute(self, repo: Repo) -> None:
+        if not self.__soft_reset(repo):
+            repo.git.reset(*self.__reset_args())
+
+    async def execute_async(self, repo: Repo) -> None:
+        if not self.__soft_reset(repo):
+            await run_git_async(repo, "reset", *self.__reset_args())
+
+    def __reset_args(self) -> List[str]:
         if self.files:
-            repo.git.reset(self.revision, "--", *self.files)
-        else:
-            repo.git.reset(f"--{self.mode}", self.revision)
+            return [str(self.revision), "--", *self.files]
+        return [f"--{self.mode}", str(self.revision)]
+
+    def __soft_reset(self, repo: Repo) -> bool:
+        """Moves the current branch through the long-lived git-update-ref process
+        for soft resets, returning False if git-reset has to run instead.
+        """
+        # git-reset refuses to soft reset in the middle of a merge
+        if (
+            self.files
+            or self.mode != "soft"
+            or os.path.exists(os.path.join(repo.git_dir, "MERGE_HEAD"))
+        ):
+            return False
+
+        session = session_for(repo)
+        head = session.resolve("HEAD")
+        target = session.resolve(f"{self.revision}^{{commit}}")
+        if head is None or target is None:
+            return False
+        session.update_refs(
+            [f"update HEAD {target} {head}", f"update ORIG_HEAD {head}"]
+        )
+        return True
 
     @classmethod
     def parse(
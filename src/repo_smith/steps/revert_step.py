@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from typing import Any, Optional, Self, Type
 
 from git import Repo
+from repo_smith.async_git import run_git_async
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -17,6 +18,9 @@ class RevertStep(Step):
 
         repo.git.revert(*revert_args)
 
+    async def execute_async(self, repo: Repo) -> None:
+        await run_git_async(repo, "revert", self.revision, "--no-edit")
+
     @classmethod
     def parse(
         cls: Type[Self],
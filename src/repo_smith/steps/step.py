@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Optional, Self, Type
+from typing import TYPE_CHECKING, Any, Optional, Self, Type
 
-from git import Repo
 from repo_smith.steps.step_type import StepType
 
+if TYPE_CHECKING:
+    from git import Repo
+
 
 @dataclass
 class Step(ABC):
@@ -14,9 +16,17 @@ class Step(ABC):
     id: Optional[str]
 
     @abstractmethod
-    def execute(self, repo: Repo) -> None:
+    def execute(self, repo: "Repo") -> None:
         pass
 
+    async def execute_async(self, repo: "Repo") -> None:
+        """Executes the step without blocking the event loop on child processes.
+
+        Steps that only touch files or use long-lived git processes run
+        execute() directly, so only steps that launch a process override this.
+        """
+        self.execute(repo)
+
     @classmethod
     @abstractmethod
     def parse(
@@ -19,6 +19,8 @@ class StepType(Enum):
     REVERT = "revert"
     MERGE = "merge"
     FETCH = "fetch"
+    GENERATE_HISTORY = "generate-history"
+    GENERATE_FILES = "generate-files"
 
     @staticmethod
     def from_value(value: str) -> "StepType":
@@ -57,5 +59,9 @@ class StepType(Enum):
                 return StepType.MERGE
             case "fetch":
                 return StepType.FETCH
+            case "generate-history":
+                return StepType.GENERATE_HISTORY
+            case "generate-files":
+                return StepType.GENERATE_FILES
             case _:
                 raise ValueError(f"Invalid value {value} given. Not supported.")
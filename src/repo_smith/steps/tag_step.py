@@ -3,6 +3,8 @@ from dataclasses import dataclass, field
 from typing import Any, Optional, Self, Type
 
 from git import Repo
+from repo_smith.async_git import run_git_async
+from repo_smith.git_session import session_for
 from repo_smith.steps.step import Step
 from repo_smith.steps.step_type import StepType
 
@@ -15,7 +17,22 @@ class TagStep(Step):
     step_type: StepType = field(init=False, default=StepType.TAG)
 
     def execute(self, repo: Repo) -> None:
-        repo.create_tag(self.tag_name, message=self.tag_message)
+        session = session_for(repo)
+        head = session.resolve("HEAD")
+        if self.tag_message or head is None:
+            # Annotated tags need a tag object, which only git-tag writes
+            repo.create_tag(self.tag_name, message=self.tag_message)
+            return
+
+        session.update_refs([f"create refs/tags/{self.tag_name} {head}"])
+
+    async def execute_async(self, repo: Repo) -> None:
+        if self.tag_message or session_for(repo).resolve("HEAD") is None:
+            message = ["-m", self.tag_message] if self.tag_message else []
+            await run_git_async(repo, "tag", *message, "--", self.tag_name, "HEAD")
+            return
+
+        self.execute(repo)
 
     @classmethod
     def parse(
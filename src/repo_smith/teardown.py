@@ -0,0 +1,112 @@
+import atexit
+import os
+import queue
+import shutil
+import threading
+from typing import Optional
+
+from repo_smith.types import FilePath
+
+TRASH_DIR_NAME = ".repo-smith-trash"
+DEFAULT_MAX_PENDING = 16
+
+
+class BackgroundRemover:
+    """Removes directories on a background thread.
+
+    Each directory is first renamed into a trash directory next to it, which is
+    a single cheap operation, so its path can be reused right away while the
+    removal happens later. The trash directory is removed again once it is
+    empty. At most max_pending directories wait to be removed,
+    after which remove() blocks until the thread catches up, and the directories
+    still waiting are removed before the interpreter exits.
+    """
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING) -> None:
+        self.__queue: "queue.Queue[str]" = queue.Queue(maxsize=max_pending)
+        self.__thread: Optional[threading.Thread] = None
+        self.__lock = threading.Lock()
+
+    def remove(self, dir: FilePath) -> None:
+        dir = os.path.abspath(os.fspath(dir))
+        trash_dir = os.path.join(os.path.dirname(dir), TRASH_DIR_NAME)
+        trash = os.path.join(trash_dir, f"{os.getpid()}-{os.urandom(8).hex()}")
+        try:
+            self.__move_to_trash(dir, trash_dir, trash)
+        except OSError:
+            shutil.rmtree(dir)
+            return
+
+        self.__ensure_started()
+        self.__queue.put(trash)
+
+    def flush(self) -> None:
+        """Waits until every directory passed to remove() is removed."""
+        if self.__thread is not None:
+            self.__queue.join()
+
+    def __move_to_trash(self, dir: str, trash_dir: str, trash: str) -> None:
+        while True:
+            os.makedirs(trash_dir, exist_ok=True)
+            try:
+                os.rename(dir, trash)
+                return
+            except FileNotFoundError:
+                # The trash directory was removed once empty by another remover
+                if not os.path.exists(dir) or os.path.exists(trash_dir):
+                    raise
+
+    def __ensure_started(self) -> None:
+        with self.__lock:
+            if self.__thread is not None:
+                return
+            # A daemon thread, since the interpreter only waits for the queue at
+            # exit rather than for the thread, which never finishes
+            self.__thread = threading.Thread(
+                target=self.__run, name="repo-smith-teardown", daemon=True
+            )
+            self.__thread.start()
+            atexit.register(self.flush)
+
+    def __run(self) -> None:
+        while True:
+            trash = self.__queue.get()
+            try:
+                shutil.rmtree(trash, ignore_errors=True)
+                try:
+                    os.rmdir(os.path.dirname(trash))
+                except OSError:
+                    pass
+            finally:
+                self.__queue.task_done()
+
+
+_remover: Optional[BackgroundRemover] = None
+_remover_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    global _remover
+    _remover = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def background_remover() -> BackgroundRemover:
+    """Returns the remover shared by every repository of the process."""
+    global _remover
+    with _remover_lock:
+        if _remover is None:
+            _remover = BackgroundRemover()
+        return _remover
+
+
+def remove_dir(dir: FilePath, background: bool = False) -> None:
+    """Removes the directory, on the shared background thread if background is
+    set.
+    """
+    if background:
+        background_remover().remove(dir)
+    else:
+        shutil.rmtree(dir)
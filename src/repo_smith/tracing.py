@@ -0,0 +1,173 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from repo_smith.steps.step import Step
+from repo_smith.steps.step_type import StepType
+from repo_smith.types import FilePath
+
+_process_launches = 0
+# Spans of every trace that are open, outside of which launches are not counted
+_open_spans = 0
+_process_launches_lock = threading.Lock()
+_audit_hook_installed = False
+
+
+def _count_process_launches(event: str, args: Tuple[Any, ...]) -> None:
+    global _process_launches
+    # Called for every audited event of every thread, so the lock is only taken
+    # for process launches
+    if event == "subprocess.Popen" and _open_spans > 0:
+        with _process_launches_lock:
+            if _open_spans > 0:
+                _process_launches += 1
+
+
+def process_launches() -> int:
+    """Returns the number of processes launched through subprocess, which
+    GitPython and asyncio both use, while a span of any trace was open.
+
+    Audit hooks cannot be removed, so the hook is only installed once tracing is
+    first used, and does nothing while no span is open.
+    """
+    global _audit_hook_installed
+    with _process_launches_lock:
+        if not _audit_hook_installed:
+            sys.addaudithook(_count_process_launches)
+            _audit_hook_installed = True
+        return _process_launches
+
+
+@contextmanager
+def counting_process_launches() -> Iterator[None]:
+    """Counts the processes launched within the block in process_launches(), the
+    same as an open span does.
+    """
+    global _open_spans
+    process_launches()
+    with _process_launches_lock:
+        _open_spans += 1
+    try:
+        yield
+    finally:
+        with _process_launches_lock:
+            _open_spans -= 1
+
+
+def cpu_time() -> float:
+    """Returns the CPU time used by this process and the child processes it has
+    waited for.
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    step_id: Optional[str]
+    step_type: Optional[StepType]
+    # Seconds since the trace started
+    start: float
+    wall_time: float
+    cpu_time: float
+    child_processes: int
+
+
+class Trace:
+    """Records spans for the steps, hooks and setup and teardown of a build.
+
+    Spans may be nested, such as a fast-import flush triggered by a step, in which
+    case the outer span includes the time and processes of the inner one.
+    """
+
+    def __init__(self) -> None:
+        self.__origin = time.perf_counter()
+        self.__spans: List[Span] = []
+        # Installs the audit hook before the first span starts
+        process_launches()
+
+    @property
+    def spans(self) -> List[Span]:
+        return list(self.__spans)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        category: str,
+        step_id: Optional[str] = None,
+        step_type: Optional[StepType] = None,
+    ) -> Iterator[None]:
+        start = time.perf_counter()
+        start_cpu = cpu_time()
+        start_launches = process_launches()
+        try:
+            with counting_process_launches():
+                yield
+        finally:
+            end = time.perf_counter()
+            self.__spans.append(
+                Span(
+                    name=name,
+                    category=category,
+                    step_id=step_id,
+                    step_type=step_type,
+                    start=start - self.__origin,
+                    wall_time=end - start,
+                    cpu_time=cpu_time() - start_cpu,
+                    child_processes=process_launches() - start_launches,
+                )
+            )
+
+    def step(self, index: int, step: Step) -> ContextManager[None]:
+        name = step.name or f"{step.step_type.value} (step {index + 1})"
+        return self.span(name, "step", step.id, step.step_type)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Returns the spans as complete events of the Chrome trace-event format,
+        which chrome://tracing and Perfetto can open.
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        for span in sorted(self.__spans, key=lambda span: span.start):
+            args: Dict[str, Any] = {
+                "cpu_time_ms": span.cpu_time * 1000,
+                "child_processes": span.child_processes,
+            }
+            if span.step_id is not None:
+                args["id"] = span.step_id
+            if span.step_type is not None:
+                args["type"] = span.step_type.value
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start * 1_000_000,
+                    "dur": span.wall_time * 1_000_000,
+                    "pid": pid,
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: FilePath) -> None:
+        with open(path, "w") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+
+
+def traced(trace: Optional[Trace], name: str, category: str) -> ContextManager[None]:
+    """Records a span on trace, or does nothing when there is no trace."""
+    return nullcontext() if trace is None else trace.span(name, category)
+
+
+def traced_step(trace: Optional[Trace], index: int, step: Step) -> ContextManager[None]:
+    return nullcontext() if trace is None else trace.step(index, step)
@@ -0,0 +1,197 @@
+import os
+import stat
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple, Union
+
+from git import Commit, IndexFile, Repo, Tree
+from git.index.fun import stat_mode_to_index_mode
+from git.index.typ import BaseIndexEntry, IndexEntry
+from git.objects.fun import tree_to_stream
+from gitdb.base import IStream
+from gitdb.db.loose import LooseObjectDB
+from repo_smith.deterministic import index_commit_identity
+from repo_smith.git_session import session_for
+from repo_smith.steps.add_step import AddStep, expand_add_paths
+from repo_smith.steps.commit_step import CommitStep
+from repo_smith.steps.step import Step
+
+# Hooks IndexFile.commit() runs, which the writer cannot run itself
+COMMIT_HOOKS = ("pre-commit", "commit-msg", "post-commit")
+
+
+class TreeNode:
+    """A directory of the in-memory tree, whose SHA is cached until an entry
+    under it changes.
+    """
+
+    def __init__(self) -> None:
+        self.children: Dict[str, Union["TreeNode", IndexEntry]] = {}
+        self.binsha: Optional[bytes] = None
+
+
+class TreeWriter:
+    """Applies consecutive add and commit steps to an in-memory model of the index
+    instead of reading and writing .git/index for every step.
+
+    Blobs are written by a long-lived git-hash-object process, only the trees
+    that changed since the previous commit are written, and the index is written
+    once when the writer is flushed. Steps it cannot apply the same way as
+    IndexFile.add() and IndexFile.commit(), such as adding a glob or committing
+    with commit hooks installed, are declined so that the caller can flush the
+    writer and execute the step directly.
+    """
+
+    name = "tree writer"
+
+    def __init__(self, repo: Repo) -> None:
+        self.repo = repo
+        # Repo.odb launches git-hash-object for every object it writes, while trees
+        # and symlinks are small enough to be written directly
+        self.__loose_db = LooseObjectDB(os.path.join(repo.git_dir, "objects"))
+        self.__root: Optional[TreeNode] = None
+        self.__index_changed = False
+
+    @property
+    def pending(self) -> bool:
+        return self.__root is not None
+
+    def apply(self, step: Step) -> bool:
+        """Applies the step to the in-memory index, returning False if it has to be
+        executed directly instead.
+        """
+        if isinstance(step, AddStep):
+            paths = expand_add_paths(self.repo.working_dir, step.files)
+            if paths is None or not self.__begin():
+                return False
+            self.__add(paths)
+            return True
+
+        if isinstance(step, CommitStep):
+            if step.empty or self.__has_commit_hooks() or not self.__begin():
+                return False
+            assert self.__root is not None
+            if not self.__root.children:
+                # IndexFile.commit() refuses to commit an empty index
+                return False
+            self.__commit(step)
+            return True
+
+        return False
+
+    def flush(self) -> None:
+        """Writes the in-memory index to .git/index if any step changed it."""
+        root = self.__root
+        self.__root = None
+        if root is None or not self.__index_changed:
+            return
+        self.__index_changed = False
+
+        entries: Dict[Tuple[str, int], IndexEntry] = {}
+        self.__collect(root, "", entries)
+        index = IndexFile(self.repo)
+        index.entries = entries
+        index.write(ignore_extension_data=True)
+
+    def __begin(self) -> bool:
+        if self.__root is not None:
+            return True
+        root = TreeNode()
+        for (path, stage), entry in self.repo.index.entries.items():
+            if stage != 0:
+                # Unmerged entries make IndexFile.commit() fail
+                return False
+            self.__insert(root, str(path), entry)
+        self.__root = root
+        return True
+
+    def __add(self, paths: List[str]) -> None:
+        files: List[Tuple[str, int]] = []
+        links: List[Tuple[str, bytes]] = []
+        for path in paths:
+            full_path = os.path.join(self.repo.working_dir, path)
+            info = os.lstat(full_path)
+            if stat.S_ISLNK(info.st_mode):
+                links.append((path, os.readlink(full_path).encode("utf-8")))
+            else:
+                files.append((path, info.st_mode))
+
+        shas = session_for(self.repo).hash_files([path for path, _ in files])
+        for (path, mode), sha in zip(files, shas):
+            self.__stage(path, stat_mode_to_index_mode(mode), bytes.fromhex(sha))
+        for path, target in links:
+            istream = self.__loose_db.store(
+                IStream(b"blob", len(target), BytesIO(target))
+            )
+            self.__stage(path, stat.S_IFLNK, istream.binsha)
+
+    def __stage(self, path: str, mode: int, binsha: bytes) -> None:
+        assert self.__root is not None
+        path = path.replace(os.sep, "/")
+        # Entries without stat information, the same as IndexFile.add() writes
+        entry = IndexEntry.from_base(BaseIndexEntry((mode, binsha, 0, path)))
+        self.__insert(self.__root, path, entry)
+        self.__index_changed = True
+
+    def __insert(self, root: TreeNode, path: str, entry: IndexEntry) -> None:
+        node = root
+        node.binsha = None
+        *dirs, name = path.split("/")
+        for dir in dirs:
+            child = node.children.get(dir)
+            if not isinstance(child, TreeNode):
+                child = TreeNode()
+                node.children[dir] = child
+            node = child
+            node.binsha = None
+        node.children[name] = entry
+
+    def __commit(self, step: CommitStep) -> None:
+        assert self.__root is not None
+        tree = Tree(self.repo, self.__write_tree(self.__root), path="")
+        Commit.create_from_tree(
+            self.repo,
+            tree,
+            step.message,
+            head=True,
+            **index_commit_identity(self.repo),
+        )
+
+    def __write_tree(self, node: TreeNode) -> bytes:
+        if node.binsha is not None:
+            return node.binsha
+
+        # Git sorts directories as if their names ended with a slash
+        items: List[Tuple[bytes, int, str]] = []
+        for name, child in node.children.items():
+            if isinstance(child, TreeNode):
+                items.append((self.__write_tree(child), stat.S_IFDIR, name))
+            else:
+                items.append((child.binsha, child.mode, name))
+        items.sort(key=lambda item: item[2] + ("/" if item[1] == stat.S_IFDIR else ""))
+
+        stream = BytesIO()
+        tree_to_stream(items, stream.write)
+        data = stream.getvalue()
+        node.binsha = self.__loose_db.store(
+            IStream(b"tree", len(data), BytesIO(data))
+        ).binsha
+        return node.binsha
+
+    def __collect(
+        self,
+        node: TreeNode,
+        prefix: str,
+        entries: Dict[Tuple[str, int], IndexEntry],
+    ) -> None:
+        for name, child in node.children.items():
+            path = prefix + name
+            if isinstance(child, TreeNode):
+                self.__collect(child, path + "/", entries)
+            else:
+                entries[(path, 0)] = child
+
+    def __has_commit_hooks(self) -> bool:
+        hooks_dir = os.path.join(self.repo.git_dir, "hooks")
+        return any(
+            os.path.isfile(os.path.join(hooks_dir, hook)) for hook in COMMIT_HOOKS
+        )
@@ -0,0 +1,3 @@
+# The plugin is registered through its entry point once repo-smith is installed,
+# which is not the case when running the tests from a checkout
+from repo_smith.pytest_plugin import repo_smith_spec, repo_smith_spec_builds  # noqa: F401
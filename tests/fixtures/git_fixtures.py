@@ -1,21 +1,32 @@
-import os
-import shutil
 from pathlib import Path
 from typing import Generator
 
 import pytest
 from git import Repo
 
-DUMMY_PATH = Path("tests/dummy")
-REMOTE_REPO_PATH = DUMMY_PATH / "remote_repo"
+# Specs that clone the remote repository refer to it by this path, which is
+# replaced with the path of the repository of each test
+REMOTE_REPO_PLACEHOLDER = "tests/dummy/remote_repo"
 
 
 @pytest.fixture
-def remote_repo() -> Generator[Repo, None, None]:
-    os.makedirs(REMOTE_REPO_PATH)
-    repo = Repo.init(REMOTE_REPO_PATH, initial_branch="main")
+def remote_repo(tmp_path: Path) -> Generator[Repo, None, None]:
+    # Each test gets its own directory so that tests can run in parallel
+    repo = Repo.init(tmp_path / "remote_repo", initial_branch="main")
 
     yield repo
 
-    shutil.rmtree(REMOTE_REPO_PATH, ignore_errors=True)
-    shutil.rmtree(DUMMY_PATH, ignore_errors=True)
+    repo.git.clear_cache()
+
+
+def with_remote_repo(
+    spec_path: str, remote_repo: Repo, tmp_path: Path, suffix: str = ""
+) -> str:
+    """Writes a copy of the spec that clones remote_repo, with suffix appended,
+    returning the path of the copy.
+    """
+    contents = Path(spec_path).read_text()
+    contents = contents.replace(REMOTE_REPO_PLACEHOLDER, remote_repo.working_dir)
+    copy_path = tmp_path / Path(spec_path).name
+    copy_path.write_text(contents + suffix)
+    return str(copy_path)
@@ -1,4 +1,7 @@
+import asyncio
+
 import pytest
+from git import GitCommandError
 from repo_smith.initialize_repo import initialize_repo
 
 
@@ -21,3 +24,19 @@ def test_branch_delete_step_branch_does_not_exist():
     ):
         with repo_initializer.initialize() as _:
             pass
+
+
+def test_branch_delete_step_tag_with_same_name():
+    repo_initializer = initialize_repo(
+        "tests/specs/branch_delete_step/branch_delete_step_tag_with_same_name.yml"
+    )
+    with pytest.raises(GitCommandError, match="branch 'v1' not found"):
+        with repo_initializer.initialize() as _:
+            pass
+
+    async def build():
+        async with repo_initializer.initialize_async() as _:
+            pass
+
+    with pytest.raises(GitCommandError, match="branch 'v1' not found"):
+        asyncio.run(build())
@@ -21,3 +21,21 @@ def test_branch_step():
     with repo_initializer.initialize() as r:
         assert len(r.branches) == 2
         assert "test" in r.heads
+
+
+def test_branch_step_existing_branch():
+    repo_initializer = initialize_repo(
+        "tests/specs/branch_step/branch_step_existing_branch.yml"
+    )
+    with repo_initializer.initialize() as r:
+        assert r.active_branch.name == "test"
+        assert r.heads.test.commit == r.commit("start")
+
+
+def test_branch_step_diverged_branch():
+    repo_initializer = initialize_repo(
+        "tests/specs/branch_step/branch_step_diverged_branch.yml"
+    )
+    with pytest.raises(OSError):
+        with repo_initializer.initialize():
+            pass
@@ -1,29 +1,39 @@
-import os
+from pathlib import Path
 
 import pytest
 from git import Repo
 from repo_smith.initialize_repo import initialize_repo
-from tests.fixtures.git_fixtures import REMOTE_REPO_PATH, remote_repo
+from tests.fixtures.git_fixtures import remote_repo, with_remote_repo
 
 
-def test_fetch_step_remote_valid(remote_repo: Repo):
-    (REMOTE_REPO_PATH / "dummy.txt").write_text("initial")
+def test_fetch_step_remote_valid(remote_repo: Repo, tmp_path: Path):
+    (Path(remote_repo.working_dir) / "dummy.txt").write_text("initial")
     remote_repo.index.add(["dummy.txt"])
     remote_repo.index.commit("initial commit")
 
     remote_repo_commit_hexsha = remote_repo.commit("main").hexsha
-    ir = initialize_repo("tests/specs/fetch_step/fetch_step_remote_valid.yml")
+    ir = initialize_repo(
+        with_remote_repo(
+            "tests/specs/fetch_step/fetch_step_remote_valid.yml", remote_repo, tmp_path
+        )
+    )
     with ir.initialize() as r:
         latest_commit_hexsha = r.commit("origin/main").hexsha
         assert latest_commit_hexsha == remote_repo_commit_hexsha
 
 
-def test_fetch_step_missing_remote(remote_repo: Repo):
-    (REMOTE_REPO_PATH / "dummy.txt").write_text("initial")
+def test_fetch_step_missing_remote(remote_repo: Repo, tmp_path: Path):
+    (Path(remote_repo.working_dir) / "dummy.txt").write_text("initial")
     remote_repo.index.add(["dummy.txt"])
     remote_repo.index.commit("initial commit")
 
-    ir = initialize_repo("tests/specs/fetch_step/fetch_step_missing_remote.yml")
+    ir = initialize_repo(
+        with_remote_repo(
+            "tests/specs/fetch_step/fetch_step_missing_remote.yml",
+            remote_repo,
+            tmp_path,
+        )
+    )
     with pytest.raises(ValueError, match="Missing remote 'upstream' in fetch step."):
         with ir.initialize() as _:
             pass
@@ -0,0 +1,52 @@
+import asyncio
+import os
+
+from repo_smith.initialize_repo import initialize_repo
+
+SPEC_PATH = "tests/specs/generate_files_step/generate_files.yml"
+
+
+def file_contents(repo):
+    contents = {}
+    for root, _, names in os.walk(os.path.join(repo.working_dir, "src")):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, "rb") as file:
+                contents[os.path.relpath(path, repo.working_dir)] = file.read()
+    return contents
+
+
+def test_generate_files_step():
+    ir = initialize_repo(SPEC_PATH)
+    with ir.initialize() as r:
+        files = file_contents(r)
+        assert len(files) == 250
+        assert os.path.join("src", "dir-0", "dir-0", "file-0.txt") in files
+        # Every directory holds 10 files, and there are 10 directories per level
+        assert os.path.join("src", "dir-2", "dir-4", "file-249.txt") in files
+        assert all(len(contents) <= 4096 for contents in files.values())
+        assert all(contents.isascii() for contents in files.values())
+        assert len(list(r.head.commit.tree["src"].traverse())) == 250 + 25 + 3
+
+
+def test_generate_files_step_is_reproducible():
+    with initialize_repo(SPEC_PATH).initialize() as r:
+        expected = file_contents(r)
+
+    async def build():
+        async with initialize_repo(SPEC_PATH).initialize_async() as r:
+            return file_contents(r)
+
+    assert asyncio.run(build()) == expected
+
+
+def test_generate_files_step_binary():
+    ir = initialize_repo("tests/specs/generate_files_step/generate_files_binary.yml")
+    with ir.initialize() as r:
+        names = sorted(os.listdir(os.path.join(r.working_dir, "dir-0")))
+        assert names == [f"file-{i}.bin" for i in range(5)]
+        sizes = [
+            os.path.getsize(os.path.join(r.working_dir, "dir-0", name))
+            for name in names
+        ]
+        assert sizes == [3000000] * 5
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from repo_smith.initialize_repo import initialize_repo
+
+SPEC_PATH = "tests/specs/generate_history_step/generate_history.yml"
+
+
+def test_generate_history_step():
+    ir = initialize_repo(SPEC_PATH)
+    with ir.initialize() as r:
+        assert sorted(head.name for head in r.heads) == [
+            "generated-1",
+            "generated-2",
+            "generated-3",
+            "main",
+        ]
+        commits = set(r.iter_commits("--all"))
+        assert len(commits) == 201
+        assert any(len(commit.parents) == 2 for commit in commits)
+        # Every generated branch forks from the initial commit
+        root = r.git.rev_list("--max-parents=0", "main")
+        assert all(r.is_ancestor(root, head.commit) for head in r.heads)
+        # The index and working directory match the new tip of main
+        assert not r.is_dirty(untracked_files=True)
+        assert "dir-0" in {tree.name for tree in r.head.commit.tree.trees}
+
+
+def test_generate_history_step_is_reproducible():
+    with initialize_repo(SPEC_PATH, deterministic=True).initialize() as r:
+        expected = {head.name: head.commit.hexsha for head in r.heads}
+    with initialize_repo(SPEC_PATH, deterministic=True).initialize() as r:
+        assert {head.name: head.commit.hexsha for head in r.heads} == expected
+
+    async def build():
+        async with initialize_repo(
+            SPEC_PATH, deterministic=True
+        ).initialize_async() as r:
+            return {head.name: head.commit.hexsha for head in r.heads}
+
+    assert asyncio.run(build()) == expected
+
+
+def test_generate_history_step_unborn_branch():
+    ir = initialize_repo(
+        "tests/specs/generate_history_step/generate_history_unborn.yml"
+    )
+    with ir.initialize() as r:
+        assert len(list(r.iter_commits())) == 20
+        assert not r.is_dirty(untracked_files=True)
+
+
+def test_generate_history_step_existing_branch():
+    ir = initialize_repo(
+        "tests/specs/generate_history_step/generate_history_existing_branch.yml"
+    )
+    with pytest.raises(ValueError, match="Branch generated-1 already exists."):
+        with ir.initialize():
+            pass
+
+
+def test_generate_history_step_advances_deterministic_clock():
+    ir = initialize_repo(
+        "tests/specs/generate_history_step/generate_history_then_commit.yml"
+    )
+    with ir.initialize() as r:
+        generated = r.head.commit.parents[0]
+        assert generated.message == "Generated commit 200"
+        assert r.head.commit.committed_date > generated.committed_date
@@ -21,3 +21,13 @@ def test_reset_step_files():
         staged_files = [d.a_path for d in r.index.diff("HEAD")]
         assert "file1.txt" not in staged_files
         assert "file2.txt" in staged_files
+
+
+def test_reset_step_soft():
+    repo_initializer = initialize_repo("tests/specs/reset_step/reset_step_soft.yml")
+    with repo_initializer.initialize() as r:
+        assert r.head.commit.message.strip() == "Initial commit"
+        assert r.active_branch.name == "main"
+        staged_files = [d.a_path for d in r.index.diff("HEAD")]
+        assert staged_files == ["file1.txt"]
+        assert r.commit("ORIG_HEAD").message.strip() == "Modified commit"
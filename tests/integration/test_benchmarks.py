@@ -0,0 +1,20 @@
+from benchmarks.suite import run_suite
+from repo_smith.steps.step_type import StepType
+
+
+def test_benchmarks_cover_every_step_type_and_path() -> None:
+    scales = {"history": [2], "tree": [2], "refs": [1], "steps": [1]}
+    report = run_suite(scales, repeat=2, log=lambda _: None)
+
+    results = report["results"]
+    names = {result["name"] for result in results}
+    assert {step_type.value for step_type in StepType} <= names
+    paths = {(result["name"], result["path"]) for result in results}
+    for group in ("history", "tree", "refs"):
+        assert (group, "initialize") in paths
+        assert (group, "create_repo_smith") in paths
+
+    for result in results:
+        assert result["runs"] == 2
+        assert 0 < result["p50"] <= result["p95"] <= result["max"]
+        assert result["process_launches"] >= 1
@@ -0,0 +1,86 @@
+import asyncio
+import os
+
+import pytest
+from git import Repo
+from repo_smith.initialize_repo import RepoInitializer
+from repo_smith.repo_smith import create_repo_smith
+
+
+@pytest.fixture
+def origin(tmp_path):
+    origin = Repo.init(tmp_path / "origin", initial_branch="main")
+    # Lets the clones filter what they fetch from the local origin
+    origin.git.config("uploadpack.allowFilter", "true")
+    for i in range(3):
+        (tmp_path / "origin" / "file.txt").write_text(f"Version {i}\n")
+        origin.index.add(["file.txt"])
+        origin.index.commit(f"Commit {i}")
+    origin.create_head("other")
+    return origin
+
+
+def make_spec(url, **clone_options):
+    return {
+        "initialization": {
+            "clone-from": {"url": url, **clone_options},
+            "steps": [{"type": "commit", "empty": True, "message": "Empty commit"}],
+        }
+    }
+
+
+@pytest.mark.parametrize("mirror", [False, True])
+def test_clone_from_depth(tmp_path, origin, mirror):
+    url = (tmp_path / "origin").as_uri()
+    options = {"mirror_dir": str(tmp_path / "mirrors")} if mirror else {}
+    ir = RepoInitializer(make_spec(url, depth=1), **options)
+    with ir.initialize() as r:
+        assert [c.message.strip() for c in r.iter_commits()] == [
+            "Empty commit",
+            "Commit 2",
+        ]
+        assert os.path.isfile(os.path.join(r.git_dir, "shallow"))
+        # Shallow clones only fetch a single branch unless told otherwise
+        assert "origin/other" not in [ref.name for ref in r.remotes.origin.refs]
+        assert r.remotes.origin.url == url
+
+    async def build():
+        async with ir.initialize_async() as r:
+            return len(list(r.iter_commits()))
+
+    assert asyncio.run(build()) == 2
+
+
+@pytest.mark.parametrize("mirror", [False, True])
+def test_clone_from_filter(tmp_path, origin, mirror):
+    url = (tmp_path / "origin").as_uri()
+    options = {"mirror_dir": str(tmp_path / "mirrors")} if mirror else {}
+    ir = RepoInitializer(make_spec(url, filter="blob:none"), **options)
+    with ir.initialize() as r:
+        assert r.config_reader().get_value('remote "origin"', "partialclonefilter") == (
+            "blob:none"
+        )
+        assert r.remotes.origin.url == url
+        assert (tmp_path / "origin" / "file.txt").read_text() == "Version 2\n"
+
+
+def test_clone_from_single_branch_no_checkout(tmp_path, origin):
+    url = (tmp_path / "origin").as_uri()
+    ir = RepoInitializer(make_spec(url, **{"single-branch": True, "no-checkout": True}))
+    with ir.initialize() as r:
+        assert "origin/other" not in [ref.name for ref in r.remotes.origin.refs]
+        assert os.listdir(r.working_dir) == [".git"]
+
+
+def test_clone_options_create_repo_smith(tmp_path, origin):
+    url = (tmp_path / "origin").as_uri()
+    with create_repo_smith(
+        False,
+        clone_from=url,
+        clone_depth=1,
+        clone_no_checkout=True,
+        mirror_dir=str(tmp_path / "mirrors"),
+    ) as rs:
+        assert rs.repo.head.commit == origin.head.commit
+        assert len(list(rs.repo.iter_commits())) == 1
+        assert os.listdir(rs.repo.working_dir) == [".git"]
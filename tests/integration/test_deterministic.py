@@ -0,0 +1,81 @@
+import asyncio
+
+from git import Repo
+from repo_smith.initialize_repo import initialize_repo
+
+SPEC_PATH = "tests/specs/deterministic/deterministic.yml"
+CUSTOM_SPEC_PATH = "tests/specs/deterministic/deterministic_custom.yml"
+
+
+def object_ids(repo: Repo):
+    return {ref.path: ref.object.hexsha for ref in repo.refs}
+
+
+def test_deterministic_builds_are_identical():
+    with initialize_repo(SPEC_PATH).initialize() as r:
+        first = object_ids(r)
+    with initialize_repo(SPEC_PATH).initialize() as r:
+        second = object_ids(r)
+
+    assert first == second
+    assert "refs/tags/v0" in first
+
+
+def test_deterministic_builds_match_across_backends():
+    with initialize_repo(SPEC_PATH).initialize() as r:
+        expected = object_ids(r)
+    with initialize_repo(SPEC_PATH, fast_import=True).initialize() as r:
+        assert object_ids(r) == expected
+
+    async def build():
+        async with initialize_repo(SPEC_PATH).initialize_async() as r:
+            return object_ids(r)
+
+    assert asyncio.run(build()) == expected
+
+
+def test_deterministic_clock_moves_forward():
+    with initialize_repo(SPEC_PATH).initialize() as r:
+        commits = list(r.iter_commits("main", first_parent=True))
+        times = [commit.committed_date for commit in reversed(commits)]
+        assert times == sorted(times)
+        assert len(set(times)) == len(times)
+        for commit in commits:
+            assert commit.author.name == "repo-smith"
+            assert commit.committer.email == "repo-smith@example.com"
+            assert commit.authored_date == commit.committed_date
+        assert r.tags["v0"].tag.tagger.name == "repo-smith"
+
+
+def test_deterministic_custom_identity_and_clock():
+    with initialize_repo(CUSTOM_SPEC_PATH).initialize() as r:
+        first, second = reversed(list(r.iter_commits()))
+        assert first.author.name == "Jane Doe"
+        assert first.author.email == "jane@example.com"
+        # 2020-01-01T00:00:00Z, at the first step
+        assert first.authored_date == 1577836800
+        # The second commit is the fourth step
+        assert second.authored_date == 1577836800 + 3 * 3600
+        assert second.committer.name == "Jane Doe"
+
+
+def test_deterministic_option():
+    spec_path = "tests/specs/basic_spec.yml"
+    with initialize_repo(spec_path, deterministic=True).initialize() as r:
+        first = object_ids(r)
+        assert r.head.commit.author.name == "repo-smith"
+    with initialize_repo(spec_path, deterministic=True).initialize() as r:
+        assert object_ids(r) == first
+
+    with initialize_repo(CUSTOM_SPEC_PATH, deterministic=True).initialize() as r:
+        assert r.head.commit.author.name == "Jane Doe"
+    with initialize_repo(CUSTOM_SPEC_PATH, deterministic=False).initialize() as r:
+        assert r.head.commit.author.name != "Jane Doe"
+
+
+def test_deterministic_snapshot_cache(tmp_path):
+    with initialize_repo(SPEC_PATH).initialize() as r:
+        expected = object_ids(r)
+    for _ in range(2):
+        with initialize_repo(SPEC_PATH, cache_dir=str(tmp_path)).initialize() as r:
+            assert object_ids(r) == expected
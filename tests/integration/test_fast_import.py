@@ -0,0 +1,43 @@
+import pytest
+from git import GitCommandError, Repo
+from repo_smith.initialize_repo import initialize_repo
+
+SPEC_PATH = "tests/specs/fast_import/fast_import.yml"
+
+
+def describe(repo: Repo):
+    refs = {
+        ref.path: (ref.commit.tree.hexsha, ref.commit.message) for ref in repo.refs
+    }
+    return (
+        repo.active_branch.name,
+        refs,
+        [c.message for c in repo.iter_commits("feature")],
+        repo.tags["v1"].tag.message if repo.tags["v1"].tag is not None else None,
+        repo.git.status("--porcelain"),
+    )
+
+
+def test_fast_import_matches_step_execution():
+    with initialize_repo(SPEC_PATH).initialize() as r:
+        expected = describe(r)
+
+    with initialize_repo(SPEC_PATH, fast_import=True).initialize() as r:
+        assert describe(r) == expected
+
+
+def test_fast_import_basic_spec():
+    repo_initializer = initialize_repo("tests/specs/basic_spec.yml", fast_import=True)
+    with repo_initializer.initialize() as r:
+        assert r.commit("start-tag").message == "Initial commit\n"
+        assert r.active_branch.name == "main"
+        assert not r.is_dirty(untracked_files=True)
+
+
+def test_fast_import_raises_git_errors():
+    repo_initializer = initialize_repo(
+        "tests/specs/ref_batch/conflicting_branches.yml", fast_import=True
+    )
+    with pytest.raises(GitCommandError, match="refs/heads/feature' exists"):
+        with repo_initializer.initialize():
+            pass
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+from git import Repo
+from repo_smith.initialize_repo import initialize_repo
+from repo_smith.tracing import Trace
+
+SPEC_PATH = "tests/specs/file_batch/file_batch.yml"
+
+
+def describe(repo: Repo):
+    files = {}
+    for root, dirs, names in os.walk(repo.working_dir):
+        dirs[:] = [d for d in dirs if d != ".git"]
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path) as file:
+                files[os.path.relpath(path, repo.working_dir)] = file.read()
+    return (
+        [(c.message, c.tree.hexsha) for c in repo.iter_commits()],
+        repo.git.ls_files("-s"),
+        repo.git.status("--porcelain"),
+        files,
+    )
+
+
+def execute_one_by_one(spec_path: str):
+    with tempfile.TemporaryDirectory() as dir:
+        repo = Repo.init(dir, initial_branch="main")
+        for step in initialize_repo(spec_path).spec.steps:
+            step.execute(repo=repo)
+        described = describe(repo)
+        repo.git.clear_cache()
+        return described
+
+
+@pytest.mark.parametrize("options", [{}, {"fast_import": True}])
+def test_file_batch_matches_step_execution(options):
+    expected = execute_one_by_one(SPEC_PATH)
+    with initialize_repo(SPEC_PATH, **options).initialize() as r:
+        assert describe(r) == expected
+
+
+def test_file_batch_matches_step_execution_async():
+    expected = execute_one_by_one(SPEC_PATH)
+
+    async def build():
+        async with initialize_repo(SPEC_PATH).initialize_async() as r:
+            return describe(r)
+
+    assert asyncio.run(build()) == expected
+
+
+def test_file_batch_flushes_runs_of_file_steps():
+    trace = Trace()
+    with initialize_repo(SPEC_PATH).initialize(trace=trace):
+        pass
+
+    # Once for each run of file and add steps before a commit, and once for the
+    # file steps left at the end
+    assert [s.name for s in trace.spans].count("file batch") == 3
+
+
+def test_file_batch_raises_step_errors():
+    with pytest.raises(ValueError, match="Invalid filename for editing"):
+        with initialize_repo(
+            "tests/specs/file_batch/edit_missing_file.yml"
+        ).initialize():
+            pass
+
+
+def test_file_batch_stages_files_with_few_processes():
+    trace = Trace()
+    with initialize_repo("tests/specs/file_batch/many_files.yml").initialize(
+        trace=trace
+    ) as r:
+        assert len(r.git.ls_files().splitlines()) == 50
+
+    (flush,) = [s for s in trace.spans if s.name == "file batch"]
+    # git-hash-object and git-update-index, however many files are staged
+    assert flush.child_processes <= 2
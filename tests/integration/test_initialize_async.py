@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from git import Repo
+from repo_smith.initialize_repo import initialize_repo
+
+SPEC_PATHS = [
+    "tests/specs/basic_spec.yml",
+    "tests/specs/fast_import/fast_import.yml",
+    "tests/specs/merge_step/merge_step_no_fast_forward.yml",
+    "tests/specs/merge_step/merge_step_squash.yml",
+    "tests/specs/checkout_step/checkout_step_with_start_point.yml",
+    "tests/specs/reset_step/reset_step_files.yml",
+    "tests/specs/reset_step/reset_step_soft.yml",
+]
+
+
+def describe(repo: Repo):
+    return (
+        repo.head.is_detached or repo.active_branch.name,
+        {ref.path: ref.commit.tree.hexsha for ref in repo.refs},
+        [c.message.strip() for c in repo.iter_commits()],
+        repo.git.status("--porcelain"),
+    )
+
+
+@pytest.mark.parametrize("spec_path", SPEC_PATHS)
+def test_initialize_async_matches_initialize(spec_path):
+    with initialize_repo(spec_path).initialize() as r:
+        expected = describe(r)
+
+    async def build():
+        async with initialize_repo(spec_path).initialize_async() as r:
+            return describe(r)
+
+    assert asyncio.run(build()) == expected
+
+
+def test_initialize_async_concurrently():
+    async def build():
+        async with initialize_repo("tests/specs/basic_spec.yml").initialize_async() as r:
+            return r.commit("start-tag").message
+
+    async def build_all():
+        return await asyncio.gather(*(build() for _ in range(5)))
+
+    assert asyncio.run(build_all()) == ["Initial commit\n"] * 5
+
+
+def test_initialize_async_coroutine_hooks():
+    calls = []
+
+    async def pre_hook(r: Repo):
+        await asyncio.sleep(0)
+        calls.append(("pre", r.head.is_valid()))
+
+    def post_hook(r: Repo):
+        calls.append(("post", r.head.is_valid()))
+
+    repo_initializer = initialize_repo("tests/specs/basic_spec.yml")
+    repo_initializer.add_pre_hook("initial-commit", pre_hook)
+    repo_initializer.add_post_hook("initial-commit", post_hook)
+
+    async def build():
+        async with repo_initializer.initialize_async():
+            pass
+
+    asyncio.run(build())
+    assert calls == [("pre", False), ("post", True)]
+
+
+def test_initialize_coroutine_hook_rejected():
+    async def pre_hook(_: Repo):
+        pass
+
+    repo_initializer = initialize_repo("tests/specs/basic_spec.yml")
+    repo_initializer.add_pre_hook("initial-commit", pre_hook)
+    with pytest.raises(ValueError, match="only supported by initialize_async()"):
+        with repo_initializer.initialize():
+            pass
+
+
+def test_initialize_async_step_failure():
+    repo_initializer = initialize_repo(
+        "tests/specs/checkout_step/checkout_step_missing_branch.yml"
+    )
+
+    async def build():
+        async with repo_initializer.initialize_async():
+            pass
+
+    with pytest.raises(ValueError, match="Invalid branch name"):
+        asyncio.run(build())
@@ -0,0 +1,54 @@
+import os
+import tempfile
+
+import pytest
+from repo_smith.initialize_repo import initialize_many
+
+
+@pytest.fixture
+def temp_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+def test_initialize_many_with_count(temp_root):
+    dirs = set()
+    for managed in initialize_many("tests/specs/basic_spec.yml", count=3):
+        with managed as r:
+            assert r.commit("start-tag") is not None
+            dirs.add(r.working_dir)
+    assert len(dirs) == 3
+    assert os.listdir(temp_root) == []
+
+
+def test_initialize_many_with_spec_paths(temp_root):
+    branches = []
+    for managed in initialize_many(
+        ["tests/specs/basic_spec.yml", "tests/specs/branch_step/branch_step.yml"],
+        max_workers=2,
+    ):
+        with managed as r:
+            branches.append(len(r.branches))
+    assert sorted(branches) == [1, 2]
+    assert os.listdir(temp_root) == []
+
+
+def test_initialize_many_missing_spec_path():
+    with pytest.raises(ValueError, match="Invalid spec_path provided, not found."):
+        next(initialize_many("tests/specs/invalid_spec_path_does_not_exist.yml"))
+
+
+def test_initialize_many_stopped_early(temp_root):
+    repos = initialize_many("tests/specs/basic_spec.yml", count=4, max_workers=2)
+    with next(repos) as r:
+        assert r.commit("start-tag") is not None
+    repos.close()
+    assert os.listdir(temp_root) == []
+
+
+def test_initialize_many_invalid_spec(temp_root):
+    with pytest.raises(ValueError, match="Incomplete spec file."):
+        for managed in initialize_many("tests/specs/incomplete_spec_file.yml"):
+            with managed:
+                pass
+    assert os.listdir(temp_root) == []
@@ -1,5 +1,9 @@
+import os
+from unittest.mock import patch
+
 import pytest
 from git import Repo
+from repo_smith.teardown import TRASH_DIR_NAME, background_remover
 from src.repo_smith.initialize_repo import initialize_repo
 
 # TODO: Test to make sure that the YAML parsing is accurate so we avoid individual
@@ -70,3 +74,77 @@ def test_initialize_repo_basic_spec():
 
 def test_initialize_repo_hooks():
     initialize_repo("tests/specs/hooks.yml")
+
+
+def test_initialize_repo_spec_cache(tmp_path):
+    spec_cache_dir = str(tmp_path / "spec-cache")
+    first = initialize_repo("tests/specs/basic_spec.yml", spec_cache_dir=spec_cache_dir)
+
+    with patch("repo_smith.steps.dispatcher.Dispatcher.dispatch") as mock_dispatch:
+        second = initialize_repo(
+            "tests/specs/basic_spec.yml", spec_cache_dir=spec_cache_dir
+        )
+        mock_dispatch.assert_not_called()
+
+    assert second.spec == first.spec
+    second.add_pre_hook("initial-commit", lambda _: None)
+    with second.initialize() as r:
+        assert r.commit("start-tag") is not None
+
+
+def test_initialize_repo_background_teardown():
+    ir = initialize_repo("tests/specs/basic_spec.yml", background_teardown=True)
+    with ir.initialize() as r:
+        dir = r.working_dir
+    assert not os.path.exists(dir)
+
+    background_remover().flush()
+    # Other processes running tests may share the trash directory, which is
+    # otherwise removed once empty
+    trash_dir = os.path.join(os.path.dirname(dir), TRASH_DIR_NAME)
+    trash = os.listdir(trash_dir) if os.path.exists(trash_dir) else []
+    assert not any(entry.startswith(f"{os.getpid()}-") for entry in trash)
+
+
+def test_initialize_repo_recycle_dirs():
+    ir = initialize_repo("tests/specs/basic_spec.yml", recycle_dirs=True)
+    with ir.initialize() as r:
+        dir = r.working_dir
+        expected = r.commit("start-tag").tree.hexsha
+    # The directory is back in the pool, holding a fresh repository
+    assert os.listdir(dir) == [".git"]
+
+    with ir.initialize() as r:
+        assert r.working_dir == dir
+        assert r.commit("start-tag").tree.hexsha == expected
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_initialize_repo_failed_build_removes_dir(monkeypatch, use_async):
+    import asyncio
+    import tempfile
+
+    created = []
+    mkdtemp = tempfile.mkdtemp
+
+    def recording_mkdtemp(*args, **kwargs):
+        created.append(mkdtemp(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(tempfile, "mkdtemp", recording_mkdtemp)
+    ir = initialize_repo(
+        "tests/specs/branch_delete_step/branch_delete_step_branch_does_not_exist.yml"
+    )
+
+    async def build():
+        async with ir.initialize_async():
+            pass
+
+    with pytest.raises(ValueError):
+        if use_async:
+            asyncio.run(build())
+        else:
+            with ir.initialize():
+                pass
+    assert len(created) == 1
+    assert not os.path.exists(created[0])
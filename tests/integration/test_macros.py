@@ -0,0 +1,49 @@
+import pytest
+from repo_smith.initialize_repo import initialize_repo
+
+SPEC_PATH = "tests/specs/macros/repeat.yml"
+
+
+def test_macros_expand_into_steps():
+    ir = initialize_repo(SPEC_PATH)
+    assert len(ir.spec.steps) == 3 + 20 * 3 + 4 * 2
+    with ir.initialize() as r:
+        messages = [c.message.strip() for c in r.iter_commits()][::-1]
+        assert messages == ["Initial commit"] + [f"Edit {i}" for i in range(20)]
+        with open(f"{r.working_dir}/file.txt") as file:
+            assert file.read() == "Edit 19\n"
+        assert sorted(head.name for head in r.heads) == [
+            "bugfix-1",
+            "bugfix-2",
+            "feature-1",
+            "feature-2",
+            "main",
+        ]
+
+
+def test_macros_hooks_on_expanded_ids():
+    ir = initialize_repo(SPEC_PATH)
+    seen = []
+    ir.add_post_hook("edit-7", lambda r: seen.append(r.head.commit.message.strip()))
+    with ir.initialize():
+        pass
+    assert seen == ["Edit 7"]
+
+
+def test_macros_resume_from_cached_prefix(tmp_path):
+    cache_dir = str(tmp_path)
+    with initialize_repo(SPEC_PATH, cache_dir=cache_dir, checkpoints=True).initialize():
+        pass
+
+    ir = initialize_repo(SPEC_PATH, cache_dir=cache_dir, checkpoints=True)
+    ir.add_pre_hook("edit-15", lambda _: None)
+    with ir.initialize() as r:
+        assert len(list(r.iter_commits())) == 21
+
+
+def test_macros_duplicate_ids():
+    with pytest.raises(
+        ValueError,
+        match="ID edit is duplicated from a previous step. All IDs should be unique.",
+    ):
+        initialize_repo("tests/specs/macros/duplicate_ids.yml")
@@ -0,0 +1,47 @@
+import asyncio
+
+from git import Repo
+from repo_smith.initialize_repo import RepoInitializer
+from repo_smith.repo_smith import create_repo_smith
+
+
+def make_spec(url):
+    return {
+        "initialization": {
+            "clone-from": url,
+            "steps": [{"type": "commit", "empty": True, "message": "Empty commit"}],
+        }
+    }
+
+
+def test_mirror_cache_clone_from(tmp_path):
+    origin = Repo.init(tmp_path / "origin", initial_branch="main")
+    origin.index.commit("Initial commit")
+    url = (tmp_path / "origin").as_uri()
+    mirror_dir = str(tmp_path / "mirrors")
+
+    ir = RepoInitializer(make_spec(url), mirror_dir=mirror_dir)
+    with ir.initialize() as r:
+        assert [c.message.strip() for c in r.iter_commits()] == [
+            "Empty commit",
+            "Initial commit",
+        ]
+        assert r.remotes.origin.url == url
+
+    async def build():
+        async with ir.initialize_async() as r:
+            return [c.message.strip() for c in r.iter_commits()], r.remotes.origin.url
+
+    assert asyncio.run(build()) == (["Empty commit", "Initial commit"], url)
+
+
+def test_mirror_cache_create_repo_smith(tmp_path):
+    origin = Repo.init(tmp_path / "origin", initial_branch="main")
+    origin.index.commit("Initial commit")
+    url = (tmp_path / "origin").as_uri()
+
+    with create_repo_smith(
+        False, clone_from=url, mirror_dir=str(tmp_path / "mirrors")
+    ) as rs:
+        assert rs.repo.head.commit == origin.head.commit
+        assert rs.repo.remotes.origin.url == url
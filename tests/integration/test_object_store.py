@@ -0,0 +1,75 @@
+import os
+
+from repo_smith.initialize_repo import initialize_repo
+from repo_smith.repo_smith import create_repo_smith
+
+SPEC_PATH = "tests/specs/deterministic/deterministic.yml"
+
+
+def own_objects(git_dir: str):
+    objects_dir = os.path.join(git_dir, "objects")
+    return [
+        os.path.join(root, name)
+        for root, _, names in os.walk(objects_dir)
+        for name in names
+        if os.path.basename(root) != "info"
+    ]
+
+
+def count_files(dir: str) -> int:
+    return sum(len(names) for _, _, names in os.walk(dir))
+
+
+def test_initialize_shares_objects(tmp_path):
+    store_dir = str(tmp_path / "store")
+    repo_initializer = initialize_repo(SPEC_PATH, object_store=store_dir)
+    with repo_initializer.initialize() as first:
+        assert own_objects(first.git_dir) == []
+        store_files = count_files(store_dir)
+        assert store_files > 0
+
+        with repo_initializer.initialize() as second:
+            # Deterministic builds produce the same objects, so nothing is added
+            assert own_objects(second.git_dir) == []
+            assert count_files(store_dir) == store_files
+            assert second.head.commit.hexsha == first.head.commit.hexsha
+            second.git.fsck("--strict")
+
+    # Removing the repositories leaves the store in place
+    assert count_files(store_dir) == store_files
+
+
+def test_initialize_shares_objects_with_fast_import(tmp_path):
+    store_dir = str(tmp_path / "store")
+    with initialize_repo(SPEC_PATH).initialize() as expected:
+        expected_sha = expected.head.commit.hexsha
+
+    repo_initializer = initialize_repo(
+        SPEC_PATH, object_store=store_dir, fast_import=True
+    )
+    with repo_initializer.initialize() as repo:
+        assert own_objects(repo.git_dir) == []
+        assert repo.head.commit.hexsha == expected_sha
+        assert repo.git.status("--porcelain") == ""
+
+
+def test_initialize_with_object_store_writes_new_objects_locally(tmp_path):
+    store_dir = str(tmp_path / "store")
+    with initialize_repo(SPEC_PATH, object_store=store_dir).initialize() as repo:
+        store_files = count_files(store_dir)
+        with open(os.path.join(repo.working_dir, "new.txt"), "w") as file:
+            file.write("new")
+        repo.index.add(["new.txt"])
+        repo.index.commit("New commit")
+
+        assert own_objects(repo.git_dir) != []
+        assert count_files(store_dir) == store_files
+
+
+def test_create_repo_smith_attaches_object_store(tmp_path):
+    store_dir = str(tmp_path / "store")
+    with create_repo_smith(False, object_store=store_dir) as rs:
+        with open(
+            os.path.join(rs.repo.git_dir, "objects", "info", "alternates")
+        ) as file:
+            assert file.read().splitlines() == [os.path.abspath(store_dir)]
@@ -0,0 +1,56 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from git import Repo
+from repo_smith.pytest_plugin import RepoSmithSpec, SpecBuilds
+
+SPEC_PATH = "tests/specs/basic_spec.yml"
+
+
+def test_repo_smith_spec_gives_private_copies(repo_smith_spec: RepoSmithSpec):
+    first = repo_smith_spec(SPEC_PATH)
+    second = repo_smith_spec(SPEC_PATH)
+
+    assert first.working_dir != second.working_dir
+    assert first.head.commit.hexsha == second.head.commit.hexsha
+
+    (Path(first.working_dir) / "new.txt").write_text("new")
+    first.index.add(["new.txt"])
+    first.index.commit("Only in the first copy")
+    assert first.head.commit.hexsha != second.head.commit.hexsha
+    assert not (Path(second.working_dir) / "new.txt").exists()
+    assert second.git.status("--porcelain") == ""
+
+
+def test_repo_smith_spec_builds_once(
+    repo_smith_spec: RepoSmithSpec, repo_smith_spec_builds: SpecBuilds
+):
+    built = repo_smith_spec_builds.get(SPEC_PATH, {})
+    assert repo_smith_spec_builds.get(SPEC_PATH, {}) == built
+    assert repo_smith_spec_builds.get(SPEC_PATH, {"fast_import": True}) != built
+
+    repo = repo_smith_spec(SPEC_PATH)
+    objects_dir = os.path.join(repo.git_dir, "objects")
+    object_files = [
+        os.path.join(root, name)
+        for root, _, names in os.walk(objects_dir)
+        for name in names
+        if len(os.path.basename(root)) == 2
+    ]
+    assert object_files
+    # Object files are shared with the session's build
+    assert all(os.stat(path).st_nlink > 1 for path in object_files)
+
+
+def build_spec(root: str) -> str:
+    return str(SpecBuilds(Path(root)).get(SPEC_PATH, {}))
+
+
+def test_spec_builds_across_processes(tmp_path: Path):
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        built = set(executor.map(build_spec, [str(tmp_path)] * 8))
+
+    assert len(built) == 1
+    assert Repo(built.pop()).head.is_valid()
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".staging-")]
@@ -0,0 +1,63 @@
+import asyncio
+import tempfile
+
+import pytest
+from git import GitCommandError, Repo
+from repo_smith.initialize_repo import initialize_repo
+from repo_smith.tracing import Trace
+
+SPEC_PATH = "tests/specs/ref_batch/ref_batch.yml"
+
+
+def describe(repo: Repo):
+    return (
+        repo.git.for_each_ref("--format=%(refname) %(objecttype) %(*objecttype)"),
+        repo.git.symbolic_ref("HEAD"),
+        [c.message for c in repo.iter_commits()],
+    )
+
+
+def execute_one_by_one(spec_path: str):
+    with tempfile.TemporaryDirectory() as dir:
+        repo = Repo.init(dir, initial_branch="main")
+        for step in initialize_repo(spec_path).spec.steps:
+            step.execute(repo=repo)
+        described = describe(repo)
+        repo.git.clear_cache()
+        return described
+
+
+@pytest.mark.parametrize("options", [{}, {"fast_import": True}, {"tree_writer": True}])
+def test_ref_batch_matches_step_execution(options):
+    expected = execute_one_by_one(SPEC_PATH)
+    with initialize_repo(SPEC_PATH, **options).initialize() as r:
+        assert describe(r) == expected
+
+
+def test_ref_batch_matches_step_execution_async():
+    expected = execute_one_by_one(SPEC_PATH)
+
+    async def build():
+        async with initialize_repo(SPEC_PATH).initialize_async() as r:
+            return describe(r)
+
+    assert asyncio.run(build()) == expected
+
+
+def test_ref_batch_flushes_runs_of_ref_steps():
+    trace = Trace()
+    with initialize_repo(SPEC_PATH).initialize(trace=trace) as r:
+        assert r.active_branch.name == "other"
+
+    # Once before each commit and the annotated tag, once before each step that
+    # touches a ref already in the batch, which then starts the next batch, and
+    # once for the steps left at the end
+    assert [s.name for s in trace.spans].count("ref batch") == 5
+
+
+def test_ref_batch_raises_step_errors():
+    with pytest.raises(GitCommandError):
+        with initialize_repo(
+            "tests/specs/ref_batch/conflicting_branches.yml"
+        ).initialize():
+            pass
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from git import Repo
+from repo_smith.initialize_repo import initialize_repo
+from repo_smith.ref_index import ref_index_for
+
+SPEC_PATH = "tests/specs/ref_index/ref_index.yml"
+
+
+def create_branch(repo: Repo):
+    repo.git.branch("from-hook")
+
+
+def test_ref_index_follows_bash_steps_and_hooks():
+    repo_initializer = initialize_repo(SPEC_PATH)
+    repo_initializer.add_post_hook("hooked", create_branch)
+    with repo_initializer.initialize() as r:
+        assert r.active_branch.name == "from-hook"
+        assert sorted(head.name for head in r.heads) == [
+            "from-bash",
+            "from-hook",
+            "main",
+        ]
+        # Only tracked while the repository is built
+        assert ref_index_for(r) is None
+
+
+def test_ref_index_follows_bash_steps_and_hooks_async():
+    repo_initializer = initialize_repo(SPEC_PATH)
+    repo_initializer.add_post_hook("hooked", create_branch)
+
+    async def build():
+        async with repo_initializer.initialize_async() as r:
+            return r.active_branch.name, ref_index_for(r)
+
+    assert asyncio.run(build()) == ("from-hook", None)
+
+
+def test_ref_index_raises_step_errors():
+    repo_initializer = initialize_repo(SPEC_PATH)
+    with pytest.raises(ValueError, match="Invalid branch name"):
+        with repo_initializer.initialize():
+            pass
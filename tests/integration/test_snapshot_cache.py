@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from git import Repo
+from repo_smith.initialize_repo import initialize_repo
+from repo_smith.materialize import CopyStrategy, copy_repo
+
+
+def test_snapshot_cache_reuses_first_build(tmp_path):
+    cache_dir = tmp_path / "cache"
+    repo_initializer = initialize_repo(
+        "tests/specs/basic_spec.yml", cache_dir=str(cache_dir)
+    )
+    with repo_initializer.initialize() as r:
+        first_sha = r.commit("start-tag").hexsha
+
+    assert len(os.listdir(cache_dir)) == 1
+
+    with repo_initializer.initialize() as r:
+        assert r.commit("start-tag").hexsha == first_sha
+        assert r.active_branch.name == "main"
+
+
+def test_snapshot_cache_skipped_with_hooks(tmp_path):
+    cache_dir = tmp_path / "cache"
+    calls = []
+
+    def post_hook(_: Repo):
+        calls.append(True)
+
+    repo_initializer = initialize_repo(
+        "tests/specs/basic_spec.yml", cache_dir=str(cache_dir)
+    )
+    repo_initializer.add_post_hook("initial-commit", post_hook)
+    with repo_initializer.initialize():
+        pass
+    with repo_initializer.initialize():
+        pass
+
+    assert len(calls) == 2
+    assert os.listdir(cache_dir) == []
+
+
+@pytest.mark.parametrize(
+    "spec_path, id, options",
+    [
+        ("tests/specs/snapshot_cache/last_step_hook.yml", "start-tag", {}),
+        ("tests/specs/basic_spec.yml", "initial-commit", {"checkpoints": True}),
+    ],
+)
+def test_snapshot_cache_runs_post_hooks_after_restoring(
+    tmp_path, spec_path, id, options
+):
+    calls = []
+
+    def post_hook(_: Repo):
+        calls.append(True)
+
+    repo_initializer = initialize_repo(
+        spec_path, cache_dir=str(tmp_path / "cache"), **options
+    )
+    repo_initializer.add_post_hook(id, post_hook)
+    for _ in range(2):
+        with repo_initializer.initialize() as r:
+            assert r.commit("start-tag") is not None
+
+    assert len(calls) == 2
+
+
+def test_snapshot_cache_checkpoints_require_cache_dir():
+    with pytest.raises(ValueError, match="Checkpoints require a cache_dir"):
+        initialize_repo("tests/specs/basic_spec.yml", checkpoints=True)
+
+
+def test_snapshot_cache_checkpoints_resume_shared_prefix(tmp_path, monkeypatch):
+    build_log = tmp_path / "build.log"
+    monkeypatch.setenv("REPO_SMITH_BUILD_LOG", str(build_log))
+    cache_dir = str(tmp_path / "cache")
+
+    base = initialize_repo(
+        "tests/specs/checkpoints/checkpoints_base.yml",
+        cache_dir=cache_dir,
+        checkpoints=True,
+    )
+    with base.initialize() as r:
+        assert r.tags[0].name == "v0"
+    assert len(os.listdir(cache_dir)) == 5
+
+    diverged = initialize_repo(
+        "tests/specs/checkpoints/checkpoints_diverged.yml",
+        cache_dir=cache_dir,
+        checkpoints=True,
+    )
+    with diverged.initialize() as r:
+        assert r.active_branch.name == "feature"
+        assert os.path.isfile(os.path.join(r.working_dir, "filea.txt"))
+        assert len(r.tags) == 0
+
+    # The bash step is part of the shared prefix, so it only ran once
+    assert build_log.read_text().splitlines() == ["built"]
+    assert len(os.listdir(cache_dir)) == 6
+
+
+def test_snapshot_cache_restore_shares_objects(tmp_path):
+    cache_dir = tmp_path / "cache"
+    repo_initializer = initialize_repo(
+        "tests/specs/basic_spec.yml", cache_dir=str(cache_dir)
+    )
+    with repo_initializer.initialize() as r:
+        pass
+
+    (snapshot,) = os.listdir(cache_dir)
+    # Reflinked files are independent, so only hardlinks can be observed
+    probe = copy_repo(cache_dir / snapshot, tmp_path / "probe")
+    with repo_initializer.initialize() as r:
+        sha = r.head.commit.hexsha
+        object_path = os.path.join(".git", "objects", sha[:2], sha[2:])
+        if probe.strategy == CopyStrategy.HARDLINK:
+            assert os.path.samefile(
+                os.path.join(r.working_dir, object_path),
+                cache_dir / snapshot / object_path,
+            )
+        r.git.fsck("--strict")
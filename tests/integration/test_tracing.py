@@ -0,0 +1,81 @@
+import asyncio
+import json
+import os
+
+from repo_smith.initialize_repo import initialize_repo
+from repo_smith.steps.step_type import StepType
+from repo_smith.tracing import Trace
+
+
+def test_initialize_records_spans():
+    repo_initializer = initialize_repo("tests/specs/hooks.yml")
+    repo_initializer.add_post_hook("first-commit", lambda _: None)
+    trace = Trace()
+    with repo_initializer.initialize(trace=trace):
+        pass
+
+    spans = trace.spans
+    categories = [span.category for span in spans]
+    assert categories.count("step") == len(repo_initializer.spec.steps)
+    assert "setup" in categories
+    assert "teardown" in categories
+    assert "hook" in categories
+
+    steps = [span for span in spans if span.category == "step"]
+    assert steps[0].name == "First commit"
+    assert steps[0].step_id == "first-commit"
+    assert steps[0].step_type == StepType.COMMIT
+    assert steps[0].child_processes >= 1
+    assert steps[1].step_type == StepType.NEW_FILE
+    assert steps[1].child_processes == 0
+    for span in spans:
+        assert span.wall_time >= 0
+        assert span.cpu_time >= 0
+
+
+def test_initialize_without_trace():
+    with initialize_repo("tests/specs/basic_spec.yml").initialize() as repo:
+        assert repo is not None
+
+
+def test_fast_import_flush_is_traced():
+    trace = Trace()
+    repo_initializer = initialize_repo(
+        "tests/specs/fast_import/fast_import.yml", fast_import=True
+    )
+    with repo_initializer.initialize(trace=trace):
+        pass
+
+    assert "backend" in [span.category for span in trace.spans]
+
+
+def test_initialize_async_records_spans():
+    trace = Trace()
+
+    async def build():
+        repo_initializer = initialize_repo("tests/specs/basic_spec.yml")
+        async with repo_initializer.initialize_async(trace=trace):
+            return len(repo_initializer.spec.steps)
+
+    step_count = asyncio.run(build())
+    assert [span.category for span in trace.spans].count("step") == step_count
+
+
+def test_export_chrome_trace(tmp_path):
+    trace = Trace()
+    with initialize_repo("tests/specs/basic_spec.yml").initialize(trace=trace):
+        pass
+
+    path = os.path.join(tmp_path, "trace.json")
+    trace.export(path)
+    with open(path) as trace_file:
+        events = json.load(trace_file)["traceEvents"]
+
+    assert len(events) == len(trace.spans)
+    assert all(event["ph"] == "X" for event in events)
+    assert [event["ts"] for event in events] == sorted(
+        event["ts"] for event in events
+    )
+    step_events = [event for event in events if event["cat"] == "step"]
+    assert all("type" in event["args"] for event in step_events)
+    assert all("child_processes" in event["args"] for event in events)
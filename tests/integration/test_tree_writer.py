@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from git import Repo
+from repo_smith.initialize_repo import initialize_repo
+from repo_smith.tracing import Trace
+
+SPEC_PATHS = [
+    "tests/specs/basic_spec.yml",
+    "tests/specs/fast_import/fast_import.yml",
+    "tests/specs/file_batch/file_batch.yml",
+]
+DETERMINISTIC_SPEC_PATH = "tests/specs/deterministic/deterministic.yml"
+
+
+def describe(repo: Repo):
+    return (
+        repo.active_branch.name,
+        {ref.path: (ref.commit.tree.hexsha, ref.commit.message) for ref in repo.refs},
+        repo.git.ls_files("-s"),
+        repo.git.status("--porcelain"),
+    )
+
+
+@pytest.mark.parametrize("spec_path", SPEC_PATHS)
+def test_tree_writer_matches_step_execution(spec_path):
+    with initialize_repo(spec_path).initialize() as r:
+        expected = describe(r)
+
+    with initialize_repo(spec_path, tree_writer=True).initialize() as r:
+        assert describe(r) == expected
+        r.git.fsck("--strict")
+
+
+def test_tree_writer_deterministic_builds_match():
+    with initialize_repo(DETERMINISTIC_SPEC_PATH).initialize() as r:
+        expected = r.head.commit.hexsha
+
+    with initialize_repo(DETERMINISTIC_SPEC_PATH, tree_writer=True).initialize() as r:
+        assert r.head.commit.hexsha == expected
+
+
+def test_tree_writer_async():
+    spec_path = "tests/specs/file_batch/file_batch.yml"
+    with initialize_repo(spec_path).initialize() as r:
+        expected = describe(r)
+
+    async def build():
+        async with initialize_repo(spec_path, tree_writer=True).initialize_async() as r:
+            return describe(r)
+
+    assert asyncio.run(build()) == expected
+
+
+def test_tree_writer_writes_index_once():
+    trace = Trace()
+    spec_path = "tests/specs/file_batch/file_batch.yml"
+    with initialize_repo(spec_path, tree_writer=True).initialize(trace=trace):
+        pass
+
+    # The adds and commits of the spec are never interrupted by another step
+    assert [s.name for s in trace.spans].count("tree writer") == 1
+
+
+def test_tree_writer_cannot_be_combined_with_fast_import():
+    with pytest.raises(ValueError, match="cannot be used together"):
+        initialize_repo(
+            "tests/specs/basic_spec.yml", fast_import=True, tree_writer=True
+        )
@@ -2,7 +2,9 @@ from subprocess import CompletedProcess
 from unittest.mock import patch, MagicMock
 
 import pytest
+from git import Repo
 from repo_smith.command_result import CommandResult
+from repo_smith.git_session import close_session
 from repo_smith.helpers.git_helper.git_helper import GitHelper
 from repo_smith.helpers.helper import Helper
 
@@ -324,3 +326,25 @@ def test_push_with_refspec_without_repository():
     ):
         gh = GitHelper(repo, False)
         gh.push(refspec="main")
+
+
+def test_rev_parse_and_update_ref(tmp_path):
+    repo = Repo.init(tmp_path, initial_branch="main")
+    repo.git.commit("-m", "Initial commit", "--allow-empty")
+    gh = GitHelper(repo, False)
+    head = gh.rev_parse("HEAD")
+    assert head == repo.head.commit.hexsha
+
+    gh.update_ref("refs/heads/feature", head)
+    assert gh.rev_parse("feature") == head
+
+    gh.update_ref("refs/heads/feature", None, head)
+    assert gh.rev_parse("feature") is None
+    close_session(repo)
+    repo.git.clear_cache()
+
+
+def test_session_without_repo():
+    gh = GitHelper(None, False)
+    with pytest.raises(ValueError, match="Repo is None, cannot access"):
+        gh.rev_parse("HEAD")
@@ -16,6 +16,8 @@ from repo_smith.steps.file_step import (
     EditFileStep,
     NewFileStep,
 )
+from repo_smith.steps.generate_files_step import GenerateFilesStep
+from repo_smith.steps.generate_history_step import GenerateHistoryStep
 from repo_smith.steps.merge_step import MergeStep
 from repo_smith.steps.remote_step import RemoteStep
 from repo_smith.steps.step_type import StepType
@@ -65,6 +67,8 @@ STEP_TYPES_TO_CLASSES = {
     StepType.REMOTE: RemoteStep,
     StepType.MERGE: MergeStep,
     StepType.FETCH: FetchStep,
+    StepType.GENERATE_HISTORY: GenerateHistoryStep,
+    StepType.GENERATE_FILES: GenerateFilesStep,
 }
 
 
@@ -0,0 +1,102 @@
+import pytest
+from repo_smith.steps.generate_files_step import GenerateFilesStep
+
+
+def test_generate_files_step_parse_missing_count():
+    with pytest.raises(
+        ValueError, match='Missing "count" field in generate-files step.'
+    ):
+        GenerateFilesStep.parse("n", "d", "id", {})
+
+
+@pytest.mark.parametrize("count", [-1, "10", True])
+def test_generate_files_step_parse_invalid_count(count):
+    with pytest.raises(
+        ValueError,
+        match='Field "count" in generate-files step must be an integer of at least 0.',
+    ):
+        GenerateFilesStep.parse("n", "d", "id", {"count": count})
+
+
+def test_generate_files_step_parse_max_size_less_than_min_size():
+    with pytest.raises(
+        ValueError,
+        match='Field "max-size" in generate-files step cannot be less than "min-size".',
+    ):
+        GenerateFilesStep.parse(
+            "n", "d", "id", {"count": 1, "min-size": 10, "max-size": 5}
+        )
+
+
+def test_generate_files_step_parse_invalid_size_distribution():
+    with pytest.raises(
+        ValueError,
+        match='Field "size-distribution" in generate-files step must be one of: uniform, log-uniform.',
+    ):
+        GenerateFilesStep.parse(
+            "n", "d", "id", {"count": 1, "size-distribution": "normal"}
+        )
+
+
+@pytest.mark.parametrize("directory", ["..", "../outside", "/tmp"])
+def test_generate_files_step_parse_directory_outside_repository(directory):
+    with pytest.raises(
+        ValueError,
+        match='Field "directory" in generate-files step must be inside the repository.',
+    ):
+        GenerateFilesStep.parse("n", "d", "id", {"count": 1, "directory": directory})
+
+
+def test_generate_files_step_parse_invalid_binary():
+    with pytest.raises(
+        ValueError, match='Field "binary" in generate-files step must be a boolean.'
+    ):
+        GenerateFilesStep.parse("n", "d", "id", {"count": 1, "binary": "yes"})
+
+
+def test_generate_files_step_parse_defaults():
+    step = GenerateFilesStep.parse("n", "d", "id", {"count": 10})
+    assert isinstance(step, GenerateFilesStep)
+    assert step.name == "n"
+    assert step.description == "d"
+    assert step.id == "id"
+    assert step.count == 10
+    assert step.directory == ""
+    assert step.depth == 1
+    assert step.files_per_directory == 100
+    assert step.min_size == 1024
+    assert step.max_size == 1024
+    assert step.size_distribution == "uniform"
+    assert not step.binary
+    assert step.seed == 0
+    assert step.threads is None
+
+
+def test_generate_files_step_parse():
+    step = GenerateFilesStep.parse(
+        "n",
+        "d",
+        "id",
+        {
+            "count": 1000,
+            "directory": "src/./generated",
+            "depth": 3,
+            "files-per-directory": 20,
+            "min-size": 10,
+            "max-size": 100000,
+            "size-distribution": "log-uniform",
+            "binary": True,
+            "seed": 5,
+            "threads": 4,
+        },
+    )
+    assert step.count == 1000
+    assert step.directory == "src/generated"
+    assert step.depth == 3
+    assert step.files_per_directory == 20
+    assert step.min_size == 10
+    assert step.max_size == 100000
+    assert step.size_distribution == "log-uniform"
+    assert step.binary
+    assert step.seed == 5
+    assert step.threads == 4
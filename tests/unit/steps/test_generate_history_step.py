@@ -0,0 +1,85 @@
+import pytest
+from repo_smith.steps.generate_history_step import GenerateHistoryStep
+
+
+def test_generate_history_step_parse_missing_commits():
+    with pytest.raises(
+        ValueError, match='Missing "commits" field in generate-history step.'
+    ):
+        GenerateHistoryStep.parse("n", "d", "id", {})
+
+
+@pytest.mark.parametrize("commits", [0, -1, "10", True])
+def test_generate_history_step_parse_invalid_commits(commits):
+    with pytest.raises(
+        ValueError,
+        match='Field "commits" in generate-history step must be an integer of at least 1.',
+    ):
+        GenerateHistoryStep.parse("n", "d", "id", {"commits": commits})
+
+
+@pytest.mark.parametrize("merge_probability", [-0.1, 1.5, "0.5"])
+def test_generate_history_step_parse_invalid_merge_probability(merge_probability):
+    with pytest.raises(
+        ValueError,
+        match='Field "merge-probability" in generate-history step must be a number between 0 and 1.',
+    ):
+        GenerateHistoryStep.parse(
+            "n", "d", "id", {"commits": 1, "merge-probability": merge_probability}
+        )
+
+
+def test_generate_history_step_parse_invalid_files_per_commit():
+    with pytest.raises(
+        ValueError,
+        match='Field "files-per-commit" in generate-history step must be an integer of at least 0.',
+    ):
+        GenerateHistoryStep.parse(
+            "n", "d", "id", {"commits": 1, "files-per-commit": -1}
+        )
+
+
+def test_generate_history_step_parse_empty_branch_prefix():
+    with pytest.raises(
+        ValueError, match='Empty "branch-prefix" field in generate-history step.'
+    ):
+        GenerateHistoryStep.parse("n", "d", "id", {"commits": 1, "branch-prefix": ""})
+
+
+def test_generate_history_step_parse_defaults():
+    step = GenerateHistoryStep.parse("n", "d", "id", {"commits": 10})
+    assert isinstance(step, GenerateHistoryStep)
+    assert step.name == "n"
+    assert step.description == "d"
+    assert step.id == "id"
+    assert step.commits == 10
+    assert step.branches == 1
+    assert step.merge_probability == 0
+    assert step.files_per_commit == 1
+    assert step.file_count == 100
+    assert step.seed == 0
+    assert step.branch_prefix == "generated"
+
+
+def test_generate_history_step_parse():
+    step = GenerateHistoryStep.parse(
+        "n",
+        "d",
+        "id",
+        {
+            "commits": 1000,
+            "branches": 4,
+            "merge-probability": 0.25,
+            "files-per-commit": 3,
+            "file-count": 50,
+            "seed": 42,
+            "branch-prefix": "topic",
+        },
+    )
+    assert step.commits == 1000
+    assert step.branches == 4
+    assert step.merge_probability == 0.25
+    assert step.files_per_commit == 3
+    assert step.file_count == 50
+    assert step.seed == 42
+    assert step.branch_prefix == "topic"
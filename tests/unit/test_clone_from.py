@@ -0,0 +1,65 @@
+import pytest
+
+from repo_smith.clone_from import CloneFrom
+
+
+def test_clone_from_parse_url():
+    assert CloneFrom.parse(None) is None
+    assert CloneFrom.parse("https://example.com/repo.git") == CloneFrom(
+        repo_url="https://example.com/repo.git"
+    )
+
+
+def test_clone_from_parse_map():
+    clone_from = CloneFrom.parse(
+        {
+            "url": "https://example.com/repo.git",
+            "depth": 1,
+            "filter": "blob:none",
+            "single-branch": True,
+            "no-checkout": True,
+        }
+    )
+    assert clone_from == CloneFrom(
+        repo_url="https://example.com/repo.git",
+        depth=1,
+        filter="blob:none",
+        single_branch=True,
+        no_checkout=True,
+    )
+
+
+def test_clone_from_clone_args():
+    assert CloneFrom(repo_url="url").clone_args() == []
+    assert CloneFrom(
+        repo_url="url",
+        depth=5,
+        filter="tree:0",
+        single_branch=False,
+        no_checkout=True,
+    ).clone_args() == [
+        "--depth=5",
+        "--filter=tree:0",
+        "--no-single-branch",
+        "--no-checkout",
+    ]
+    assert CloneFrom(repo_url="url", single_branch=True).clone_args() == [
+        "--single-branch"
+    ]
+
+
+def test_clone_from_parse_invalid():
+    with pytest.raises(ValueError, match='Invalid "clone-from" field'):
+        CloneFrom.parse(["https://example.com/repo.git"])
+    with pytest.raises(ValueError, match='Missing "url" field in clone-from.'):
+        CloneFrom.parse({"depth": 1})
+    with pytest.raises(ValueError, match='Invalid "depth" field'):
+        CloneFrom.parse({"url": "url", "depth": 0})
+    with pytest.raises(ValueError, match='Invalid "depth" field'):
+        CloneFrom.parse({"url": "url", "depth": True})
+    with pytest.raises(ValueError, match='Empty "filter" field in clone-from.'):
+        CloneFrom.parse({"url": "url", "filter": ""})
+    with pytest.raises(ValueError, match='Invalid "single-branch" field'):
+        CloneFrom.parse({"url": "url", "single-branch": "yes"})
+    with pytest.raises(ValueError, match='Invalid "no-checkout" field'):
+        CloneFrom.parse({"url": "url", "no-checkout": 1})
@@ -0,0 +1,59 @@
+import datetime
+
+import pytest
+
+from repo_smith.deterministic import DEFAULT_START_TIME, Deterministic
+
+
+def test_deterministic_parse_bool():
+    assert Deterministic.parse(None) is None
+    assert Deterministic.parse(False) is None
+    assert Deterministic.parse(True) == Deterministic()
+
+
+def test_deterministic_parse_map():
+    deterministic = Deterministic.parse(
+        {"name": "Jane", "email": "jane@example.com", "start-time": 100, "increment": 5}
+    )
+    assert deterministic == Deterministic(
+        name="Jane", email="jane@example.com", start_time=100, increment=5
+    )
+
+
+def test_deterministic_parse_defaults():
+    deterministic = Deterministic.parse({})
+    assert deterministic == Deterministic()
+    assert deterministic is not None
+    assert deterministic.start_time == DEFAULT_START_TIME
+
+
+def test_deterministic_parse_date_time():
+    deterministic = Deterministic.parse(
+        {"start-time": datetime.datetime(2020, 1, 1, 0, 0, 0)}
+    )
+    assert deterministic is not None
+    assert deterministic.start_time == 1577836800
+
+
+def test_deterministic_parse_invalid():
+    with pytest.raises(ValueError, match='Invalid "deterministic" field'):
+        Deterministic.parse("yes")
+    with pytest.raises(ValueError, match='Empty "name" field in deterministic.'):
+        Deterministic.parse({"name": ""})
+    with pytest.raises(ValueError, match='Empty "email" field in deterministic.'):
+        Deterministic.parse({"email": None})
+    with pytest.raises(ValueError, match='Invalid "start-time" field'):
+        Deterministic.parse({"start-time": "tomorrow"})
+    with pytest.raises(ValueError, match='Invalid "increment" field'):
+        Deterministic.parse({"increment": -1})
+
+
+def test_deterministic_environment():
+    deterministic = Deterministic(
+        name="Jane", email="jane@example.com", start_time=100, increment=10
+    )
+    environment = deterministic.environment(3)
+    assert environment["GIT_AUTHOR_NAME"] == "Jane"
+    assert environment["GIT_COMMITTER_EMAIL"] == "jane@example.com"
+    assert environment["GIT_AUTHOR_DATE"] == "130 +0000"
+    assert environment["GIT_COMMITTER_DATE"] == "130 +0000"
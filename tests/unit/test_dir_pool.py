@@ -0,0 +1,54 @@
+import os
+
+from git import Repo
+from repo_smith.dir_pool import DirPool
+
+
+def test_dir_pool_acquire_initialized_repository():
+    pool = DirPool()
+    dir = pool.acquire()
+    try:
+        assert pool.is_pristine(dir)
+        repo = Repo(dir)
+        assert repo.head.reference.name == "main"
+        assert not repo.head.is_valid()
+    finally:
+        pool.release(dir)
+        pool.close()
+
+
+def test_dir_pool_recycles_scrubbed_directories():
+    pool = DirPool()
+    dir = pool.acquire()
+    repo = Repo(dir)
+    with open(os.path.join(dir, "file.txt"), "w") as file:
+        file.write("contents")
+    repo.index.add(["file.txt"])
+    repo.index.commit("Initial commit")
+    repo.create_tag("v1")
+    pool.claim(dir)
+    assert not pool.is_pristine(dir)
+    repo.close()
+
+    pool.release(dir)
+    try:
+        assert pool.acquire() == dir
+        assert os.listdir(dir) == [".git"]
+        repo = Repo(dir)
+        assert not repo.head.is_valid()
+        assert repo.tags == []
+    finally:
+        pool.release(dir)
+        pool.close()
+
+
+def test_dir_pool_bounded():
+    pool = DirPool(max_size=1)
+    dirs = [pool.acquire(), pool.acquire()]
+    for dir in dirs:
+        pool.release(dir)
+    assert os.path.isdir(dirs[0])
+    assert not os.path.exists(dirs[1])
+
+    pool.close()
+    assert not os.path.exists(dirs[0])
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+from git import GitCommandError, Repo
+from repo_smith.git_session import GitSession, close_session, session_for
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = Repo.init(tmp_path, initial_branch="main")
+    repo.git.commit("-m", "Initial commit", "--allow-empty")
+    yield repo
+    close_session(repo)
+    repo.git.clear_cache()
+
+
+def test_git_session_resolve(repo: Repo):
+    session = GitSession(repo.working_dir)
+    assert session.resolve("HEAD") == repo.head.commit.hexsha
+    assert session.resolve("does-not-exist") is None
+    session.close()
+
+
+def test_git_session_object_info(repo: Repo):
+    session = GitSession(repo.working_dir)
+    info = session.object_info("HEAD^{tree}")
+    assert info == (repo.head.commit.tree.hexsha, "tree", 0)
+    session.close()
+
+
+def test_git_session_read_object(repo: Repo):
+    session = GitSession(repo.working_dir)
+    result = session.read_object("HEAD")
+    assert result is not None
+    sha, object_type, contents = result
+    assert sha == repo.head.commit.hexsha
+    assert object_type == "commit"
+    assert contents.endswith(b"Initial commit\n")
+    # The session keeps working after reading contents
+    assert session.resolve("HEAD") == sha
+    session.close()
+
+
+def test_git_session_update_refs(repo: Repo):
+    session = GitSession(repo.working_dir)
+    head = repo.head.commit.hexsha
+    session.update_refs([f"create refs/heads/a {head}", f"create refs/tags/b {head}"])
+    assert {ref.path for ref in repo.refs} == {
+        "refs/heads/main",
+        "refs/heads/a",
+        "refs/tags/b",
+    }
+    # Refs created by the session are visible to its own lookups
+    assert session.resolve("refs/heads/a") == head
+    session.close()
+
+
+def test_git_session_update_refs_failure_is_atomic(repo: Repo):
+    session = GitSession(repo.working_dir)
+    head = repo.head.commit.hexsha
+    with pytest.raises(GitCommandError):
+        session.update_refs(
+            [f"create refs/heads/new {head}", f"create refs/heads/main {head}"]
+        )
+    assert "new" not in repo.heads
+
+    # The session restarts the process after a failed transaction
+    session.update_refs([f"create refs/heads/new {head}"])
+    assert "new" in repo.heads
+    session.close()
+
+
+def test_session_for_reuses_session(repo: Repo):
+    assert session_for(repo) is session_for(repo)
+
+
+def test_close_session_starts_new_session(repo: Repo):
+    session = session_for(repo)
+    close_session(repo)
+    assert session_for(repo) is not session
+
+
+def test_git_session_hash_files(repo: Repo):
+    for name in ("a.txt", "b.txt"):
+        with open(os.path.join(repo.working_dir, name), "w") as file:
+            file.write(name)
+    session = GitSession(repo.working_dir)
+    shas = session.hash_files(["a.txt", "b.txt"])
+    assert shas == [repo.git.hash_object("a.txt"), repo.git.hash_object("b.txt")]
+    # The blobs are written to the object database
+    assert session.object_info(shas[0]) == (shas[0], "blob", 5)
+
+    with pytest.raises(GitCommandError):
+        session.hash_files(["missing.txt"])
+    session.close()
@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+from typing import Set
+
+import pytest
+
+# The summed -X importtime self-time of the repo_smith modules, about 20ms when
+# measured, so that only heavy work added at import time fails it
+IMPORT_TIME_BUDGET_US = 100_000
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+
+LAZY_MODULES = [
+    "git",
+    "yaml",
+    "asyncio",
+    "concurrent.futures.process",
+    "repo_smith.fast_import",
+    "repo_smith.steps.commit_step",
+    "repo_smith.steps.tag_step",
+    "repo_smith.helpers.github_cli_helper.github_cli_helper",
+    "repo_smith.helpers.github_cli_helper.fields",
+]
+
+
+def imported_modules(module: str) -> Set[str]:
+    """Returns the modules in sys.modules after importing module in a fresh
+    interpreter.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import json, sys, {module}; print(json.dumps(list(sys.modules)))",
+        ],
+        env=dict(os.environ, PYTHONPATH=SRC_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "repo_smith",
+        "repo_smith.initialize_repo",
+        "repo_smith.repo_smith",
+        "repo_smith.pytest_plugin",
+    ],
+)
+def test_import_is_lazy(module: str) -> None:
+    imported = imported_modules(module)
+    assert module in imported
+    for lazy_module in LAZY_MODULES:
+        assert lazy_module not in imported
+
+
+def repo_smith_import_time(module: str) -> int:
+    """Returns the summed -X importtime self-time, in microseconds, of the
+    repo_smith modules imported by module in a fresh interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=dict(os.environ, PYTHONPATH=SRC_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_time, _, name = line.removeprefix("import time:").split("|")
+        if name.strip().split(".")[0] == "repo_smith":
+            total += int(self_time)
+    return total
+
+
+@pytest.mark.parametrize(
+    "module", ["repo_smith.initialize_repo", "repo_smith.repo_smith"]
+)
+def test_import_time_budget(module: str) -> None:
+    fastest = min(repo_smith_import_time(module) for _ in range(3))
+    assert 0 < fastest < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,74 @@
+import errno
+import fcntl
+import os
+
+import pytest
+from git import Repo
+from repo_smith.materialize import CopyStrategy, copy_repo
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = Repo.init(tmp_path / "repo", initial_branch="main")
+    (tmp_path / "repo" / "file.txt").write_text("content")
+    repo.index.add(["file.txt"])
+    repo.index.commit("Initial commit")
+    yield repo
+    repo.git.clear_cache()
+
+
+def head_object(repo_dir: str) -> str:
+    sha = Repo(repo_dir).head.commit.hexsha
+    return os.path.join(repo_dir, ".git", "objects", sha[:2], sha[2:])
+
+
+def test_copy_repo_copies_only_with_copy_strategy(repo: Repo, tmp_path):
+    dest = str(tmp_path / "dest")
+    report = copy_repo(repo.working_dir, dest, strategies=[CopyStrategy.COPY])
+
+    assert report.strategy == CopyStrategy.COPY
+    assert list(report.files) == [CopyStrategy.COPY]
+    assert os.stat(head_object(dest)).st_nlink == 1
+    assert Repo(dest).head.commit.hexsha == repo.head.commit.hexsha
+
+
+def test_copy_repo_shares_objects(repo: Repo, tmp_path):
+    dest = str(tmp_path / "dest")
+    report = copy_repo(repo.working_dir, dest)
+
+    # Reflinks where the file system supports them, hardlinks otherwise
+    assert report.strategy in (CopyStrategy.REFLINK, CopyStrategy.HARDLINK)
+    if report.strategy == CopyStrategy.HARDLINK:
+        assert os.path.samefile(head_object(dest), head_object(repo.working_dir))
+        assert not os.path.samefile(
+            os.path.join(dest, "file.txt"), os.path.join(repo.working_dir, "file.txt")
+        )
+    assert (tmp_path / "dest" / "file.txt").read_text() == "content"
+
+
+def test_copy_repo_replaces_existing_files(repo: Repo, tmp_path):
+    first = str(tmp_path / "first")
+    copy_repo(repo.working_dir, first)
+    second = str(tmp_path / "second")
+    copy_repo(first, second)
+
+    # The existing object files are replaced rather than written through
+    copy_repo(repo.working_dir, second, strategies=[CopyStrategy.COPY])
+    assert not os.path.samefile(head_object(first), head_object(second))
+    assert Repo(first).head.commit.hexsha == repo.head.commit.hexsha
+
+
+def test_copy_repo_stops_trying_unsupported_reflinks(repo: Repo, tmp_path, monkeypatch):
+    calls = []
+
+    def ioctl(*args):
+        calls.append(args)
+        raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+    monkeypatch.setattr(fcntl, "ioctl", ioctl)
+    report = copy_repo(repo.working_dir, str(tmp_path / "dest"))
+
+    assert len(calls) == 1
+    assert CopyStrategy.REFLINK not in report.files
+    assert report.files[CopyStrategy.HARDLINK] > 0
+    assert report.files[CopyStrategy.COPY] > 0
@@ -0,0 +1,63 @@
+import os
+
+from git import Repo
+from repo_smith.mirror_cache import MirrorCache
+
+
+def make_origin(path):
+    origin = Repo.init(path, initial_branch="main")
+    origin.index.commit("Initial commit")
+    return origin
+
+
+def test_mirror_cache_clone(tmp_path):
+    origin = make_origin(tmp_path / "origin")
+    url = (tmp_path / "origin").as_uri()
+    cache = MirrorCache(tmp_path / "mirrors")
+
+    cache.clone(url, str(tmp_path / "clone"))
+    clone = Repo(tmp_path / "clone")
+    assert clone.remotes.origin.url == url
+    assert clone.head.commit == origin.head.commit
+    assert clone.active_branch.name == "main"
+    assert os.path.isdir(cache.path(url))
+
+
+def test_mirror_cache_never_refreshes(tmp_path):
+    origin = make_origin(tmp_path / "origin")
+    url = (tmp_path / "origin").as_uri()
+    cache = MirrorCache(tmp_path / "mirrors", max_age=None)
+    cache.clone(url, str(tmp_path / "first"))
+
+    origin.index.commit("Second commit")
+    cache.clone(url, str(tmp_path / "second"))
+    assert len(list(Repo(tmp_path / "second").iter_commits())) == 1
+
+
+def test_mirror_cache_refreshes_stale_mirror(tmp_path):
+    origin = make_origin(tmp_path / "origin")
+    url = (tmp_path / "origin").as_uri()
+    cache = MirrorCache(tmp_path / "mirrors", max_age=0)
+    cache.clone(url, str(tmp_path / "first"))
+
+    origin.index.commit("Second commit")
+    origin.create_head("feature")
+    cache.clone(url, str(tmp_path / "second"))
+    second = Repo(tmp_path / "second")
+    assert second.head.commit == origin.head.commit
+    assert "origin/feature" in [ref.name for ref in second.remotes.origin.refs]
+
+
+def test_mirror_cache_allows_filters_on_existing_mirror(tmp_path):
+    make_origin(tmp_path / "origin")
+    url = (tmp_path / "origin").as_uri()
+    MirrorCache(tmp_path / "mirrors").mirror(url)
+    # Such as a mirror created by a version that did not allow filters
+    mirror = Repo(MirrorCache(tmp_path / "mirrors").path(url))
+    mirror.git.config("--unset", "uploadpack.allowFilter")
+
+    cache = MirrorCache(tmp_path / "mirrors", max_age=None)
+    cache.clone(url, str(tmp_path / "clone"), ["--filter=blob:none"])
+    assert mirror.git.config("uploadpack.allowFilter") == "true"
+    clone = Repo(tmp_path / "clone")
+    assert clone.git.config("remote.origin.promisor") == "true"
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+from git import Repo
+from repo_smith.object_store import ObjectStore
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = Repo.init(tmp_path / "repo", initial_branch="main")
+    (tmp_path / "repo" / "file.txt").write_text("content")
+    repo.index.add(["file.txt"])
+    repo.index.commit("Initial commit")
+    yield repo
+    repo.git.clear_cache()
+
+
+def loose_objects(git_dir: str):
+    objects_dir = os.path.join(git_dir, "objects")
+    return [
+        name
+        for name in os.listdir(objects_dir)
+        if len(name) == 2 and os.listdir(os.path.join(objects_dir, name))
+    ]
+
+
+def alternates(git_dir: str):
+    with open(os.path.join(git_dir, "objects", "info", "alternates")) as file:
+        return file.read().splitlines()
+
+
+def test_object_store_attach_keeps_existing_alternates(repo: Repo, tmp_path):
+    store = ObjectStore(tmp_path / "store")
+    alternates_path = os.path.join(repo.git_dir, "objects", "info", "alternates")
+    with open(alternates_path, "w") as file:
+        file.write("/some/other/objects\n")
+
+    store.attach(repo.git_dir)
+    store.attach(repo.git_dir)
+    assert alternates(repo.git_dir) == ["/some/other/objects", store.dir]
+
+
+def test_object_store_absorb_moves_loose_objects(repo: Repo, tmp_path):
+    head = repo.head.commit.hexsha
+    store = ObjectStore(tmp_path / "store")
+    store.absorb(repo.git_dir)
+
+    assert loose_objects(repo.git_dir) == []
+    assert os.path.isfile(os.path.join(store.dir, head[:2], head[2:]))
+    assert alternates(repo.git_dir) == [store.dir]
+    assert repo.git.log("--format=%H") == head
+    repo.git.fsck("--strict")
+
+
+def test_object_store_absorb_moves_packs(repo: Repo, tmp_path):
+    repo.git.repack("-a", "-d")
+    store = ObjectStore(tmp_path / "store")
+    store.absorb(repo.git_dir)
+
+    assert os.listdir(os.path.join(repo.git_dir, "objects", "pack")) == []
+    pack_files = os.listdir(os.path.join(store.dir, "pack"))
+    assert {os.path.splitext(name)[1] for name in pack_files} >= {".pack", ".idx"}
+    assert repo.git.show("HEAD:file.txt") == "content"
+
+
+def test_object_store_absorb_drops_shared_objects(repo: Repo, tmp_path):
+    store = ObjectStore(tmp_path / "store")
+    other = Repo.clone_from(repo.working_dir, tmp_path / "other")
+    repo.git.repack("-a", "-d")
+    store.absorb(repo.git_dir)
+    before = sorted(os.listdir(os.path.join(store.dir, "pack")))
+
+    other.git.repack("-a", "-d")
+    store.absorb(other.git_dir)
+    assert sorted(os.listdir(os.path.join(store.dir, "pack"))) == before
+    assert os.listdir(os.path.join(other.git_dir, "objects", "pack")) == []
+    assert other.git.show("HEAD:file.txt") == "content"
+    other.git.clear_cache()
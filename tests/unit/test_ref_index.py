@@ -0,0 +1,111 @@
+import pytest
+from git import Repo
+from repo_smith.ref_index import (
+    RefIndex,
+    has_branch,
+    has_ref_named,
+    ref_index_for,
+    track_refs,
+    untrack_refs,
+)
+from repo_smith.steps.bash_step import BashStep
+from repo_smith.steps.branch_delete_step import BranchDeleteStep
+from repo_smith.steps.branch_rename_step import BranchRenameStep
+from repo_smith.steps.branch_step import BranchStep
+from repo_smith.steps.commit_step import CommitStep
+from repo_smith.steps.tag_step import TagStep
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = Repo.init(tmp_path, initial_branch="main")
+    yield repo
+    repo.git.clear_cache()
+
+
+def make_index(repo: Repo) -> RefIndex:
+    return RefIndex(repo.working_dir, repo.git_dir)
+
+
+def test_ref_index_load(repo: Repo):
+    repo.git.commit("-m", "Initial commit", "--allow-empty")
+    repo.git.branch("feature")
+    repo.git.tag("v1.0.0")
+    index = make_index(repo)
+    assert index.load() == {"refs/heads/main", "refs/heads/feature", "refs/tags/v1.0.0"}
+    assert "refs/heads/feature" in index
+    assert "refs/heads/missing" not in index
+    assert index.has_name("v1.0.0")
+    assert not index.has_name("missing")
+
+
+def test_ref_index_add_and_discard(repo: Repo):
+    index = make_index(repo)
+    # Refs are only added once the index is listed, which then lists them itself
+    index.add("refs/heads/feature")
+    assert index.load() == set()
+    index.add("refs/remotes/origin/main")
+    assert "refs/remotes/origin/main" in index
+    assert index.has_name("origin/main")
+    index.discard("refs/remotes/origin/main")
+    assert "refs/remotes/origin/main" not in index
+    assert not index.has_name("origin/main")
+
+
+def test_ref_index_apply_ref_steps(repo: Repo):
+    index = make_index(repo)
+    index.load()
+    # The first commit creates the branch HEAD points to
+    index.apply(
+        CommitStep(name=None, description=None, id=None, empty=True, message="m")
+    )
+    assert "refs/heads/main" in index
+
+    index.apply(
+        TagStep(name=None, description=None, id=None, tag_name="v1", tag_message=None)
+    )
+    index.apply(BranchStep(name=None, description=None, id=None, branch_name="a"))
+    index.apply(
+        BranchRenameStep(
+            name=None,
+            description=None,
+            id=None,
+            original_branch_name="a",
+            target_branch_name="b",
+        )
+    )
+    assert index.load() == {"refs/heads/main", "refs/tags/v1", "refs/heads/b"}
+    index.apply(BranchDeleteStep(name=None, description=None, id=None, branch_name="b"))
+    assert "refs/heads/b" not in index
+
+
+def test_ref_index_invalidated_by_bash_step(repo: Repo):
+    repo.git.commit("-m", "Initial commit", "--allow-empty")
+    index = make_index(repo)
+    assert "refs/heads/feature" not in index
+    repo.git.branch("feature")
+    assert "refs/heads/feature" not in index
+
+    index.apply(
+        BashStep(name=None, description=None, id=None, body="git branch feature")
+    )
+    assert "refs/heads/feature" in index
+
+
+def test_ref_index_tracking(repo: Repo):
+    repo.git.commit("-m", "Initial commit", "--allow-empty")
+    assert ref_index_for(repo) is None
+    assert has_branch(repo, "main")
+    assert has_ref_named(repo, "main")
+
+    index = track_refs(repo)
+    assert ref_index_for(repo) is index
+    index.load()
+    # Refs created outside of steps are not seen until the index is dropped
+    repo.git.branch("feature")
+    assert not has_branch(repo, "feature")
+    index.invalidate()
+    assert has_branch(repo, "feature")
+
+    untrack_refs(repo)
+    assert ref_index_for(repo) is None
@@ -0,0 +1,60 @@
+from repo_smith.snapshot_cache import SnapshotCache
+from repo_smith.spec import Spec
+from repo_smith.steps.commit_step import CommitStep
+from repo_smith.steps.tag_step import TagStep
+
+
+def make_spec(*steps) -> Spec:
+    return Spec(name="", description="", steps=list(steps), clone_from=None)
+
+
+def test_snapshot_cache_key_ignores_step_metadata(tmp_path):
+    cache = SnapshotCache(tmp_path)
+    first = make_spec(CommitStep("a", "first", "commit", empty=True, message="m"))
+    second = make_spec(CommitStep("b", "second", None, empty=True, message="m"))
+    assert cache.key(first) == cache.key(second)
+
+
+def test_snapshot_cache_key_changes_with_contents(tmp_path):
+    cache = SnapshotCache(tmp_path)
+    first = make_spec(CommitStep(None, None, None, empty=True, message="m"))
+    second = make_spec(CommitStep(None, None, None, empty=True, message="n"))
+    assert cache.key(first) != cache.key(second)
+
+
+def test_snapshot_cache_key_changes_with_step_order(tmp_path):
+    cache = SnapshotCache(tmp_path)
+    commit = CommitStep(None, None, None, empty=True, message="m")
+    tag = TagStep(None, None, None, tag_name="v0", tag_message=None)
+    assert cache.key(make_spec(commit, tag)) != cache.key(make_spec(tag, commit))
+
+
+def test_snapshot_cache_restore_miss(tmp_path):
+    cache = SnapshotCache(tmp_path / "cache")
+    assert not cache.restore("missing", tmp_path / "dest")
+
+
+def test_snapshot_cache_store_and_restore(tmp_path):
+    cache = SnapshotCache(tmp_path / "cache")
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "file.txt").write_text("hello")
+
+    cache.store("key", src)
+    assert cache.restore("key", tmp_path / "dest")
+    assert (tmp_path / "dest" / "file.txt").read_text() == "hello"
+
+
+def test_snapshot_cache_prefix_keys_shared_between_specs(tmp_path):
+    cache = SnapshotCache(tmp_path)
+    commit = CommitStep(None, None, None, empty=True, message="m")
+    first = list(
+        cache.prefix_keys(make_spec(commit, TagStep(None, None, None, "a", None)))
+    )
+    second = list(
+        cache.prefix_keys(make_spec(commit, TagStep(None, None, None, "b", None)))
+    )
+    assert len(first) == 3
+    assert first[:2] == second[:2]
+    assert first[2] != second[2]
+    assert cache.key(make_spec(commit)) == first[1]
@@ -0,0 +1,81 @@
+import os
+
+from repo_smith.spec import Spec
+from repo_smith import spec_cache
+from repo_smith.spec_cache import SpecCache
+from repo_smith.steps.commit_step import CommitStep
+
+SPEC = Spec(
+    name="n",
+    description="d",
+    steps=[CommitStep(None, None, "id", empty=True, message="m")],
+    clone_from=None,
+)
+
+
+def write_spec(path, contents: bytes) -> bytes:
+    path.write_bytes(contents)
+    return contents
+
+
+def test_spec_cache_miss(tmp_path):
+    spec_path = tmp_path / "spec.yml"
+    contents = write_spec(spec_path, b"name: n")
+    cache = SpecCache(tmp_path / "cache")
+    assert cache.load(spec_path) == (None, contents)
+
+
+def test_spec_cache_hit(tmp_path):
+    spec_path = tmp_path / "spec.yml"
+    contents = write_spec(spec_path, b"name: n")
+    cache = SpecCache(tmp_path / "cache")
+    cache.store(spec_path, contents, SPEC)
+
+    spec, _ = cache.load(spec_path)
+    assert spec == SPEC
+
+
+def test_spec_cache_hit_after_touch(tmp_path):
+    spec_path = tmp_path / "spec.yml"
+    contents = write_spec(spec_path, b"name: n")
+    cache = SpecCache(tmp_path / "cache")
+    cache.store(spec_path, contents, SPEC)
+
+    info = os.stat(spec_path)
+    os.utime(spec_path, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+    spec, _ = cache.load(spec_path)
+    assert spec == SPEC
+
+
+def test_spec_cache_miss_after_edit(tmp_path):
+    spec_path = tmp_path / "spec.yml"
+    contents = write_spec(spec_path, b"name: n")
+    cache = SpecCache(tmp_path / "cache")
+    cache.store(spec_path, contents, SPEC)
+
+    edited = write_spec(spec_path, b"name: edited")
+    info = os.stat(spec_path)
+    os.utime(spec_path, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+    assert cache.load(spec_path) == (None, edited)
+
+
+def test_spec_cache_ignores_corrupt_entries(tmp_path):
+    spec_path = tmp_path / "spec.yml"
+    contents = write_spec(spec_path, b"name: n")
+    cache_dir = tmp_path / "cache"
+    cache = SpecCache(cache_dir)
+    cache.store(spec_path, contents, SPEC)
+    for entry in os.listdir(cache_dir):
+        (cache_dir / entry).write_bytes(b"corrupt")
+
+    assert cache.load(spec_path) == (None, contents)
+
+
+def test_spec_cache_miss_after_schema_change(tmp_path, monkeypatch):
+    spec_path = tmp_path / "spec.yml"
+    contents = write_spec(spec_path, b"name: n")
+    cache = SpecCache(tmp_path / "cache")
+    cache.store(spec_path, contents, SPEC)
+
+    monkeypatch.setattr(spec_cache, "schema_fingerprint", lambda: "changed")
+    assert cache.load(spec_path) == (None, contents)
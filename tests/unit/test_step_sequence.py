@@ -0,0 +1,157 @@
+import pytest
+from repo_smith.step_sequence import StepSequence
+from repo_smith.steps.commit_step import CommitStep
+from repo_smith.steps.tag_step import TagStep
+
+EDIT_ADD_COMMIT = [
+    {"type": "edit-file", "filename": "file.txt", "contents": "{{i}}\n"},
+    {"type": "add", "files": ["file.txt"]},
+    {"type": "commit", "message": "Edit {{ i }}"},
+]
+
+
+def messages(steps):
+    return [step.message for step in steps if isinstance(step, CommitStep)]
+
+
+def test_step_sequence_without_macros():
+    steps = StepSequence.parse([{"type": "commit", "empty": True, "message": "m"}])
+    assert len(steps) == 1
+    assert isinstance(steps[0], CommitStep)
+    assert list(steps) == [steps[0]]
+
+
+def test_step_sequence_repeat():
+    steps = StepSequence.parse(
+        [
+            {"type": "commit", "empty": True, "message": "Before"},
+            {"repeat": 3, "steps": EDIT_ADD_COMMIT},
+            {"type": "commit", "empty": True, "message": "After"},
+        ]
+    )
+    assert len(steps) == 11
+    assert messages(steps) == ["Before", "Edit 0", "Edit 1", "Edit 2", "After"]
+    assert steps[1].contents == "0\n"
+    assert steps[9].message == "Edit 2"
+    assert steps[-1].message == "After"
+    assert list(steps) == [steps[i] for i in range(len(steps))]
+
+
+def test_step_sequence_matrix():
+    steps = StepSequence.parse(
+        [
+            {
+                "matrix": {"branch": ["a", "b"], "n": [1, 2, 3]},
+                "steps": [{"type": "tag", "tag-name": "{{branch}}-{{n}}"}],
+            }
+        ]
+    )
+    assert [step.tag_name for step in steps] == [
+        "a-1",
+        "a-2",
+        "a-3",
+        "b-1",
+        "b-2",
+        "b-3",
+    ]
+    assert isinstance(steps[4], TagStep)
+    assert steps[4].tag_name == "b-2"
+
+
+def test_step_sequence_nested_macros():
+    steps = StepSequence.parse(
+        [
+            {
+                "repeat": 2,
+                "variable": "outer",
+                "steps": [
+                    {"type": "commit", "empty": True, "message": "Start {{outer}}"},
+                    {
+                        "repeat": 2,
+                        "steps": [
+                            {
+                                "type": "commit",
+                                "empty": True,
+                                "message": "{{outer}}.{{i}}",
+                            }
+                        ],
+                    },
+                ],
+            }
+        ]
+    )
+    expected = ["Start 0", "0.0", "0.1", "Start 1", "1.0", "1.1"]
+    assert messages(steps) == expected
+    assert [steps[i].message for i in range(len(steps))] == expected
+    assert messages(steps.iterate(4)) == expected[4:]
+
+
+def test_step_sequence_expands_lazily():
+    steps = StepSequence.parse([{"repeat": 1_000_000, "steps": EDIT_ADD_COMMIT}])
+    assert len(steps) == 3_000_000
+    assert steps[2_999_999].message == "Edit 999999"
+    assert messages(steps.iterate(2_999_994)) == ["Edit 999998", "Edit 999999"]
+
+
+def test_step_sequence_empty_repeat():
+    steps = StepSequence.parse(
+        [
+            {"repeat": 0, "steps": EDIT_ADD_COMMIT},
+            {"type": "commit", "empty": True, "message": "Only"},
+        ]
+    )
+    assert len(steps) == 1
+    assert messages(steps) == ["Only"]
+
+
+def test_step_sequence_undefined_variable():
+    with pytest.raises(
+        ValueError,
+        match="Variable j is not defined by an enclosing repeat or matrix.",
+    ):
+        StepSequence.parse(
+            [
+                {
+                    "repeat": 2,
+                    "steps": [{"type": "commit", "empty": True, "message": "{{j}}"}],
+                }
+            ]
+        )
+
+
+@pytest.mark.parametrize(
+    "macro, message",
+    [
+        (
+            {"repeat": -1, "steps": EDIT_ADD_COMMIT},
+            'Field "repeat" must be a non-negative integer.',
+        ),
+        ({"repeat": 2}, 'Missing "steps" field in repeat or matrix.'),
+        (
+            {"repeat": 2, "variable": "1st", "steps": EDIT_ADD_COMMIT},
+            'Field "variable" can only contain alphanumeric characters and _.',
+        ),
+        (
+            {"matrix": [], "steps": EDIT_ADD_COMMIT},
+            'Field "matrix" must map variable names to lists.',
+        ),
+        (
+            {"matrix": {"n": []}, "steps": EDIT_ADD_COMMIT},
+            "Matrix variable n must have a non-empty list of values.",
+        ),
+        (
+            {"repeat": 2, "matrix": {"n": [1]}, "steps": EDIT_ADD_COMMIT},
+            'Fields "repeat" and "matrix" cannot be used together.',
+        ),
+    ],
+)
+def test_step_sequence_invalid_macro(macro, message):
+    with pytest.raises(ValueError, match=message):
+        StepSequence.parse([macro])
+
+
+def test_step_sequence_validates_body_at_parse_time():
+    with pytest.raises(ValueError, match='Missing "type" field in step.'):
+        StepSequence.parse(
+            [{"repeat": 2, "steps": [{"repeat": 0, "steps": [{"message": "{{i}}"}]}]}]
+        )
@@ -0,0 +1,39 @@
+import os
+
+from repo_smith.teardown import TRASH_DIR_NAME, BackgroundRemover, remove_dir
+
+
+def make_tree(dir, files=50):
+    os.makedirs(dir / "nested")
+    for i in range(files):
+        (dir / "nested" / f"file-{i}.txt").write_text(f"{i}\n")
+
+
+def test_background_remover_frees_path_immediately(tmp_path):
+    remover = BackgroundRemover()
+    dir = tmp_path / "repo"
+    make_tree(dir)
+
+    remover.remove(dir)
+    # The path can be reused before the removal finishes
+    assert not dir.exists()
+    make_tree(dir)
+
+    remover.flush()
+    assert not (tmp_path / TRASH_DIR_NAME).exists()
+    assert (dir / "nested" / "file-0.txt").exists()
+
+
+def test_background_remover_bounded_queue(tmp_path):
+    remover = BackgroundRemover(max_pending=1)
+    for i in range(5):
+        make_tree(tmp_path / f"repo-{i}")
+        remover.remove(tmp_path / f"repo-{i}")
+    remover.flush()
+    assert os.listdir(tmp_path) == []
+
+
+def test_remove_dir_in_foreground(tmp_path):
+    make_tree(tmp_path / "repo")
+    remove_dir(tmp_path / "repo")
+    assert os.listdir(tmp_path) == []
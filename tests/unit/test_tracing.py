@@ -0,0 +1,75 @@
+import subprocess
+import sys
+
+from repo_smith.steps.step_type import StepType
+from repo_smith.tracing import (
+    Trace,
+    counting_process_launches,
+    process_launches,
+    traced,
+)
+
+
+def test_span_counts_child_processes():
+    trace = Trace()
+    with trace.span("run", "test"):
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+    (span,) = trace.spans
+    assert span.name == "run"
+    assert span.category == "test"
+    assert span.child_processes == 2
+    assert span.wall_time > 0
+    # The children were waited for, so their CPU time is included
+    assert span.cpu_time > 0
+
+
+def test_span_recorded_on_error():
+    trace = Trace()
+    try:
+        with trace.span("failing", "test"):
+            raise ValueError()
+    except ValueError:
+        pass
+
+    assert [span.name for span in trace.spans] == ["failing"]
+
+
+def test_traced_without_trace():
+    with traced(None, "nothing", "test"):
+        pass
+
+
+def test_to_chrome_trace():
+    trace = Trace()
+    with trace.span("outer", "step", "outer-id", StepType.MERGE):
+        with trace.span("inner", "backend"):
+            pass
+
+    events = trace.to_chrome_trace()["traceEvents"]
+    assert [event["name"] for event in events] == ["outer", "inner"]
+    outer, inner = events
+    assert outer["args"]["id"] == "outer-id"
+    assert outer["args"]["type"] == "merge"
+    assert "id" not in inner["args"]
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_process_launches_only_counted_within_spans():
+    trace = Trace()
+    before = process_launches()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    assert process_launches() == before
+
+    with trace.span("run", "test"):
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+    assert process_launches() == before + 1
+
+
+def test_counting_process_launches_without_span():
+    before = process_launches()
+    with counting_process_launches():
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+    assert process_launches() == before + 1